@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge 效能測試：UTF-8 位元組引擎與字串轉換路徑比較
+
+用法:
+    python benchmarks/bench_byte_engine.py --size-mb 50
+"""
+
+import argparse
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加 src 目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from byte_engine import is_utf8
+from converter import ChineseConverter
+from mappings import MappingManager
+
+
+def generate_corpus(kind: str, size: int, keys) -> str:
+    """產生指定大小的測試文本"""
+    rng = random.Random(42)
+    if kind == 'dense':
+        # 資料檔：大部分內容都是中文
+        filler = ['，', '。', ' ', '\n', 'id=1;']
+        pieces = keys + filler
+    else:
+        # 程式碼：只有註解與字串含中文
+        pieces = ['def handler(request):\n', '    return response  # ', 'x = 1\n'] * 20 + keys
+    
+    parts, length = [], 0
+    while length < size:
+        piece = rng.choice(pieces)
+        parts.append(piece)
+        length += len(piece.encode('utf-8'))
+    return ''.join(parts)
+
+
+def time_str_path(path: Path, converter) -> tuple:
+    """讀取為 str、轉換、再編碼為 UTF-8"""
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        content = f.read()
+    converted, count = converter.convert_text(content)
+    output = converted.encode('utf-8')
+    return time.perf_counter() - start, count, output
+
+
+def time_bytes_path(path: Path, converter) -> tuple:
+    """透過 mmap 驗證 UTF-8 後直接轉換位元組"""
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if not is_utf8(mapped):
+                raise ValueError("測試檔案不是 UTF-8")
+            output, count = converter.convert_bytes(mapped)
+    return time.perf_counter() - start, count, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較 UTF-8 位元組引擎與字串轉換路徑")
+    parser.add_argument('--size-mb', type=float, default=20, help='測試檔案大小 (MB)')
+    parser.add_argument('--repeat', type=int, default=3, help='重複次數，取最佳值')
+    args = parser.parse_args()
+    
+    manager = MappingManager()
+    str_converter = ChineseConverter(manager, run_cache_size=4096)
+    # 指定 bytes 引擎，避免 auto 在映射剛載入時改走文字路徑
+    bytes_converter = ChineseConverter(manager, engine='bytes')
+    keys = list(manager.get_all_mappings())
+    size = int(args.size_mb * 1024 * 1024)
+    
+    for kind in ('dense', 'sparse'):
+        fd, temp_path = tempfile.mkstemp(suffix='.txt')
+        path = Path(temp_path)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                f.write(generate_corpus(kind, size, keys))
+            
+            str_time = bytes_time = float('inf')
+            for _ in range(args.repeat):
+                elapsed, str_count, str_output = time_str_path(path, str_converter)
+                str_time = min(str_time, elapsed)
+                elapsed, bytes_count, bytes_output = time_bytes_path(path, bytes_converter)
+                bytes_time = min(bytes_time, elapsed)
+            
+            if (str_output, str_count) != (bytes_output, bytes_count):
+                print(f"❌ {kind}: 兩種路徑的結果不一致")
+                return 1
+            
+            print(f"{kind:>6}: {path.stat().st_size / 1024 / 1024:.1f} MB, {str_count} 次轉換 | "
+                  f"str {str_time:.3f}s | bytes {bytes_time:.3f}s | "
+                  f"加速 {str_time / bytes_time:.2f}x")
+        finally:
+            path.unlink()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
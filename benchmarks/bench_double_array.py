@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge 效能測試：雙陣列與 dict 字典樹的建構時間、記憶體用量與查詢速度
+
+比較 compact_dictionary 使用的 CompactPhraseMatcher（雙陣列）與預設的 PhraseMatcher
+（每個節點一個 dict）。查詢測試每個位置的最長比對（longest_at，轉換時的主要查詢）
+與整個詞彙的查詢（get）
+
+用法:
+    python benchmarks/bench_double_array.py --entries 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# 添加 src 目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matcher import CompactPhraseMatcher, PhraseMatcher
+
+
+def generate_mappings(count: int) -> dict:
+    """產生指定數量、長度 2~4 字的隨機詞彙映射"""
+    rng = random.Random(42)
+    chars = [chr(code) for code in range(0x4e00, 0x4e00 + 3000)]
+    mappings = {}
+    while len(mappings) < count:
+        key = ''.join(rng.choice(chars) for _ in range(rng.randint(2, 4)))
+        mappings[key] = ''.join(chr(ord(char) + 0x100) for char in key)
+    return mappings
+
+
+def generate_text(mappings: dict, size: int) -> str:
+    """產生一半為詞彙、一半為隨機單字的測試文本"""
+    rng = random.Random(7)
+    keys = list(mappings)
+    parts, length = [], 0
+    while length < size:
+        piece = rng.choice(keys) if rng.random() < 0.5 else chr(0x4e00 + rng.randrange(3000))
+        parts.append(piece)
+        length += len(piece)
+    return ''.join(parts)
+
+
+def best_time(func, repeat: int) -> float:
+    """重複執行並返回最佳耗時"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def retained_bytes(build) -> int:
+    """建構後仍保留的記憶體用量（不含建構過程中的暫存；映射的字串由兩者共用，不計入）"""
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def scan(matcher, text: str):
+    """在每個位置做最長比對"""
+    longest_at = matcher.longest_at
+    for position in range(len(text)):
+        longest_at(text, position)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較雙陣列與 dict 字典樹的建構時間、記憶體用量與查詢速度")
+    parser.add_argument('--entries', type=int, nargs='+', default=[2000, 20000, 200000],
+                        help='詞彙數量')
+    parser.add_argument('--repeat', type=int, default=3, help='重複次數，取最佳值')
+    parser.add_argument('--text-size', type=int, default=20000, help='最長比對測試文本的字元數')
+    args = parser.parse_args()
+
+    for count in args.entries:
+        mappings = generate_mappings(count)
+        text = generate_text(mappings, args.text_size)
+        keys = list(mappings)[:50000]
+        matchers = {'雙陣列': CompactPhraseMatcher(mappings), 'dict': PhraseMatcher(mappings)}
+        results = {}
+        for name, matcher in matchers.items():
+            if any(matcher.get(key) != value for key, value in mappings.items()):
+                print(f"❌ {count}: {name} 查詢結果與映射不一致")
+                return 1
+            matcher_class = type(matcher)
+            results[name] = (
+                best_time(lambda: matcher_class(mappings), args.repeat),
+                retained_bytes(lambda: matcher_class(mappings)),
+                best_time(lambda: scan(matcher, text), args.repeat) * 1e9 / len(text),
+                best_time(lambda: [matcher.get(key) for key in keys], args.repeat) * 1e9 / len(keys),
+            )
+        if any(matchers['雙陣列'].longest_at(text, position) != matchers['dict'].longest_at(text, position)
+               for position in range(len(text))):
+            print(f"❌ {count}: 最長比對結果不一致")
+            return 1
+
+        compact, plain = results['雙陣列'], results['dict']
+        print(f"{count:>7} 個詞彙 | 建構 雙陣列 {compact[0]:.3f}s / dict {plain[0]:.3f}s "
+              f"({compact[0] / plain[0]:.2f}x) | 記憶體 {compact[1] / 1024 / 1024:.1f} MB / "
+              f"{plain[1] / 1024 / 1024:.1f} MB ({compact[1] / plain[1]:.2f}x)")
+        print(f"{'':>7}   longest_at {compact[2]:.0f} ns / {plain[2]:.0f} ns ({compact[2] / plain[2]:.2f}x) | "
+              f"get {compact[3]:.0f} ns / {plain[3]:.0f} ns ({compact[3] / plain[3]:.2f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge 效能測試：不同中文密度下 regex 與 bytes 引擎的轉換速度，以及 auto 的選擇
+
+用法:
+    python benchmarks/bench_engines.py --size 100000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加 src 目錄到 Python 路徑
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from converter import ChineseConverter
+from engines import estimate_cjk_density, select_engine
+from mappings import MappingManager
+
+
+DENSITIES = (0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0)
+
+
+def generate_text(density: float, size: int, keys, rng: random.Random) -> str:
+    """產生約有指定比例表意文字的文本（其餘為程式碼片段）"""
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < density:
+            piece = rng.choice(keys)
+        else:
+            piece = 'value = compute(x) '[:rng.randint(2, 8)]
+        parts.append(piece)
+        length += len(piece)
+    return ''.join(parts)
+
+
+def best_time(func, repeat: int) -> float:
+    """重複執行並返回最佳耗時"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="比較不同中文密度下 regex 與 bytes 引擎的轉換速度")
+    parser.add_argument('--size', type=int, default=100000, help='每個測試文本的字元數')
+    parser.add_argument('--repeat', type=int, default=7, help='重複次數，取最佳值')
+    args = parser.parse_args()
+
+    manager = MappingManager()
+    keys = [key for key in manager.get_all_mappings() if len(key) > 1]
+    converters = {name: ChineseConverter(manager, engine=name) for name in ('regex', 'bytes')}
+    rng = random.Random(42)
+
+    for density in DENSITIES:
+        text = generate_text(density, args.size, keys, rng)
+        results = {}
+        for name, converter in converters.items():
+            converter.convert_text(text)
+            elapsed = best_time(lambda: converter.convert_text(text), args.repeat)
+            results[name] = elapsed * 1e9 / len(text)
+
+        # 兩種引擎都已建立時 auto 只依文本特性選擇
+        chosen = select_engine(text, converters['bytes']._compiled, built=converters)
+        print(f"密度 {estimate_cjk_density(text):6.2%} | regex {results['regex']:6.1f} ns/字 | "
+              f"bytes {results['bytes']:6.1f} ns/字 | "
+              f"regex/bytes {results['regex'] / results['bytes']:.2f} | auto 選擇 {chosen}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
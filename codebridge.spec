@@ -22,6 +22,18 @@ hiddenimports = [
     'src.codebridge',
     'src.config',
     'src.converter',
+    'src.matcher',
+    'src.double_array',
+    'src.cjk',
+    'src.dict_cache',
+    'src.byte_engine',
+    'src.char_lut',
+    'src.parallel',
+    'src.engines',
+    'src.builtin_dict',
+    'src.search_index',
+    'src.dict_optimizer',
+    'src.directory_mappings',
     'src.mappings',
     'src.file_processor',
     'src.statistics'
@@ -84,6 +84,9 @@ setup(
             "sphinx>=3.0.0",
             "sphinx-rtd-theme>=0.5.0",
         ],
+        "fast": [
+            "numpy>=1.17",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -95,6 +98,7 @@ setup(
         "": [
             "*.txt",
             "*.json",
+            "*.dat",
             "*.md",
             "config/*.json",
             "data/*.txt",
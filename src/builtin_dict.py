@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 內建映射資料檔
+"""
+
+import hashlib
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import ItemsView, Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+# 檔案格式：魔術字串 + 標頭（項目數、簡體與繁體區塊的位元組長度，皆為小端序 uint32）
+# + 簡體與繁體的字元位移陣列（各 項目數+1 個小端序 uint32）+ UTF-8 簡體區塊 + UTF-8 繁體區塊；
+# 項目依簡體詞排序，查詢時以二分搜尋定位
+BUILTIN_MAGIC = b'CBMAP001'
+BUILTIN_HEADER = struct.Struct('<III')
+BUILTIN_DATA_FILE = Path(__file__).with_name('builtin_mappings.dat')
+BUILTIN_SOURCE_FILE = Path(__file__).resolve().parent.parent / 'data' / 'builtin_mappings.txt'
+
+_builtin_lock = threading.Lock()
+_builtin_mappings: Optional['CompactMapping'] = None
+
+
+def _offsets_from_bytes(data) -> array:
+    """以小端序讀取 uint32 位移陣列"""
+    offsets = array('I')
+    offsets.frombytes(data)
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    return offsets
+
+
+def _offsets_to_bytes(offsets: array) -> bytes:
+    """以小端序輸出 uint32 位移陣列"""
+    if sys.byteorder != 'little':
+        offsets = array('I', offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+class _CompactItemsView(ItemsView):
+    """直接依序切片的項目視圖，不需逐鍵二分搜尋"""
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return self._mapping._iter_items()
+
+
+class CompactMapping(Mapping):
+    """
+    唯讀的緊湊映射表
+
+    簡體詞與繁體詞各自串接為單一字串，以位移陣列切分；
+    內容不可變，可在整個程序內共用同一個實例
+    """
+
+    def __init__(self, keys: str, key_offsets: array, values: str, value_offsets: array):
+        """
+        初始化映射表
+
+        Args:
+            keys: 依序串接的簡體詞（已排序）
+            key_offsets: 簡體詞的字元位移（長度為項目數+1）
+            values: 依序串接的繁體詞
+            value_offsets: 繁體詞的字元位移（長度為項目數+1）
+        """
+        if len(key_offsets) != len(value_offsets) or not key_offsets:
+            raise ValueError("位移陣列長度不符")
+        if key_offsets[-1] != len(keys) or value_offsets[-1] != len(values):
+            raise ValueError("位移陣列與資料區塊長度不符")
+        self._keys = keys
+        self._key_offsets = key_offsets
+        self._values = values
+        self._value_offsets = value_offsets
+
+    @classmethod
+    def from_mapping(cls, mappings: Mapping) -> 'CompactMapping':
+        """
+        由一般映射建立
+
+        Args:
+            mappings: 映射表 {簡體: 繁體}
+
+        Returns:
+            CompactMapping: 依簡體詞排序的緊湊映射表
+        """
+        key_offsets = array('I', [0])
+        value_offsets = array('I', [0])
+        keys = []
+        values = []
+        for simplified, traditional in sorted(mappings.items()):
+            keys.append(simplified)
+            values.append(traditional)
+            key_offsets.append(key_offsets[-1] + len(simplified))
+            value_offsets.append(value_offsets[-1] + len(traditional))
+        return cls(''.join(keys), key_offsets, ''.join(values), value_offsets)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactMapping':
+        """
+        由資料檔內容還原
+
+        Args:
+            data: to_bytes() 的結果
+
+        Returns:
+            CompactMapping: 映射表
+
+        Raises:
+            ValueError: 格式不符或資料損壞
+        """
+        data = memoryview(data)
+        if bytes(data[:len(BUILTIN_MAGIC)]) != BUILTIN_MAGIC:
+            raise ValueError("內建映射資料檔標頭不符")
+        position = len(BUILTIN_MAGIC)
+        try:
+            count, keys_size, values_size = BUILTIN_HEADER.unpack_from(data, position)
+        except struct.error as e:
+            raise ValueError(f"內建映射資料檔已截斷: {e}")
+        position += BUILTIN_HEADER.size
+
+        offsets_size = (count + 1) * 4
+        if len(data) != position + 2 * offsets_size + keys_size + values_size:
+            raise ValueError("內建映射資料檔長度不符")
+        key_offsets = _offsets_from_bytes(data[position:position + offsets_size])
+        position += offsets_size
+        value_offsets = _offsets_from_bytes(data[position:position + offsets_size])
+        position += offsets_size
+        keys = str(data[position:position + keys_size], 'utf-8')
+        position += keys_size
+        values = str(data[position:position + values_size], 'utf-8')
+        return cls(keys, key_offsets, values, value_offsets)
+
+    def to_bytes(self) -> bytes:
+        """
+        序列化為資料檔內容
+
+        Returns:
+            bytes: 可由 from_bytes() 還原的位元組
+        """
+        keys = self._keys.encode('utf-8')
+        values = self._values.encode('utf-8')
+        return b''.join((
+            BUILTIN_MAGIC,
+            BUILTIN_HEADER.pack(len(self), len(keys), len(values)),
+            _offsets_to_bytes(self._key_offsets),
+            _offsets_to_bytes(self._value_offsets),
+            keys,
+            values,
+        ))
+
+    def content_digest(self) -> str:
+        """
+        內容的 SHA-256（直接雜湊串接字串與位移陣列，不需逐項走訪或排序）
+
+        Returns:
+            str: 十六進位字串
+        """
+        digest = hashlib.sha256()
+        for text, offsets in ((self._keys, self._key_offsets), (self._values, self._value_offsets)):
+            digest.update(_offsets_to_bytes(offsets))
+            digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _key_at(self, index: int) -> str:
+        """獲取第 index 個簡體詞"""
+        return self._keys[self._key_offsets[index]:self._key_offsets[index + 1]]
+
+    def _value_at(self, index: int) -> str:
+        """獲取第 index 個繁體詞"""
+        return self._values[self._value_offsets[index]:self._value_offsets[index + 1]]
+
+    def _index(self, key) -> int:
+        """二分搜尋簡體詞的位置，不存在時返回-1"""
+        if not isinstance(key, str):
+            return -1
+        low, high = 0, len(self._key_offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._key_offsets) - 1 and self._key_at(low) == key:
+            return low
+        return -1
+
+    def __getitem__(self, key: str) -> str:
+        index = self._index(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._value_at(index)
+
+    def __contains__(self, key) -> bool:
+        return self._index(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._key_at, range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self._key_offsets) - 1
+
+    def _iter_items(self) -> Iterator[Tuple[str, str]]:
+        """依序產生 (簡體詞, 繁體詞)"""
+        keys, key_offsets = self._keys, self._key_offsets
+        values, value_offsets = self._values, self._value_offsets
+        for index in range(len(self)):
+            yield (
+                keys[key_offsets[index]:key_offsets[index + 1]],
+                values[value_offsets[index]:value_offsets[index + 1]]
+            )
+
+    def items(self) -> ItemsView:
+        return _CompactItemsView(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} mappings)"
+
+
+def read_mapping_source(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    解析映射原始檔（格式與自定義映射檔案相同：簡體:繁體，# 開頭為註解）
+
+    Args:
+        lines: 原始檔的各行
+
+    Returns:
+        Dict[str, str]: 映射表，重複的簡體詞以後出現者為準
+    """
+    mappings = {}
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        simplified, separator, traditional = line.partition(':')
+        simplified = simplified.strip()
+        traditional = traditional.strip()
+        if not separator or not simplified or not traditional:
+            raise ValueError(f"第 {line_num} 行格式錯誤: {line}")
+        mappings[simplified] = traditional
+    return mappings
+
+
+def write_mapping_source(mappings: Mapping[str, str], target: Path, header: str = '') -> int:
+    """
+    以映射原始檔格式寫出映射（依簡體詞排序）
+
+    Args:
+        mappings: 映射表 {簡體: 繁體}
+        target: 輸出路徑
+        header: 檔案開頭的註解（每行自動加上 #）
+
+    Returns:
+        int: 寫入的映射數量
+    """
+    with open(target, 'w', encoding='utf-8') as f:
+        for line in header.splitlines():
+            f.write(f"# {line}\n" if line else "#\n")
+        for simplified, traditional in sorted(mappings.items()):
+            f.write(f"{simplified}:{traditional}\n")
+    return len(mappings)
+
+
+def compile_builtin_source(source: Path = BUILTIN_SOURCE_FILE,
+                           target: Path = BUILTIN_DATA_FILE) -> int:
+    """
+    由映射原始檔產生內建映射資料檔
+
+    Args:
+        source: 映射原始檔路徑
+        target: 資料檔輸出路徑
+
+    Returns:
+        int: 寫入的映射數量
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        compact = CompactMapping.from_mapping(read_mapping_source(f))
+    Path(target).write_bytes(compact.to_bytes())
+    return len(compact)
+
+
+def load_builtin_mappings() -> CompactMapping:
+    """
+    載入內建映射（首次呼叫時讀取資料檔，之後整個程序共用同一個唯讀實例）
+
+    Returns:
+        CompactMapping: 內建映射表
+    """
+    global _builtin_mappings
+    if _builtin_mappings is None:
+        with _builtin_lock:
+            if _builtin_mappings is None:
+                _builtin_mappings = CompactMapping.from_bytes(BUILTIN_DATA_FILE.read_bytes())
+    return _builtin_mappings
+
+
+if __name__ == "__main__":
+    source_path = Path(sys.argv[1]) if len(sys.argv) > 1 else BUILTIN_SOURCE_FILE
+    target_path = Path(sys.argv[2]) if len(sys.argv) > 2 else BUILTIN_DATA_FILE
+    print(f"已寫入 {compile_builtin_source(source_path, target_path)} 個內建映射: {target_path}")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - UTF-8 位元組轉換引擎
+"""
+
+import codecs
+import re
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .matcher import RegexMatcher
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from matcher import RegexMatcher
+
+
+# UTF-8 具自我同步特性：詞彙的首位元組不可能出現在其他字元中間，
+# 因此直接比對位元組序列即可得到與字元比對相同的結果
+NON_ASCII_PATTERN = re.compile(rb'[\x80-\xff]')
+
+
+def is_utf8(buffer, block_size: int = 1024 * 1024) -> bool:
+    """
+    分塊驗證緩衝區是否為合法的 UTF-8，解碼結果直接丟棄
+
+    Args:
+        buffer: bytes 或 mmap 物件
+        block_size: 每次驗證的位元組數
+
+    Returns:
+        bool: 是否為合法的 UTF-8
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with memoryview(buffer) as view:
+            for offset in range(0, len(view), block_size):
+                decoder.decode(view[offset:offset + block_size], final=False)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+class Utf8ByteEngine(RegexMatcher):
+    """
+    UTF-8 位元組轉換引擎
+
+    將映射表以 UTF-8 編碼後編譯為字首樹正則表達式，直接在 bytes 或 mmap
+    上比對與替換，轉換 UTF-8 檔案時不需解碼為 str 再編碼回去
+    """
+
+    def __init__(self, mappings: Iterable[Tuple[str, str]]):
+        """
+        初始化引擎
+
+        Args:
+            mappings: (簡體詞, 繁體詞) 序列；單字對應自己的項目會被略過
+        """
+        super().__init__(
+            (simplified.encode('utf-8'), traditional.encode('utf-8'))
+            for simplified, traditional in mappings
+        )
+        # 所有實際轉換都維持相同位元組長度時，可直接原地修改檔案
+        self.same_length = all(
+            len(key) == len(value) for key, value in self._table.items() if key not in self._identity
+        )
+
+    @classmethod
+    def from_compiled(cls, compiled) -> 'Utf8ByteEngine':
+        """由 CompiledDictionary 建立引擎"""
+        return cls(compiled.items())
+
+    def patches(self, buffer) -> Optional[Tuple[List[Tuple[int, bytes]], int]]:
+        """
+        找出原地修改所需的替換位置
+
+        Args:
+            buffer: UTF-8 編碼的 bytes 或 mmap 物件
+
+        Returns:
+            Optional[Tuple[List[Tuple[int, bytes]], int]]: ([(位元組位置, 替換內容), ...], 轉換次數)，
+            任何轉換改變位元組長度時返回None
+        """
+        result: List[Tuple[int, bytes]] = []
+        if self.pattern is None:
+            return result, 0
+
+        table = self._table
+        identity = self._identity
+        check_length = not self.same_length
+
+        for match in self.pattern.finditer(buffer):
+            key = match.group()
+            if key in identity:
+                continue
+            value = table[key]
+            if check_length and len(value) != len(key):
+                return None
+            result.append((match.start(), value))
+        return result, len(result)
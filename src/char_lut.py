@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - NumPy 單字查找表（選用）
+"""
+
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 為選用依賴，未安裝時使用 str.translate
+    np = None
+
+
+BMP_SIZE = 0x10000
+
+# 文本短於此長度時 str.translate 較快（NumPy 需要額外的編碼與陣列配置）
+LUT_MIN_LENGTH = 64 * 1024
+
+
+def numpy_available() -> bool:
+    """是否已安裝 NumPy"""
+    return np is not None
+
+
+class CodepointLUT:
+    """
+    基本多文種平面的碼位查找表
+
+    以 uint32 陣列保存每個碼位轉換後的碼位，文本以 UTF-32 檢視後
+    一次查表並以向量比較計算轉換字數
+    """
+
+    def __init__(self, table):
+        """
+        初始化查找表（請使用 build()，會先檢查是否適用）
+
+        Args:
+            table: 長度為 BMP_SIZE 的 uint32 陣列
+        """
+        self.table = table
+
+    @classmethod
+    def build(cls, char_table: Dict[int, str]) -> Optional['CodepointLUT']:
+        """
+        由單字轉換表建立查找表
+
+        Args:
+            char_table: {碼位: 轉換後字元}
+
+        Returns:
+            Optional[CodepointLUT]: 未安裝 NumPy 或有轉換不是基本平面單字對單字時返回None
+        """
+        if np is None:
+            return None
+
+        table = np.arange(BMP_SIZE, dtype=np.uint32)
+        for code, traditional in char_table.items():
+            if code >= BMP_SIZE or len(traditional) != 1 or ord(traditional) >= BMP_SIZE:
+                return None
+            table[code] = ord(traditional)
+        return cls(table)
+
+    def translate(self, text: str) -> Tuple[str, int]:
+        """
+        轉換文本中的單字
+
+        Args:
+            text: 要轉換的文本
+
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換字數)
+        """
+        # 單獨的代理字元（例如以 surrogateescape 解碼的內容）原樣保留，與 str.translate 相同
+        codepoints = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        in_bmp = codepoints < BMP_SIZE
+        if in_bmp.all():
+            converted = self.table[codepoints]
+        else:
+            # 擴展平面的字元不在表內，保持原樣
+            converted = codepoints.copy()
+            converted[in_bmp] = self.table[codepoints[in_bmp]]
+
+        count = int(np.count_nonzero(converted != codepoints))
+        if not count:
+            return text, 0
+        return converted.tobytes().decode('utf-32-le', 'surrogatepass'), count
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 中日韓統一表意文字範圍
+"""
+
+import re
+
+
+# 擴展A區、基本區與相容表意文字
+CJK_RANGES = r'\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+
+CJK_CHAR_PATTERN = re.compile(f'[{CJK_RANGES}]')
+CJK_RUN_PATTERN = re.compile(f'[{CJK_RANGES}]+')
+CJK_ONLY_PATTERN = re.compile(f'[{CJK_RANGES}]+\\Z')
+
+
+def find_cjk(text: str, start: int = 0) -> int:
+    """
+    找出第一個表意文字的位置
+
+    純 ASCII 文本（程式碼檔案的大宗）以 str.isascii() 在 C 層級一次判斷，不需正則掃描
+
+    Args:
+        text: 要檢查的文本
+        start: 開始搜尋的位置
+
+    Returns:
+        int: 第一個表意文字的位置，沒有時返回-1
+    """
+    if text.isascii():
+        return -1
+    match = CJK_CHAR_PATTERN.search(text, start)
+    return match.start() if match is not None else -1
+
+
+def contains_cjk(text: str) -> bool:
+    """檢查文本是否包含任何表意文字"""
+    return find_cjk(text) >= 0
+
+
+def is_cjk_only(text: str) -> bool:
+    """檢查文本是否全由表意文字組成"""
+    return CJK_ONLY_PATTERN.match(text) is not None
@@ -7,13 +7,20 @@ CodeBridge - 主要轉換工具類
 import os
 import sys
 import argparse
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
+from functools import partial
 import json
 import logging
 
+from .builtin_dict import read_mapping_source, write_mapping_source
 from .converter import ChineseConverter
+from .dict_cache import DictionaryCache
+from .directory_mappings import DirectoryMappings
+from .dict_optimizer import find_mismatches, optimize_mappings, verification_texts
+from .matcher import CompiledDictionary
 from .mappings import MappingManager
 from .file_processor import FileProcessor
 from .config import Config
@@ -26,6 +33,7 @@ class ConversionResult:
     total_files: int = 0
     processed_files: int = 0
     total_conversions: int = 0
+    early_exit_files: int = 0
     errors: List[str] = None
     file_details: List[Tuple[str, int]] = None
     preview_results: List[Tuple[str, str, int]] = None
@@ -54,12 +62,47 @@ class CodeBridge:
     def __init__(self, config_path: Optional[str] = None):
         """初始化 CodeBridge"""
         self.config = Config(config_path)
-        self.mapping_manager = MappingManager()
-        self.converter = ChineseConverter(self.mapping_manager)
+        self.mapping_manager = MappingManager(category_keywords=self.config.category_keywords)
+        self.dict_cache = (
+            DictionaryCache(self.config.dict_cache_dir, self.config.dict_cache_max_files)
+            if self.config.dict_cache else None
+        )
+        self.converter = self._create_converter(self.mapping_manager)
+        # 目錄映射組合由基底字典複製，只在記憶體中保留，不寫入編譯字典快取（每組都會多一個快取檔）
+        self.directory_mappings = DirectoryMappings(
+            self.converter, partial(self._create_converter, use_dict_cache=False),
+            self.config.directory_mappings_file
+        )
         self.file_processor = FileProcessor(self.config)
         self.stats = StatisticsCollector()
         self.logger = self._setup_logging()
         
+    def _create_converter(self, mapping_manager: MappingManager,
+                          use_dict_cache: bool = True, compiled=None) -> ChineseConverter:
+        """
+        依配置建立轉換器
+        
+        Args:
+            mapping_manager: 映射管理器
+            use_dict_cache: 是否使用編譯字典快取（配置啟用時）
+            compiled: 與映射管理器一致的編譯字典，提供時不重新編譯
+        
+        Returns:
+            ChineseConverter: 轉換器
+        """
+        return ChineseConverter(
+            mapping_manager,
+            cjk_runs=self.config.cjk_runs_only,
+            run_cache_size=self.config.run_cache_size,
+            dict_cache=self.dict_cache if use_dict_cache else None,
+            max_workers=self.config.max_workers if self.config.parallel_processing else 1,
+            batch_chunk_size=self.config.batch_chunk_size,
+            segmentation=self.config.segmentation,
+            engine=self.config.engine,
+            compact_dictionary=self.config.compact_dictionary,
+            compiled=compiled
+        )
+    
     def _setup_logging(self) -> logging.Logger:
         """設置日誌"""
         logger = logging.getLogger('CodeBridge')
@@ -79,6 +122,25 @@ class CodeBridge:
         """載入自定義映射檔案"""
         return self.mapping_manager.load_custom_mappings(custom_file_path)
     
+    def compile_dictionary(self, cache_dir: Optional[str] = None) -> Path:
+        """
+        預先編譯目前的映射並寫入編譯字典快取
+        
+        Args:
+            cache_dir: 快取目錄，預設使用配置中的 dict_cache_dir
+        
+        Returns:
+            Path: 快取檔案路徑
+        """
+        cache = DictionaryCache(cache_dir or self.config.dict_cache_dir, self.config.dict_cache_max_files)
+        compact = self.config.compact_dictionary
+        key = cache.make_key(self.mapping_manager.get_fingerprint(), compact)
+        compiled = CompiledDictionary(self.mapping_manager.get_merged_view(), compact=compact)
+        cache_file = cache.store(key, compiled)
+        if cache_file is None:
+            raise OSError(f"無法寫入編譯字典快取: {cache.path_for(key)}")
+        return cache_file
+    
     def convert_project(
         self, 
         project_path: str, 
@@ -108,19 +170,34 @@ class CodeBridge:
         self.logger.info(f"檔案類型: {', '.join(sorted(target_extensions))}")
         
         result = ConversionResult()
+        use_directory_mappings = self.config.directory_mappings
+        if use_directory_mappings:
+            # 映射檔可能在兩次執行之間改變；已編譯的映射組合依檔案狀態判斷是否沿用
+            self.directory_mappings.refresh()
         
         # 遍歷所有檔案
         for file_path in project_path.rglob('*'):
             if not self._should_process_file(file_path, target_extensions):
                 continue
+            if use_directory_mappings and file_path.name == self.directory_mappings.filename:
+                # 映射檔本身是設定，不轉換
+                continue
             
             result.total_files += 1
             
             try:
+                converter = self.converter
+                if use_directory_mappings:
+                    converter = self.directory_mappings.converter_for(
+                        file_path.parent, project_path
+                    ) or self.converter
                 file_result = self.file_processor.process_file(
-                    file_path, self.converter, preview_mode
+                    file_path, converter, preview_mode
                 )
                 
+                if file_result.early_exit:
+                    result.early_exit_files += 1
+                
                 if file_result.conversions > 0:
                     result.processed_files += 1
                     result.total_conversions += file_result.conversions
@@ -161,7 +238,13 @@ class CodeBridge:
         report_lines.append("🌉 CodeBridge - 程式碼簡繁轉換工具")
         report_lines.append("=" * 70)
         report_lines.append(f"執行模式: {mode_text}")
-        report_lines.append(f"字庫規模: {len(self.mapping_manager.get_all_mappings()):,} 個映射")
+        report_lines.append(f"字庫規模: {len(self.mapping_manager.get_merged_view()):,} 個映射")
+        directory_stats = self.directory_mappings.get_stats()
+        if directory_stats['layers']:
+            report_lines.append(
+                f"目錄映射檔: {directory_stats['layers']:,} 個"
+                f"（編譯 {directory_stats['compiled']:,} 個映射組合）"
+            )
         
         # 字庫分類統計
         categories = self.mapping_manager.get_category_stats()
@@ -173,6 +256,7 @@ class CodeBridge:
         report_lines.append("\n" + "=" * 70)
         report_lines.append("📊 處理結果:")
         report_lines.append(f"掃描檔案總數: {result.total_files:,}")
+        report_lines.append(f"無中文快速略過: {result.early_exit_files:,}")
         
         if preview_mode:
             report_lines.append(f"包含簡體字的檔案: {result.processed_files:,}")
@@ -189,6 +273,24 @@ class CodeBridge:
             for filename, count in sorted_details[:10]:
                 report_lines.append(f"  • {filename}: {count:,} 個字符")
         
+        # 快取統計
+        cache_stats = self.converter.get_cache_stats()
+        # UTF-8 檔案走位元組路徑，不經過片段快取；沒有任何查詢時不顯示
+        if cache_stats['hits'] + cache_stats['misses']:
+            report_lines.append(
+                f"\n🧠 片段快取: 命中 {cache_stats['hits']:,} / 未命中 {cache_stats['misses']:,} / "
+                f"淘汰 {cache_stats['evictions']:,} (容量 {cache_stats['max_size']:,})"
+            )
+        
+        # 目錄映射組合的轉換器也計入
+        engine_stats = Counter(self.converter.get_engine_stats())
+        engine_stats.update(self.directory_mappings.get_engine_stats())
+        if engine_stats:
+            usage = ", ".join(
+                f"{name} {count:,}" for name, count in sorted(engine_stats.items(), key=lambda x: -x[1])
+            )
+            report_lines.append(f"⚙️ 轉換引擎: {usage}")
+        
         # 錯誤資訊
         if result.errors:
             report_lines.append(f"\n❌ 錯誤數量: {len(result.errors)}")
@@ -220,8 +322,138 @@ class CodeBridge:
         return "\n".join(report_lines)
 
 
+def compile_dict_main(argv: List[str]) -> int:
+    """compile-dict 子命令：預先產生編譯字典快取"""
+    parser = argparse.ArgumentParser(
+        prog='codebridge compile-dict',
+        description='預先編譯映射字典並寫入快取，之後啟動時直接以 mmap 載入'
+    )
+    parser.add_argument(
+        '--custom', '-c',
+        help='自定義映射檔案路徑 (格式: 簡體:繁體，每行一個)'
+    )
+    parser.add_argument(
+        '--config',
+        help='配置檔案路徑'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='快取目錄 (預設: ~/.codebridge/cache)'
+    )
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        codebridge = CodeBridge(args.config)
+        if args.custom:
+            count = codebridge.load_custom_mappings(args.custom)
+            print(f"✅ 載入自定義映射: {count} 個")
+        
+        cache_file = codebridge.compile_dictionary(args.cache_dir)
+        print(f"✅ 編譯字典已寫入: {cache_file}")
+        if not codebridge.config.dict_cache:
+            print("ℹ️ 配置中的 dict_cache 未啟用，轉換時不會讀取此快取")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ 執行錯誤: {e}")
+        return 1
+
+
+def optimize_dict_main(argv: List[str]) -> int:
+    """optimize-dict 子命令：移除不影響轉換結果的映射並以語料驗證"""
+    parser = argparse.ArgumentParser(
+        prog='codebridge optimize-dict',
+        description='移除對應自己與等於逐字轉換的映射，報告字典與比對器縮減的幅度，'
+                    '並確認驗證語料的轉換結果完全相同'
+    )
+    parser.add_argument(
+        '--source', '-s',
+        help='要最佳化的映射原始檔 (預設: 內建映射加上 --custom)'
+    )
+    parser.add_argument(
+        '--custom', '-c',
+        help='自定義映射檔案路徑 (格式: 簡體:繁體，每行一個)'
+    )
+    parser.add_argument(
+        '--config',
+        help='配置檔案路徑'
+    )
+    parser.add_argument(
+        '--corpus', action='append', default=[],
+        help='驗證語料的檔案或目錄，可重複指定 (映射本身一律納入驗證)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        help='寫出最佳化後的映射原始檔 (驗證通過才寫入)'
+    )
+    parser.add_argument(
+        '--preserve-counts', action='store_true',
+        help='只移除對應自己的映射，轉換次數與預覽統計也保持不變'
+    )
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        codebridge = CodeBridge(args.config)
+        if args.source:
+            with open(args.source, 'r', encoding='utf-8') as f:
+                mappings = read_mapping_source(f)
+        else:
+            if args.custom:
+                codebridge.load_custom_mappings(args.custom)
+            mappings = codebridge.mapping_manager.get_all_mappings()
+        
+        optimization = optimize_mappings(mappings, preserve_counts=args.preserve_counts)
+        print("📊 字典最佳化結果:")
+        for line in optimization.summary_lines():
+            print(f"  {line}")
+        
+        texts = list(verification_texts(mappings))
+        for corpus in args.corpus:
+            corpus_path = Path(corpus)
+            files = (
+                codebridge.file_processor.scan_directory(corpus_path)
+                if corpus_path.is_dir() else [corpus_path]
+            )
+            for file_path in files:
+                texts.append((str(file_path), file_path.read_text(encoding='utf-8', errors='replace')))
+        
+        mismatches = find_mismatches(
+            mappings, optimization.mappings, texts, compare_counts=args.preserve_counts
+        )
+        if mismatches:
+            print(f"❌ {len(mismatches)} 個驗證文本的轉換結果不同:")
+            for name in mismatches[:20]:
+                print(f"  • {name}")
+            return 1
+        print(f"✅ 驗證通過: {len(texts):,} 個文本的轉換結果完全相同")
+        
+        if args.output:
+            count = write_mapping_source(
+                optimization.mappings, Path(args.output),
+                header="由 codebridge optimize-dict 產生"
+            )
+            print(f"✅ 已寫入 {count:,} 個映射: {args.output}")
+        return 0
+        
+    except Exception as e:
+        print(f"❌ 執行錯誤: {e}")
+        return 1
+
+
+# 子命令名稱 -> 入口函數
+COMMANDS = {
+    'compile-dict': compile_dict_main,
+    'optimize-dict': optimize_dict_main,
+}
+
+
 def main():
     """命令行入口點"""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description='CodeBridge - 程式碼簡繁轉換工具',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -230,6 +462,8 @@ def main():
   %(prog)s --path /path/to/project
   %(prog)s --preview --custom mappings.txt
   %(prog)s --extensions .py,.js,.vue --path ./src
+  %(prog)s compile-dict --custom mappings.txt
+  %(prog)s optimize-dict --corpus ./src --output optimized.txt
         """
     )
     
@@ -43,7 +43,23 @@ class Config:
         "report_file": None,
         "encoding_detection": True,
         "parallel_processing": False,
-        "max_workers": 4
+        "max_workers": 4,
+        "cjk_runs_only": True,
+        "run_cache_size": 0,
+        "dict_cache": False,
+        "dict_cache_dir": None,
+        "dict_cache_max_files": 8,
+        "compact_dictionary": False,
+        "stream_large_files": True,
+        "stream_chunk_size": 1024 * 1024,
+        "utf8_byte_engine": True,
+        "write_mode": "rewrite",
+        "batch_chunk_size": 256,
+        "segmentation": "greedy",
+        "engine": "auto",
+        "category_keywords": {},
+        "directory_mappings": False,
+        "directory_mappings_file": "codebridge_custom.txt"
     }
     
     def __init__(self, config_path: Optional[str] = None):
@@ -74,6 +90,22 @@ class Config:
         self.encoding_detection = self.config_data["encoding_detection"]
         self.parallel_processing = self.config_data["parallel_processing"]
         self.max_workers = self.config_data["max_workers"]
+        self.cjk_runs_only = self.config_data["cjk_runs_only"]
+        self.run_cache_size = self.config_data["run_cache_size"]
+        self.dict_cache = self.config_data["dict_cache"]
+        self.dict_cache_dir = self.config_data["dict_cache_dir"]
+        self.dict_cache_max_files = self.config_data["dict_cache_max_files"]
+        self.compact_dictionary = self.config_data["compact_dictionary"]
+        self.stream_large_files = self.config_data["stream_large_files"]
+        self.stream_chunk_size = self.config_data["stream_chunk_size"]
+        self.utf8_byte_engine = self.config_data["utf8_byte_engine"]
+        self.write_mode = self.config_data["write_mode"]
+        self.batch_chunk_size = self.config_data["batch_chunk_size"]
+        self.segmentation = self.config_data["segmentation"]
+        self.engine = self.config_data["engine"]
+        self.category_keywords = self.config_data["category_keywords"]
+        self.directory_mappings = self.config_data["directory_mappings"]
+        self.directory_mappings_file = self.config_data["directory_mappings_file"]
     
     def load_config(self, config_path: str) -> bool:
         """
@@ -150,7 +182,23 @@ class Config:
                 "report_file": "報告輸出檔案路徑",
                 "encoding_detection": "是否啟用編碼自動檢測",
                 "parallel_processing": "是否啟用平行處理",
-                "max_workers": "最大工作執行緒數"
+                "max_workers": "最大工作執行緒數",
+                "cjk_runs_only": "只轉換中文片段，略過不含中文的檔案",
+                "run_cache_size": "中文片段轉換快取容量 (0 表示停用；只用於文字路徑，啟用時 auto 固定使用 translate 引擎)",
+                "dict_cache": "是否使用編譯字典快取（預設關閉；適合大型自定義字典）",
+                "dict_cache_dir": "編譯字典快取目錄 (預設 ~/.codebridge/cache)",
+                "dict_cache_max_files": "快取目錄最多保留的編譯字典數，超過時刪除最久未使用的檔案",
+                "compact_dictionary": "多字詞彙以雙陣列字典樹保存（記憶體約為預設 dict 字典樹的六分之一，但建構與查詢較慢；適合數十萬詞的自定義字典）",
+                "stream_large_files": "超過 max_file_size 的檔案改以串流方式逐塊轉換",
+                "stream_chunk_size": "串流轉換每次讀取的字元數",
+                "utf8_byte_engine": "UTF-8 檔案直接以位元組轉換，不經過解碼與編碼（engine 為 auto 或 bytes 時；auto 在映射剛變更或字典很大時仍解碼轉換）",
+                "write_mode": "寫回方式 (rewrite 重寫整個檔案, inplace 位元組長度不變時原地修改)",
+                "batch_chunk_size": "批量轉換時每次交給工作程序的文本數",
+                "segmentation": "詞彙切分方式 (greedy 最左最長, optimal 段數最少的最佳切分)",
+                "engine": "轉換引擎 (auto 依輸入自動選擇, legacy 舊版逐詞替換, translate/automaton/regex/bytes)",
+                "category_keywords": "字庫分類關鍵字 {分類名稱: [關鍵字]}，空值使用預設分類",
+                "directory_mappings": "讀取各目錄中的映射檔並套用到該目錄的子樹（距離最近者優先）",
+                "directory_mappings_file": "目錄映射檔名稱"
             }
         }
         config_content.update(self.DEFAULT_CONFIG)
@@ -253,6 +301,19 @@ class Config:
         if self.max_workers <= 0:
             errors.append("max_workers 必須大於 0")
         
+        if self.batch_chunk_size <= 0:
+            errors.append("batch_chunk_size 必須大於 0")
+        
+        # 檢查快取容量
+        if self.run_cache_size < 0:
+            errors.append("run_cache_size 不可小於 0")
+        
+        if self.dict_cache_max_files <= 0:
+            errors.append("dict_cache_max_files 必須大於 0")
+        
+        if self.stream_chunk_size <= 0:
+            errors.append("stream_chunk_size 必須大於 0")
+        
         # 檢查日誌級別
         valid_log_levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
         if self.log_level not in valid_log_levels:
@@ -263,6 +324,30 @@ class Config:
         if self.output_format not in valid_formats:
             errors.append(f"output_format 必須是 {valid_formats} 之一")
         
+        # 檢查寫回方式
+        valid_write_modes = ["rewrite", "inplace"]
+        if self.write_mode not in valid_write_modes:
+            errors.append(f"write_mode 必須是 {valid_write_modes} 之一")
+        
+        # 檢查詞彙切分方式
+        valid_segmentations = ["greedy", "optimal"]
+        if self.segmentation not in valid_segmentations:
+            errors.append(f"segmentation 必須是 {valid_segmentations} 之一")
+        
+        # 檢查轉換引擎
+        valid_engines = ["auto", "legacy", "translate", "automaton", "regex", "bytes"]
+        if self.engine not in valid_engines:
+            errors.append(f"engine 必須是 {valid_engines} 之一")
+        elif self.segmentation == "optimal" and self.engine not in ["auto", "translate"]:
+            errors.append("optimal 切分只支援 auto 或 translate 引擎")
+        
+        # 檢查字庫分類關鍵字
+        if not isinstance(self.category_keywords, dict) or not all(
+            isinstance(keywords, list) and all(isinstance(keyword, str) and keyword for keyword in keywords)
+            for keywords in self.category_keywords.values()
+        ):
+            errors.append("category_keywords 必須是 {分類名稱: [關鍵字]} 格式")
+        
         # 檢查自定義映射檔案
         if self.custom_mappings_file:
             if not Path(self.custom_mappings_file).exists():
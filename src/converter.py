@@ -4,9 +4,64 @@
 CodeBridge - 中文轉換器核心模組
 """
 
-from typing import Dict, List, Tuple, Set
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from itertools import accumulate, repeat
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Set
 import re
 
+try:
+    from .byte_engine import NON_ASCII_PATTERN, Utf8ByteEngine
+    from .cjk import CJK_RUN_PATTERN, contains_cjk, find_cjk
+    from .engines import (DEFAULT_ENGINE, available_engines, create_engine, select_engine,
+                          worth_compiling)
+    from .mappings import MAX_MAPPING_LENGTH
+    from .matcher import CompiledDictionary
+    from .parallel import ConversionPool
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from byte_engine import NON_ASCII_PATTERN, Utf8ByteEngine
+    from cjk import CJK_RUN_PATTERN, contains_cjk, find_cjk
+    from engines import (DEFAULT_ENGINE, available_engines, create_engine, select_engine,
+                         worth_compiling)
+    from mappings import MAX_MAPPING_LENGTH
+    from matcher import CompiledDictionary
+    from parallel import ConversionPool
+
+
+class ConversionSpan(NamedTuple):
+    """單一轉換的位置（行號與欄號從 1 開始）"""
+    offset: int
+    line: int
+    column: int
+    simplified: str
+    traditional: str
+
+
+class RangeConversion(NamedTuple):
+    """
+    convert_range() 的結果：以 replacement 取代原文的 [start, end)
+
+    count 為視窗內的轉換次數；提供修改前的文本時 old_count 為修改前同一段的轉換次數
+    """
+    start: int
+    end: int
+    replacement: str
+    count: int
+    old_count: Optional[int] = None
+
+    @property
+    def delta(self) -> Optional[int]:
+        """修改造成的轉換次數變化（未提供修改前的文本時為None）"""
+        if self.old_count is None:
+            return None
+        return self.count - self.old_count
+
+
+SEGMENTATION_MODES = ('greedy', 'optimal')
+
+# convert_many() 的分隔字元候選（控制字元與非字元碼位）
+BULK_SEPARATORS = ('\x00', '\x1f', '\x1e', '\x1d', '\x1c', '\ufdd0', '\uffff')
+
 
 class ChineseConverter:
     """
@@ -15,25 +70,104 @@ class ChineseConverter:
     負責執行實際的簡體轉繁體轉換
     """
     
-    def __init__(self, mapping_manager):
+    def __init__(self, mapping_manager, cjk_runs: bool = True, run_cache_size: int = 0,
+                 dict_cache=None, max_workers: int = 1, batch_chunk_size: int = 256,
+                 segmentation: str = 'greedy', engine: str = 'auto',
+                 compact_dictionary: bool = False, compiled=None):
         """
         初始化轉換器
         
         Args:
             mapping_manager: 映射管理器實例
+            cjk_runs: 只轉換文本中的中文片段，沒有表意文字的文本直接略過
+            run_cache_size: 中文片段轉換結果的 LRU 快取容量，0 表示停用
+            dict_cache: 編譯字典快取（DictionaryCache），None 表示每次重新編譯
+            max_workers: batch_convert 使用的工作程序數，1 表示不使用程序池
+            batch_chunk_size: batch_convert 每次交給工作程序的文本數
+            segmentation: 詞彙切分方式，greedy 為最左最長，optimal 為段數最少的最佳切分
+            engine: convert_text() 使用的轉換引擎，auto 依每個輸入自動選擇，
+                    legacy 為舊版逐詞替換，其餘見 available_engines()
+            compact_dictionary: 多字詞彙以雙陣列字典樹保存，記憶體較少但建構與查詢較慢
+            compiled: 與 mapping_manager 目前的映射一致的編譯字典（CompiledDictionary），
+                      提供時直接使用，不重新編譯
         """
+        if segmentation not in SEGMENTATION_MODES:
+            raise ValueError(f"segmentation 必須是 {SEGMENTATION_MODES} 之一")
+        if engine != 'auto' and engine not in available_engines():
+            raise ValueError(f"engine 必須是 auto 或 {available_engines()} 之一")
+        if segmentation != 'greedy' and engine not in ('auto', DEFAULT_ENGINE):
+            raise ValueError(f"optimal 切分只支援 auto 或 {DEFAULT_ENGINE} 引擎")
         self.mapping_manager = mapping_manager
-        self._sorted_mappings = None
-        self._update_sorted_mappings()
-    
-    def _update_sorted_mappings(self):
-        """更新已排序的映射（按長度降序）"""
-        all_mappings = self.mapping_manager.get_all_mappings()
-        self._sorted_mappings = sorted(
-            all_mappings.items(), 
-            key=lambda x: len(x[0]), 
-            reverse=True
-        )
+        self.dict_cache = dict_cache
+        self.segmentation = segmentation
+        self.engine = engine
+        self.compact_dictionary = compact_dictionary
+        self.cjk_runs = cjk_runs
+        self.run_cache_size = max(0, run_cache_size)
+        self._run_cache: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+        self._compiled = None
+        self._byte_engine = None
+        self._mapping_version = -1
+        self.max_workers = max(1, max_workers)
+        self.batch_chunk_size = max(1, batch_chunk_size)
+        self._pool = None
+        self._pool_version = None
+        self._separator = None
+        self._separator_version = None
+        # 依映射版本建立的具名引擎與各引擎的使用次數
+        self._engines: Dict[str, Callable[[str], Tuple[str, int]]] = {}
+        self._engines_version = None
+        self._engine_stats: Counter = Counter()
+        # 目前版本的字典已轉換的字元數，auto 模式據此判斷是否值得編譯正則表達式類引擎
+        self._version_chars = 0
+        # 最近一次分析的 ((映射版本, 文本長度, 文本雜湊值), 統計)，讓預覽與統計方法共用同一次掃描；
+        # 只保存雜湊值，不保留可能數 MB 的原文
+        self._last_analysis = None
+        if compiled is None:
+            self._rebuild_dictionary()
+        else:
+            compiled.segmentation = segmentation
+            self._compiled = compiled
+            self._mapping_version = mapping_manager.get_version()
+    
+    def _rebuild_dictionary(self):
+        """以目前的映射快照完整重建轉換字典（有快取時直接載入）"""
+        snapshot = self.mapping_manager.snapshot()
+        if self.dict_cache is not None:
+            self._compiled = self.dict_cache.get_or_compile(
+                self.mapping_manager.get_fingerprint(snapshot),
+                snapshot.merged_view,
+                self.compact_dictionary
+            )
+        else:
+            # 最佳切分會放回最佳化時移除的詞彙，直接略過最佳化
+            self._compiled = CompiledDictionary(
+                snapshot.merged_view(), optimize=self.segmentation == 'greedy',
+                compact=self.compact_dictionary
+            )
+        self._compiled.segmentation = self.segmentation
+        self._mapping_version = snapshot.version
+        self._byte_engine = None
+        self._version_chars = 0
+        self.clear_run_cache()
+    
+    def _refresh_if_needed(self):
+        """映射版本改變時增量更新轉換字典，變更紀錄不完整時才完整重建"""
+        if self.mapping_manager.get_version() == self._mapping_version:
+            return
+        
+        delta = self.mapping_manager.get_changes_since(self._mapping_version)
+        if delta is None:
+            self._rebuild_dictionary()
+            return
+        
+        version, changes = delta
+        self._compiled.apply_changes(changes)
+        self._mapping_version = version
+        self._byte_engine = None
+        self._version_chars = 0
+        self.clear_run_cache()
     
     def convert_text(self, text: str) -> Tuple[str, int]:
         """
@@ -48,22 +182,442 @@ class ChineseConverter:
         if not text:
             return text, 0
         
-        # 如果映射已更新，重新排序
-        if self.mapping_manager.is_mappings_updated():
-            self._update_sorted_mappings()
+        self._refresh_if_needed()
+        
+        # 第一個表意文字的位置只搜尋一次，引擎選擇與中文片段切分共用
+        use_runs = self._use_cjk_runs()
+        engine = self.engine
+        first_cjk = find_cjk(text) if use_runs or engine == 'auto' else 0
+        
+        if engine == 'auto':
+            engine = self._select_engine(text, first_cjk >= 0)
+        self._engine_stats[engine] += 1
+        self._version_chars += len(text)
+        if use_runs and first_cjk < 0:
+            # 所有詞彙都只由表意文字組成，沒有表意文字的文本不會有任何轉換
+            return text, 0
+        if engine != DEFAULT_ENGINE:
+            return self._get_engine(engine)(text)
+        
+        if use_runs and not self._compiled.vectorized_for(len(text)):
+            return self._convert_cjk_runs(text, first_cjk)
+        
+        # 詞彙以最左最長規則比對，其餘部分以單字轉換表在 C 層級轉換
+        return self._compiled.convert(text)
+    
+    def _select_engine(self, text: str, has_cjk: bool) -> str:
+        """auto 模式下為單一輸入選擇引擎"""
+        # 最佳切分與片段快取只在 translate 引擎中實作
+        if self.segmentation != 'greedy' or self.run_cache_size:
+            return DEFAULT_ENGINE
+        built = self._engines if self._engines_version == self._mapping_version else ()
+        return select_engine(text, self._compiled, has_cjk, self._version_chars, built)
+    
+    def _get_engine(self, name: str) -> Callable[[str], Tuple[str, int]]:
+        """獲取具名引擎（第一次使用時才建立，映射變更後重新建立）"""
+        if self._engines_version != self._mapping_version:
+            self._engines.clear()
+            self._engines_version = self._mapping_version
+        
+        engine = self._engines.get(name)
+        if engine is None:
+            engine = create_engine(name, self._compiled, self.mapping_manager.snapshot())
+            self._engines[name] = engine
+        return engine
+    
+    def get_compiled_dictionary(self) -> CompiledDictionary:
+        """
+        獲取與目前映射一致的編譯字典
+
+        Returns:
+            CompiledDictionary: 轉換器使用中的字典（修改前請先 copy()）
+        """
+        self._refresh_if_needed()
+        return self._compiled
+    
+    def get_engine_stats(self) -> Dict[str, int]:
+        """
+        獲取各轉換引擎的使用次數
+        
+        Returns:
+            Dict[str, int]: {引擎名稱: 呼叫次數}，包含 convert_text() 與位元組路徑
+            （convert_bytes()、find_byte_patches()）
+        """
+        return dict(self._engine_stats)
+    
+    def convert_bytes(self, data) -> Tuple[bytes, int]:
+        """
+        直接轉換 UTF-8 編碼的內容，不經過 str 解碼與編碼
+        
+        auto 模式下映射剛變更或字典很大時（見 worth_compiling）不編譯位元組引擎，
+        改為解碼後以 convert_text() 轉換；引擎為 bytes 以外的具名引擎時亦同
+        
+        Args:
+            data: 合法 UTF-8 的 bytes 或 mmap 物件（呼叫端負責驗證）
+        
+        Returns:
+            Tuple[bytes, int]: (轉換後的內容, 轉換次數)
+        """
+        engine = self._get_byte_engine(len(data))
+        if engine is None:
+            converted, count = self.convert_text(str(data, 'utf-8'))
+            return converted.encode('utf-8'), count
+        return engine.convert(data)
+    
+    def _get_byte_engine(self, size: int) -> Optional[Utf8ByteEngine]:
+        """
+        獲取位元組引擎並記錄使用次數（第一次使用時才編譯，映射變更後重新編譯）
+        
+        Args:
+            size: 要轉換的內容長度（位元組）
+        
+        Returns:
+            Optional[Utf8ByteEngine]: 不適用位元組引擎時返回None，呼叫端改走文字路徑
+        """
+        self._refresh_if_needed()
+        if self.segmentation != 'greedy':
+            # 位元組引擎只支援最左最長比對
+            return None
+        if self._byte_engine is None:
+            if self.engine == 'auto':
+                # 與 select_engine() 相同：映射剛變更或字典很大時不編譯
+                if self.run_cache_size or not worth_compiling(self._compiled, self._version_chars):
+                    return None
+            elif self.engine != 'bytes':
+                return None
+            self._byte_engine = Utf8ByteEngine.from_compiled(self._compiled)
+        self._engine_stats['bytes'] += 1
+        self._version_chars += size
+        return self._byte_engine
+    
+    def _use_cjk_runs(self) -> bool:
+        """是否啟用中文片段模式（詞彙含非表意文字時自動停用）"""
+        return self.cjk_runs and self._compiled.cjk_only
+    
+    def may_convert(self, text: str) -> bool:
+        """
+        快速判斷文本是否可能需要轉換
+        
+        Args:
+            text: 要檢查的文本
+        
+        Returns:
+            bool: 中文片段模式下文本不含表意文字時返回 False
+        """
+        if not text:
+            return False
+        self._refresh_if_needed()
+        if not self._use_cjk_runs():
+            return True
+        return contains_cjk(text)
+    
+    def find_byte_patches(self, data) -> Optional[Tuple[List[Tuple[int, bytes]], int]]:
+        """
+        找出可原地修改 UTF-8 內容的替換位置
+        
+        Args:
+            data: 合法 UTF-8 的 bytes 或 mmap 物件
+        
+        Returns:
+            Optional[Tuple[List[Tuple[int, bytes]], int]]: ([(位元組位置, 替換內容), ...], 轉換次數)，
+            有轉換改變位元組長度或引擎無法逐處列出轉換時返回None
+        """
+        engine = self._get_byte_engine(len(data))
+        if engine is not None:
+            return engine.patches(data)
+        if self.engine not in ('auto', DEFAULT_ENGINE):
+            return None
+        
+        # 未編譯位元組引擎時由 translate 的比對結果換算位元組位置
+        text = str(data, 'utf-8')
+        self._engine_stats[DEFAULT_ENGINE] += 1
+        self._version_chars += len(text)
+        patches = []
+        offset = 0
+        last = 0
+        for start, simplified, traditional in self._compiled.iter_conversions(text):
+            replacement = traditional.encode('utf-8')
+            size = len(simplified.encode('utf-8'))
+            if size != len(replacement):
+                return None
+            offset += len(text[last:start].encode('utf-8'))
+            patches.append((offset, replacement))
+            offset += size
+            last = start + len(simplified)
+        return patches, len(patches)
+    
+    def may_convert_bytes(self, data) -> bool:
+        """
+        快速判斷 UTF-8 內容是否可能需要轉換
+        
+        Args:
+            data: UTF-8 編碼的 bytes 或 mmap 物件
+        
+        Returns:
+            bool: 中文片段模式下內容全為 ASCII 時返回 False
+        """
+        if not len(data):
+            return False
+        self._refresh_if_needed()
+        if not self._use_cjk_runs():
+            return True
+        return NON_ASCII_PATTERN.search(data) is not None
+    
+    def _convert_cjk_runs(self, text: str, first: int) -> Tuple[str, int]:
+        """
+        只轉換連續的中文片段，再與其他內容拼接
+        
+        Args:
+            text: 要轉換的文本
+            first: 第一個表意文字的位置（呼叫端已搜尋）
         
-        converted = text
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換次數)
+        """
+        segments = []
         total_count = 0
+        last_end = 0
+        
+        convert_run = self._convert_run if self.run_cache_size else self._compiled.convert
         
-        # 按照詞彙長度排序，優先轉換長詞彙
-        for simplified, traditional in self._sorted_mappings:
-            if simplified in converted and simplified != traditional:
-                count = converted.count(simplified)
-                if count > 0:
-                    converted = converted.replace(simplified, traditional)
-                    total_count += count
+        for match in CJK_RUN_PATTERN.finditer(text, first):
+            converted, count = convert_run(match.group())
+            if count:
+                segments.append(text[last_end:match.start()])
+                segments.append(converted)
+                last_end = match.end()
+                total_count += count
         
-        return converted, total_count
+        if not total_count:
+            return text, 0
+        
+        segments.append(text[last_end:])
+        return ''.join(segments), total_count
+    
+    def _convert_run(self, run: str) -> Tuple[str, int]:
+        """透過 LRU 快取轉換單一中文片段"""
+        cached = self._run_cache.get(run)
+        if cached is not None:
+            self._run_cache.move_to_end(run)
+            self._cache_stats['hits'] += 1
+            return cached
+        
+        self._cache_stats['misses'] += 1
+        result = self._compiled.convert(run)
+        self._run_cache[run] = result
+        if len(self._run_cache) > self.run_cache_size:
+            self._run_cache.popitem(last=False)
+            self._cache_stats['evictions'] += 1
+        return result
+    
+    def clear_run_cache(self):
+        """清空中文片段快取（映射變更時自動呼叫）"""
+        if self._run_cache:
+            self._run_cache.clear()
+            self._cache_stats['invalidations'] += 1
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        獲取中文片段快取統計
+        
+        Returns:
+            Dict[str, int]: 命中、未命中、淘汰、失效次數與目前容量
+        """
+        stats = dict(self._cache_stats)
+        stats['size'] = len(self._run_cache)
+        stats['max_size'] = self.run_cache_size
+        return stats
+    
+    def convert_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        逐塊轉換文本，記憶體用量與總長度無關
+        
+        每個文本塊尾端最多保留（最長詞彙長度 - 1）個字元與下一塊合併，
+        跨越文本塊邊界的詞彙不會遺漏，輸出與一次轉換整段文本相同
+        
+        Args:
+            chunks: 文本塊序列
+        
+        Yields:
+            str: 轉換後的文本塊（與輸入塊不一定一一對應）
+        """
+        for converted, _ in self.iter_convert_stream(chunks):
+            yield converted
+    
+    def iter_convert_stream(self, chunks: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """
+        逐塊轉換文本並返回各塊的轉換次數
+        
+        Args:
+            chunks: 文本塊序列
+        
+        Yields:
+            Tuple[str, int]: (轉換後的文本塊, 轉換次數)
+        """
+        def convert_prefix(buffer: str, limit: int):
+            converted, count, consumed = self._compiled.convert_prefix(buffer, limit)
+            return (converted, count), consumed
+        
+        return self._process_stream(chunks, convert_prefix)
+    
+    def preview_stream(self, chunks: Iterable[str]) -> List[Tuple[str, str, int]]:
+        """
+        逐塊預覽轉換結果，用於無法一次載入的大型文本
+        
+        Args:
+            chunks: 文本塊序列
+        
+        Returns:
+            List[Tuple[str, str, int]]: [(簡體詞, 繁體詞, 出現次數), ...]
+        """
+        tally = Counter()
+        
+        def tally_prefix(buffer: str, limit: int):
+            return None, self._compiled.tally_prefix(buffer, limit, tally)
+        
+        for _ in self._process_stream(chunks, tally_prefix):
+            pass
+        
+        conversions = [
+            (simplified, traditional, count)
+            for (simplified, traditional), count in tally.items()
+        ]
+        conversions.sort(key=lambda item: len(item[0]), reverse=True)
+        return conversions
+    
+    def _process_stream(self, chunks: Iterable[str], process) -> Iterator:
+        """
+        將文本塊與上一塊保留的尾端合併後交給 process 處理
+        
+        Args:
+            chunks: 文本塊序列
+            process: process(緩衝區, 詞彙開始位置上限) -> (結果, 已處理長度)
+        
+        Yields:
+            process 返回的結果
+        """
+        self._refresh_if_needed()
+        # 開始位置在 limit 之前的詞彙必定完整落在緩衝區內
+        holdback = max(self._compiled.max_key_length - 1, 0)
+        carry = ''
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            buffer = carry + chunk if carry else chunk
+            limit = len(buffer) - holdback
+            if limit > 0:
+                limit = self._compiled.safe_limit(buffer, limit)
+            if limit <= 0:
+                carry = buffer
+                continue
+            
+            result, consumed = process(buffer, limit)
+            carry = buffer[consumed:]
+            yield result
+        
+        if carry:
+            result, _ = process(carry, len(carry))
+            yield result
+    
+    def convert_range(self, text: str, start: int, end: int,
+                      old_text: Optional[str] = None) -> RangeConversion:
+        """
+        只重新轉換文本中被修改的範圍
+        
+        修改範圍會擴大到沒有任何詞彙跨越的邊界（中文片段模式下最遠到所在片段的兩端），
+        視窗內的轉換結果與轉換整個文本後取同一段相同
+        
+        Args:
+            text: 修改後的完整文本
+            start: 修改範圍的開始位置
+            end: 修改範圍的結束位置
+            old_text: 修改前的完整文本（[start, end) 以外的內容與 text 相同），
+                      提供時一併計算修改造成的轉換次數變化
+        
+        Returns:
+            RangeConversion: (視窗開始, 視窗結束, 替換內容, 視窗內的轉換次數, 修改前同一段的轉換次數)，
+            delta 為兩者的差，即轉換整個文本時的轉換次數變化
+        """
+        if not 0 <= start <= end <= len(text):
+            raise ValueError(f"範圍超出文本: [{start}, {end})")
+        
+        self._refresh_if_needed()
+        compiled = self._compiled
+        window_start = compiled.boundary_before(text, start)
+        window_end = compiled.boundary_after(text, end)
+        if old_text is None:
+            converted, count = self.convert_text(text[window_start:window_end])
+            return RangeConversion(window_start, window_end, converted, count)
+        
+        # 修改之後的內容在修改前的文本中位移 shift 個字元
+        shift = len(text) - len(old_text)
+        if end - shift < start:
+            raise ValueError("修改前的文本與修改範圍不符")
+        # 視窗邊界必須在修改前後的文本中都沒有詞彙跨越，視窗外的轉換才會完全相同
+        while True:
+            old_start = compiled.boundary_before(old_text, window_start)
+            old_end = compiled.boundary_after(old_text, window_end - shift)
+            if old_start == window_start and old_end + shift == window_end:
+                break
+            window_start = compiled.boundary_before(text, old_start)
+            window_end = compiled.boundary_after(text, old_end + shift)
+        
+        converted, count = self.convert_text(text[window_start:window_end])
+        _, old_count = self.convert_text(old_text[window_start:window_end - shift])
+        return RangeConversion(window_start, window_end, converted, count, old_count)
+    
+    def convert_text_with_spans(self, text: str) -> Tuple[str, List[ConversionSpan]]:
+        """
+        轉換文本並返回每一處轉換在原文中的位置
+        
+        Args:
+            text: 要轉換的文本
+        
+        Returns:
+            Tuple[str, List[ConversionSpan]]: (轉換後的文本, 轉換位置列表)，
+            列表長度即為轉換次數
+        """
+        spans = self.preview_conversion_spans(text)
+        if not spans:
+            return text, spans
+        
+        # 由轉換位置直接拼接結果，不需再次比對
+        segments = []
+        last_end = 0
+        for span in spans:
+            segments.append(text[last_end:span.offset])
+            segments.append(span.traditional)
+            last_end = span.offset + len(span.simplified)
+        segments.append(text[last_end:])
+        return ''.join(segments), spans
+    
+    def preview_conversion_spans(self, text: str) -> List[ConversionSpan]:
+        """
+        預覽每一處轉換在原文中的位置，不建立轉換後的文本
+        
+        Args:
+            text: 要分析的文本
+        
+        Returns:
+            List[ConversionSpan]: [(位置, 行號, 欄號, 簡體詞, 繁體詞), ...]
+        """
+        if not text or not self.may_convert(text):
+            return []
+        
+        line_starts = None
+        spans = []
+        for offset, simplified, traditional in self._compiled.iter_conversions(text):
+            if line_starts is None:
+                # 各行開頭位置只在有轉換時計算一次，之後以二分搜尋定位
+                line_starts = list(accumulate(
+                    map(len, text.split('\n')), lambda start, length: start + length + 1, initial=0
+                ))
+            line = bisect_right(line_starts, offset)
+            spans.append(ConversionSpan(
+                offset, line, offset - line_starts[line - 1] + 1, simplified, traditional
+            ))
+        return spans
     
     def preview_conversion(self, text: str) -> List[Tuple[str, str, int]]:
         """
@@ -75,18 +629,47 @@ class ChineseConverter:
         Returns:
             List[Tuple[str, str, int]]: [(簡體詞, 繁體詞, 出現次數), ...]
         """
-        if not text:
-            return []
+        tally = self._analyze(text)
         
-        conversions = []
+        # 長詞彙在前，同長度依首次出現順序
+        conversions = [
+            (simplified, traditional, count)
+            for (simplified, traditional), count in tally.items()
+        ]
+        conversions.sort(key=lambda item: len(item[0]), reverse=True)
+        return conversions
+    
+    def _analyze(self, text: str) -> Counter:
+        """
+        以與 convert_text() 相同的比對結果統計 (簡體詞, 繁體詞) 出現次數
         
-        for simplified, traditional in self._sorted_mappings:
-            if simplified in text and simplified != traditional:
-                count = text.count(simplified)
-                if count > 0:
-                    conversions.append((simplified, traditional, count))
+        同一文本連續分析時直接重用上一次的結果
         
-        return conversions
+        Args:
+            text: 要分析的文本
+        
+        Returns:
+            Counter: {(簡體詞, 繁體詞): 次數}
+        """
+        # may_convert() 會先同步映射版本
+        if not text or not self.may_convert(text):
+            return Counter()
+        
+        # str 的雜湊值計算一次後即快取在物件上，同一文本再次分析只需比較鍵
+        key = (self._mapping_version, len(text), hash(text))
+        cached = self._last_analysis
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        tally = Counter()
+        if self._use_cjk_runs():
+            for match in CJK_RUN_PATTERN.finditer(text):
+                self._compiled.tally(match.group(), tally)
+        else:
+            self._compiled.tally(text, tally)
+        
+        self._last_analysis = (key, tally)
+        return tally
     
     def find_chinese_text(self, text: str) -> List[Tuple[int, int, str]]:
         """
@@ -129,7 +712,7 @@ class ChineseConverter:
             return False
         
         # 檢查長度合理性
-        if len(simplified) > 50 or len(traditional) > 50:
+        if len(simplified) > MAX_MAPPING_LENGTH or len(traditional) > MAX_MAPPING_LENGTH:
             return False
         
         return True
@@ -156,27 +739,108 @@ class ChineseConverter:
         stats['chinese_chars'] = len(chinese_chars)
         
         # 計算可轉換的字符數和映射數
-        conversions = self.preview_conversion(text)
-        stats['conversion_mappings'] = len(conversions)
-        stats['convertible_chars'] = sum(len(simplified) * count for simplified, _, count in conversions)
+        tally = self._analyze(text)
+        stats['conversion_mappings'] = len(tally)
+        stats['convertible_chars'] = sum(
+            len(simplified) * count for (simplified, _), count in tally.items()
+        )
         
         return stats
     
-    def batch_convert(self, texts: List[str]) -> List[Tuple[str, int]]:
+    def batch_convert(self, texts: List[str], max_workers: Optional[int] = None,
+                      chunk_size: Optional[int] = None) -> List[Tuple[str, int]]:
         """
         批量轉換多個文本
         
+        工作程序數大於 1 且文本數超過一組時，分組交給程序池平行轉換
+        
+        Args:
+            texts: 文本列表
+            max_workers: 工作程序數，預設使用初始化時的設定
+            chunk_size: 每組文本數，預設使用初始化時的設定
+        
+        Returns:
+            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]，順序與輸入相同
+        """
+        max_workers = self.max_workers if max_workers is None else max(1, max_workers)
+        chunk_size = self.batch_chunk_size if chunk_size is None else max(1, chunk_size)
+        
+        if self.engine not in ('auto', DEFAULT_ENGINE):
+            # 工作程序只使用 translate 引擎，指定其他引擎時逐一轉換
+            return [self.convert_text(text) for text in texts]
+        
+        if max_workers > 1 and len(texts) > chunk_size:
+            return self._get_pool(max_workers).convert(texts, chunk_size)
+        
+        return self.convert_many(texts)
+    
+    def convert_many(self, texts: List[str]) -> List[Tuple[str, int]]:
+        """
+        在同一執行緒中一次轉換大量短文本
+        
+        以不會出現在任何映射中的分隔字元串接所有文本後只掃描一次，
+        省去逐一呼叫 convert_text() 的額外負擔
+        
         Args:
             texts: 文本列表
         
         Returns:
-            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]
+            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]，順序與輸入相同
         """
-        results = []
-        for text in texts:
-            converted, count = self.convert_text(text)
-            results.append((converted, count))
-        return results
+        if not texts:
+            return []
+        
+        if self.engine not in ('auto', DEFAULT_ENGINE):
+            return [self.convert_text(text) for text in texts]
+        
+        separator = self._get_separator()
+        # 任一文本本身包含分隔字元時無法正確拆回，改為逐一轉換
+        if separator is not None and not sum(map(str.count, texts, repeat(separator))):
+            return self._compiled.convert_joined(texts, separator)
+        
+        return [self.convert_text(text) for text in texts]
+    
+    def _get_separator(self) -> Optional[str]:
+        """挑選不出現在任何詞彙與轉換結果中的分隔字元（依映射版本快取）"""
+        self._refresh_if_needed()
+        if self._separator_version == self._mapping_version:
+            return self._separator
+        
+        uses_char = self._compiled.uses_char
+        self._separator = next(
+            (char for char in BULK_SEPARATORS if not uses_char(char)), None
+        )
+        self._separator_version = self._mapping_version
+        return self._separator
+    
+    def _get_pool(self, max_workers: int) -> ConversionPool:
+        """獲取程序池，映射版本或工作程序數改變時重新建立"""
+        self._refresh_if_needed()
+        pool = self._pool
+        if pool is not None and self._pool_version == self._mapping_version \
+                and pool.max_workers == max_workers:
+            return pool
+        
+        self.close()
+        cache_key = None
+        if self.dict_cache is not None:
+            snapshot = self.mapping_manager.snapshot()
+            if snapshot.version == self._mapping_version:
+                cache_key = self.dict_cache.make_key(
+                    self.mapping_manager.get_fingerprint(snapshot), self.compact_dictionary
+                )
+        
+        self._pool = ConversionPool(self._compiled, max_workers, self.dict_cache, cache_key,
+                                    segmentation=self.segmentation)
+        self._pool_version = self._mapping_version
+        return self._pool
+    
+    def close(self):
+        """關閉 batch_convert 使用的程序池"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+            self._pool_version = None
     
     def get_unique_conversions(self, text: str) -> Set[Tuple[str, str]]:
         """
@@ -188,5 +852,4 @@ class ChineseConverter:
         Returns:
             Set[Tuple[str, str]]: 唯一的(簡體, 繁體)對
         """
-        conversions = self.preview_conversion(text)
-        return set((simplified, traditional) for simplified, traditional, _ in conversions)
+        return set(self._analyze(text))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 編譯字典快取
+"""
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+try:
+    from .matcher import CompiledDictionary
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from matcher import CompiledDictionary
+
+
+# 檔案格式：魔術字串 + 快取鍵（64 個十六進位字元）+ marshal 序列化的字典狀態
+# （第 3 版起另存最佳化時移除的詞彙，第 4 版起詞彙字典樹依 compact 為 dict 或雙陣列的原始位元組）
+CACHE_MAGIC = b'CBDICT04'
+CACHE_FORMAT_VERSION = 4
+DEFAULT_CACHE_DIR = Path.home() / '.codebridge' / 'cache'
+# 快取目錄最多保留的字典數，超過時刪除最久未使用的檔案
+DEFAULT_MAX_CACHE_FILES = 8
+
+
+class DictionaryCache:
+    """
+    編譯字典快取
+
+    以內建與自定義映射的雜湊值為鍵，將編譯後的轉換字典存放於快取目錄，
+    下次啟動時透過 mmap 載入，不需在 Python 層重新合併與排序；
+    檔案的修改時間即最近使用時間，超過 max_files 個時刪除最久未使用的檔案
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_files: int = DEFAULT_MAX_CACHE_FILES):
+        """
+        初始化快取
+
+        Args:
+            cache_dir: 快取目錄，預設為 ~/.codebridge/cache
+            max_files: 最多保留的字典數
+        """
+        self.logger = logging.getLogger('CodeBridge.DictionaryCache')
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_files = max(1, max_files)
+
+    @staticmethod
+    def make_key(fingerprint: str, compact: bool = False) -> str:
+        """
+        由映射指紋產生快取鍵，並納入格式、字典樹形式與直譯器版本
+
+        Args:
+            fingerprint: MappingManager.get_fingerprint() 的結果
+            compact: 多字詞彙是否以雙陣列字典樹保存
+
+        Returns:
+            str: 快取鍵
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT_VERSION}:{marshal.version}:{sys.version_info[:2]}:{int(compact)}:".encode('ascii'))
+        digest.update(fingerprint.encode('ascii'))
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """獲取快取鍵對應的檔案路徑"""
+        return self.cache_dir / f"{key}.cbdict"
+
+    def load(self, key: str) -> Optional[CompiledDictionary]:
+        """
+        載入編譯字典
+
+        Args:
+            key: 快取鍵
+
+        Returns:
+            Optional[CompiledDictionary]: 快取不存在或損壞時返回None
+        """
+        cache_file = self.path_for(key)
+        if not cache_file.exists():
+            return None
+
+        header_size = len(CACHE_MAGIC) + len(key)
+        try:
+            with open(cache_file, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if mapped[:header_size] != CACHE_MAGIC + key.encode('ascii'):
+                        self.logger.warning(f"快取檔案標頭不符，忽略: {cache_file}")
+                        return None
+                    with memoryview(mapped) as view:
+                        state = marshal.loads(view[header_size:])
+            compiled = CompiledDictionary.from_state(state)
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            self.logger.warning(f"載入字典快取失敗 {cache_file}: {e}")
+            return None
+
+        try:
+            # 更新修改時間，淘汰時視為最近使用
+            os.utime(cache_file)
+        except OSError:
+            pass
+        self.logger.debug(f"從快取載入編譯字典: {cache_file}")
+        return compiled
+
+    def store(self, key: str, compiled: CompiledDictionary) -> Optional[Path]:
+        """
+        儲存編譯字典
+
+        Args:
+            key: 快取鍵
+            compiled: 編譯後的轉換字典
+
+        Returns:
+            Optional[Path]: 快取檔案路徑，失敗時返回None
+        """
+        cache_file = self.path_for(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = marshal.dumps(compiled.to_state())
+
+            # 先寫入暫存檔再替換，避免其他程序讀到寫到一半的檔案
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(CACHE_MAGIC)
+                    f.write(key.encode('ascii'))
+                    f.write(payload)
+                os.replace(temp_path, cache_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"儲存字典快取失敗 {cache_file}: {e}")
+            return None
+
+        self.logger.debug(f"儲存編譯字典快取: {cache_file}")
+        self._evict(cache_file)
+        return cache_file
+
+    def _evict(self, keep: Path):
+        """
+        刪除最久未使用的快取檔案，只保留 max_files 個
+
+        Args:
+            keep: 剛寫入的檔案（不刪除）
+        """
+        entries = []
+        for cache_file in self.cache_dir.glob('*.cbdict'):
+            try:
+                entries.append((cache_file.stat().st_mtime_ns, cache_file))
+            except OSError:
+                # 其他程序同時刪除
+                continue
+        if len(entries) <= self.max_files:
+            return
+
+        entries.sort(reverse=True)
+        for _, cache_file in entries[self.max_files:]:
+            if cache_file == keep:
+                continue
+            try:
+                cache_file.unlink()
+                self.logger.debug(f"淘汰字典快取: {cache_file}")
+            except OSError as e:
+                self.logger.warning(f"刪除字典快取失敗 {cache_file}: {e}")
+
+    def get_or_compile(self, fingerprint: str, mappings_factory,
+                       compact: bool = False) -> CompiledDictionary:
+        """
+        從快取載入編譯字典，沒有快取時編譯並儲存
+
+        Args:
+            fingerprint: 映射指紋
+            mappings_factory: 返回完整映射表的函數，只在快取未命中時呼叫
+            compact: 多字詞彙是否以雙陣列字典樹保存
+
+        Returns:
+            CompiledDictionary: 編譯後的轉換字典
+        """
+        key = self.make_key(fingerprint, compact)
+        compiled = self.load(key)
+        if compiled is None:
+            compiled = CompiledDictionary(mappings_factory(), compact=compact)
+            self.store(key, compiled)
+        return compiled
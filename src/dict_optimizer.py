@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 字典最佳化
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Tuple
+
+try:
+    from .matcher import CompiledDictionary, find_redundant_phrases
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from matcher import CompiledDictionary, find_redundant_phrases
+
+
+@dataclass
+class DictionaryOptimization:
+    """字典最佳化結果"""
+    mappings: Dict[str, str]
+    original_entries: int
+    # 移除的單字與詞彙（依類別）
+    identity_chars: List[str] = field(default_factory=list)
+    identity_phrases: List[str] = field(default_factory=list)
+    charwise_phrases: List[str] = field(default_factory=list)
+    # 詞彙比對器的詞彙數與字典樹節點數（最佳化前, 最佳化後）
+    matcher_phrases: Tuple[int, int] = (0, 0)
+    matcher_size: Tuple[int, int] = (0, 0)
+
+    @property
+    def removed(self) -> int:
+        """移除的映射數"""
+        return self.original_entries - len(self.mappings)
+
+    def summary_lines(self) -> List[str]:
+        """可直接輸出的摘要"""
+        def shrink(before: int, after: int) -> str:
+            percent = (before - after) / before * 100 if before else 0.0
+            return f"{before:,} → {after:,} (-{percent:.1f}%)"
+
+        return [
+            f"映射數: {shrink(self.original_entries, len(self.mappings))}",
+            f"  對應自己的單字: {len(self.identity_chars):,}",
+            f"  對應自己的詞彙: {len(self.identity_phrases):,}",
+            f"  等於逐字轉換的詞彙: {len(self.charwise_phrases):,}",
+            f"比對器詞彙數: {shrink(*self.matcher_phrases)}",
+            f"比對器字典樹節點數: {shrink(*self.matcher_size)}",
+        ]
+
+
+def optimize_mappings(mappings: Mapping[str, str],
+                      preserve_counts: bool = False) -> DictionaryOptimization:
+    """
+    移除不影響轉換結果的映射
+
+    對應自己的單字一律移除；多字詞彙依 find_redundant_phrases() 的條件移除，
+    結果只保證最左最長切分的轉換文字相同。preserve_counts 時只移除對應自己的詞彙，
+    轉換次數與各映射的統計也不變；否則等於逐字轉換的詞彙改以單字計數
+
+    Args:
+        mappings: 映射表 {簡體: 繁體}
+        preserve_counts: 是否保持轉換次數不變
+
+    Returns:
+        DictionaryOptimization: 最佳化後的映射與各類別的移除數量
+    """
+    original = CompiledDictionary(mappings, optimize=False)
+    phrases = dict(original.phrase_matcher.items())
+    redundant = find_redundant_phrases(phrases, original.char_table, identity_only=preserve_counts)
+
+    result = DictionaryOptimization(mappings={}, original_entries=len(mappings))
+    for simplified, traditional in mappings.items():
+        if len(simplified) == 1 and simplified == traditional:
+            result.identity_chars.append(simplified)
+        elif simplified in redundant:
+            if simplified == traditional:
+                result.identity_phrases.append(simplified)
+            else:
+                result.charwise_phrases.append(simplified)
+        else:
+            result.mappings[simplified] = traditional
+
+    optimized = CompiledDictionary(result.mappings, optimize=False)
+    result.matcher_phrases = (len(original.phrase_matcher), len(optimized.phrase_matcher))
+    result.matcher_size = (original.phrase_matcher.size, optimized.phrase_matcher.size)
+    return result
+
+
+def verification_texts(mappings: Mapping[str, str]) -> Iterator[Tuple[str, str]]:
+    """
+    由映射本身產生的驗證文本：每個簡體詞單獨一段，以及所有簡體詞依序串接
+    （串接讓相鄰詞彙互相重疊，涵蓋跨詞彙邊界的比對）
+
+    Yields:
+        Tuple[str, str]: (名稱, 文本)
+    """
+    keys = sorted(mappings)
+    for simplified in keys:
+        yield f"詞彙 {simplified}", simplified
+    yield "全部詞彙串接", ''.join(keys)
+    yield "全部詞彙反序串接", ''.join(reversed(keys))
+
+
+def find_mismatches(original: Mapping[str, str], optimized: Mapping[str, str],
+                    texts: Iterable[Tuple[str, str]],
+                    compare_counts: bool = False) -> List[str]:
+    """
+    以兩份映射分別轉換驗證文本，找出結果不同的文本
+
+    Args:
+        original: 原始映射表
+        optimized: 最佳化後的映射表
+        texts: (名稱, 文本)
+        compare_counts: 是否一併比較轉換次數
+
+    Returns:
+        List[str]: 結果不同的文本名稱
+    """
+    before = CompiledDictionary(original, optimize=False)
+    after = CompiledDictionary(optimized, optimize=False)
+    mismatches = []
+    for name, text in texts:
+        expected = before.convert(text)
+        actual = after.convert(text)
+        if expected[0] != actual[0] or (compare_counts and expected[1] != actual[1]):
+            mismatches.append(name)
+    return mismatches
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 目錄層級的自定義映射
+"""
+
+import logging
+import stat
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from .mappings import MappingManager
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from mappings import MappingManager
+
+
+DEFAULT_LAYER_FILENAME = 'codebridge_custom.txt'
+
+# 同時保留的已編譯映射組合數（依最近使用淘汰）
+MAX_CACHED_STACKS = 32
+
+# 映射層的識別：(檔案路徑, 修改時間, 檔案大小)
+LayerKey = Tuple[str, int, int]
+
+
+class DirectoryMappings:
+    """
+    目錄層級的自定義映射
+
+    任何目錄中的映射檔都套用到該目錄的整個子樹，距離檔案最近的映射檔優先；
+    每個目錄的映射層組合只計算一次，相同的組合共用同一個轉換器。
+    組合的轉換字典由基底轉換器的編譯字典複製後套用映射層，不重新編譯整個字庫
+    """
+
+    def __init__(self, base_converter,
+                 converter_factory: Callable[..., object],
+                 filename: str = DEFAULT_LAYER_FILENAME,
+                 max_stacks: int = MAX_CACHED_STACKS):
+        """
+        初始化目錄映射
+
+        Args:
+            base_converter: 基底轉換器（內建映射與 --custom 載入的映射）
+            converter_factory: 以 (映射管理器, compiled=編譯字典) 建立轉換器的函數
+            filename: 各目錄中的映射檔名稱
+            max_stacks: 同時保留的映射組合數
+        """
+        self.logger = logging.getLogger('CodeBridge.DirectoryMappings')
+        self.base_converter = base_converter
+        self.base_manager = base_converter.mapping_manager
+        self.converter_factory = converter_factory
+        self.filename = filename
+        self.max_stacks = max(1, max_stacks)
+        # 目錄 -> 由根目錄到該目錄的映射層（不含空的映射檔）
+        self._stacks: Dict[Path, Tuple[LayerKey, ...]] = {}
+        # 映射層 -> 解析後的映射
+        self._layers: Dict[LayerKey, Dict[str, str]] = {}
+        # (基底映射版本, 映射層組合) -> 轉換器
+        self._converters: "OrderedDict[Tuple[int, Tuple[LayerKey, ...]], object]" = OrderedDict()
+        self._stats = {'layers': 0, 'compiled': 0, 'hits': 0, 'evictions': 0}
+        # 已捨棄的轉換器的引擎使用次數
+        self._retired_engine_stats: Counter = Counter()
+
+    def refresh(self):
+        """
+        重新掃描映射檔
+
+        已刪除或已變更的映射檔（含所在目錄已不存在者）連同使用它們的轉換器一併捨棄，
+        基底映射版本已過時的轉換器也一併捨棄；其餘組合沿用原本的轉換器
+        """
+        self._stacks.clear()
+        stale = {layer for layer in self._layers if self._layer_key(Path(layer[0])) != layer}
+        for layer in stale:
+            del self._layers[layer]
+
+        version = self.base_manager.get_version()
+        for key in [key for key in self._converters
+                    if key[0] != version or not stale.isdisjoint(key[1])]:
+            self._retire(self._converters.pop(key))
+
+    @staticmethod
+    def _layer_key(layer_file: Path) -> Optional[LayerKey]:
+        """映射檔目前的識別，不存在或不是一般檔案時返回None"""
+        try:
+            info = layer_file.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(info.st_mode):
+            return None
+        return str(layer_file), info.st_mtime_ns, info.st_size
+
+    def _layer_at(self, directory: Path) -> Optional[LayerKey]:
+        """讀取目錄中的映射檔，不存在或沒有任何映射時返回None"""
+        layer_file = directory / self.filename
+        key = self._layer_key(layer_file)
+        if key is None:
+            return None
+
+        if key not in self._layers:
+            manager = MappingManager()
+            try:
+                manager.bulk_load_custom_mappings(str(layer_file), validate=False)
+            except (OSError, ValueError) as e:
+                # 無法讀取的映射檔略過，不影響同一子樹內的其他檔案
+                self.logger.warning(f"略過無法讀取的映射檔 {layer_file}: {e}")
+            self._layers[key] = manager.get_custom_mappings()
+            self._stats['layers'] += 1
+        return key if self._layers[key] else None
+
+    def layer_stack(self, directory: Path, root: Path) -> Tuple[LayerKey, ...]:
+        """
+        獲取目錄適用的映射層
+
+        Args:
+            directory: 目錄路徑
+            root: 專案根目錄（不讀取根目錄以外的映射檔）
+
+        Returns:
+            Tuple[LayerKey, ...]: 由根目錄往下排列的映射層，越後面越優先
+        """
+        # 往上找到第一個已計算過的目錄，再由上往下逐層計算
+        pending = []
+        current = directory
+        while current not in self._stacks:
+            pending.append(current)
+            if current == root or current.parent == current:
+                break
+            current = current.parent
+
+        stack = self._stacks.get(current, ())
+        for path in reversed(pending):
+            layer = self._layer_at(path)
+            if layer is not None:
+                stack = stack + (layer,)
+            self._stacks[path] = stack
+        return self._stacks[directory]
+
+    def converter_for(self, directory: Path, root: Path):
+        """
+        獲取目錄適用的轉換器
+
+        Args:
+            directory: 檔案所在的目錄
+            root: 專案根目錄
+
+        Returns:
+            目錄沒有任何映射層時返回None（使用基底轉換器），否則返回該映射組合的轉換器
+        """
+        stack = self.layer_stack(directory, root)
+        if not stack:
+            return None
+
+        key = (self.base_manager.get_version(), stack)
+        converter = self._converters.get(key)
+        if converter is not None:
+            self._converters.move_to_end(key)
+            self._stats['hits'] += 1
+            return converter
+
+        layered = {}
+        for layer in stack:
+            layered.update(self._layers[layer])
+        manager = MappingManager()
+        mappings = self.base_manager.get_custom_mappings()
+        mappings.update(layered)
+        manager.update_custom_mappings(mappings)
+
+        # 映射層只覆寫少數詞彙：複製基底的編譯字典再逐一套用，比重新編譯整個字庫快得多
+        compiled = self.base_converter.get_compiled_dictionary().copy()
+        compiled.apply_changes(list(layered.items()))
+        converter = self.converter_factory(manager, compiled=compiled)
+        self._converters[key] = converter
+        self._stats['compiled'] += 1
+        self.logger.debug(f"建立映射組合: {' > '.join(layer[0] for layer in stack)}")
+        if len(self._converters) > self.max_stacks:
+            _, evicted = self._converters.popitem(last=False)
+            self._retire(evicted)
+            self._stats['evictions'] += 1
+        return converter
+
+    def _retire(self, converter):
+        """保留轉換器的引擎使用次數並關閉其程序池"""
+        self._retired_engine_stats.update(converter.get_engine_stats())
+        close = getattr(converter, 'close', None)
+        if close is not None:
+            close()
+
+    def clear(self):
+        """捨棄所有已計算的映射層與轉換器"""
+        for converter in self._converters.values():
+            self._retire(converter)
+        self._converters.clear()
+        self._stacks.clear()
+        self._layers.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        獲取統計
+
+        Returns:
+            Dict[str, int]: 讀取的映射檔數、建立的映射組合數、重複使用次數與淘汰次數
+        """
+        return dict(self._stats)
+
+    def get_engine_stats(self) -> Dict[str, int]:
+        """
+        獲取所有映射組合轉換器的引擎使用次數（含已淘汰者）
+
+        Returns:
+            Dict[str, int]: {引擎名稱: 呼叫次數}
+        """
+        stats = Counter(self._retired_engine_stats)
+        for converter in self._converters.values():
+            stats.update(converter.get_engine_stats())
+        return dict(stats)
@@ -0,0 +1,554 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 雙陣列字典樹
+"""
+
+from array import array
+from collections import Counter
+from itertools import accumulate, chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# check 陣列的特殊值：未使用的位置與根節點
+FREE = -1
+ROOT_CHECK = -2
+# value_ids 陣列的特殊值：不是詞尾
+NO_VALUE = -1
+# 第一個可用位置優先時，每個節點在前段最多嘗試的位置數（建構時追求緊密，增量加入時追求速度）
+BUILD_FIT_ATTEMPTS = 4096
+INSERT_FIT_ATTEMPTS = 64
+
+
+def _filled(value: int, count: int) -> array:
+    """建立以同一值填滿的 int 陣列"""
+    return array('i', [value]) * count
+
+
+class DoubleArrayTrie:
+    """
+    雙陣列字典樹
+
+    狀態轉移只存在兩個 array('i') 中：子節點位置為 base[父節點] + 字元代碼，
+    且 check[子節點] 必須等於父節點。詞彙本身不另外保存，需要時沿 check 往回組出；
+    繁體詞串接成單一字串，以位移陣列切出。整個結構可直接以原始位元組序列化，
+    與每個節點一個 dict 的字典樹相比，記憶體用量只有一小部分；
+    代價是建構時間約為其數倍（見 benchmarks/bench_double_array.py），
+    大型字典可搭配編譯字典快取避免重複建構
+    """
+
+    def __init__(self, mappings: Optional[Dict[str, str]] = None):
+        """
+        建構字典樹
+
+        Args:
+            mappings: 映射表 {簡體: 繁體}，空字串鍵會被略過
+        """
+        items = [(key, value) for key, value in (mappings or {}).items() if key]
+
+        # 依出現頻率分配字元代碼，常用字代碼小，陣列較緊密
+        frequency = Counter(chain.from_iterable(key for key, _ in items))
+        self.alphabet: List[str] = [''] + [char for char, _ in frequency.most_common()]
+        self.codes: Dict[str, int] = {char: code for code, char in enumerate(self.alphabet) if code}
+
+        codes = self.codes
+        encoded = sorted(
+            (tuple(map(codes.__getitem__, key)), value) for key, value in items
+        )
+
+        self._values_text = ''.join(value for _, value in encoded)
+        self._value_offsets = array('i', [0])
+        self._value_offsets.extend(accumulate(len(value) for _, value in encoded))
+        # 增量加入的繁體詞（代碼接在串接字串之後）
+        self._extra_values: List[str] = []
+        # 已被取代或移除、仍佔用位置的繁體詞數
+        self._garbage = 0
+
+        self._count = len(encoded)
+        self.max_key_length = max((len(key) for key, _ in encoded), default=0)
+        self._build([key for key, _ in encoded])
+
+    def _build(self, keys: List[Tuple[int, ...]]):
+        """由已排序的字元代碼序列建構雙陣列（第一個可用位置優先）"""
+        capacity = max(1024, 2 * sum(map(len, keys)) + len(self.alphabet) + 1)
+        self.base = _filled(0, capacity)
+        self.check = _filled(FREE, capacity)
+        self.value_ids = _filled(NO_VALUE, capacity)
+        self._occupied = bytearray(capacity)
+        self._next_free = 1
+        self._max_base = 0
+        # 已使用區域的結尾，之後的位置都未使用
+        self._tail = 1
+
+        base = self.base
+        check = self.check
+        value_ids = self.value_ids
+        occupied = self._occupied
+        check[0] = ROOT_CHECK
+        occupied[0] = 1
+
+        # (節點位置, 深度, 起始索引, 結束索引)：keys[lo:hi] 在此深度前有相同字首
+        stack = [(0, 0, 0, len(keys))]
+        while stack:
+            slot, depth, lo, hi = stack.pop()
+            if lo < hi and len(keys[lo]) == depth:
+                # 排序後最短的詞彙在最前面，即以此節點結尾的詞彙
+                value_ids[slot] = lo
+                lo += 1
+            if lo == hi:
+                continue
+
+            children = []
+            index = lo
+            while index < hi:
+                code = keys[index][depth]
+                end = index + 1
+                while end < hi and keys[end][depth] == code:
+                    end += 1
+                children.append((code, index, end))
+                index = end
+
+            offset = self._find_offset([code for code, _, _ in children], BUILD_FIT_ATTEMPTS)
+            base[slot] = offset
+            for code, child_lo, child_hi in children:
+                child = offset + code
+                occupied[child] = 1
+                check[child] = slot
+                stack.append((child, depth + 1, child_lo, child_hi))
+
+        # 截掉尾端未使用的位置，但保留 max_base + 字母表大小，讓轉移永遠不越界
+        size = max(len(occupied.rstrip(b'\x00')), self._max_base + len(self.alphabet) + 1)
+        del base[size:], check[size:], value_ids[size:], occupied[size:]
+        # 佔用標記只在增量加入時需要，之後再由 check 重建
+        self._occupied = None
+
+    def _find_offset(self, codes: List[int], max_attempts: int = INSERT_FIT_ATTEMPTS) -> int:
+        """
+        找出能容納所有字元代碼的 base（第一個可用位置優先）
+
+        Args:
+            codes: 由小到大排序的字元代碼
+            max_attempts: 在前段最多嘗試的位置數，之後改從已使用區域結尾附近找
+
+        Returns:
+            int: base 值（至少為1，子節點不會落在根節點）
+        """
+        occupied = self._occupied
+        first = codes[0]
+        rest = [code - first for code in codes[1:]]
+        span = rest[-1] if rest else 0
+
+        position = max(self._next_free, first + 1)
+        start = position
+        skipped = 0
+        attempts = 0
+        while True:
+            found = occupied.find(0, position)
+            if found < 0:
+                found = len(occupied)
+            skipped += found - position
+            position = found
+            if position + span >= len(occupied):
+                self._grow(position + span + 1)
+            if not any(map(occupied.__getitem__, map(position.__add__, rest))):
+                break
+            attempts += 1
+            if attempts == max_attempts:
+                # 前段幾乎全滿：改從已使用區域結尾附近的稀疏區域繼續找
+                position = max(position + 1, self._tail - 2 * len(self.alphabet))
+                continue
+            position += 1
+            skipped += 1
+
+        # 搜尋範圍幾乎全滿時，之後直接從這裡開始找，避免重複掃描
+        if skipped > 64 and skipped >= 0.95 * (position - start):
+            self._next_free = position
+        elif self._next_free < len(occupied) and occupied[self._next_free]:
+            found = occupied.find(0, self._next_free)
+            self._next_free = found if found >= 0 else len(occupied)
+
+        self._tail = max(self._tail, position + span + 1)
+        offset = position - first
+        if offset > self._max_base:
+            self._max_base = offset
+            self._grow(offset + len(self.alphabet) + 1)
+        return offset
+
+    def _grow(self, size: int):
+        """確保陣列至少有 size 個位置（不足時一次多配置四分之一）"""
+        grow = size - len(self.check)
+        if grow > 0:
+            grow = max(grow, len(self.check) // 4)
+            self.base.extend(_filled(0, grow))
+            self.check.extend(_filled(FREE, grow))
+            self.value_ids.extend(_filled(NO_VALUE, grow))
+            self._occupied.extend(bytes(grow))
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        """陣列長度（位置數）"""
+        return len(self.check)
+
+    def to_state(self) -> Tuple:
+        """匯出可用 marshal 序列化的狀態（陣列以原始位元組保存）"""
+        if self._garbage or self._extra_values:
+            self._compact_values()
+        return (
+            ''.join(self.alphabet[1:]),
+            self.base.tobytes(), self.check.tobytes(), self.value_ids.tobytes(),
+            self._values_text, self._value_offsets.tobytes(),
+            self._count, self.max_key_length, self._max_base
+        )
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> 'DoubleArrayTrie':
+        """由 to_state() 的結果直接還原，不重新建構"""
+        trie = cls.__new__(cls)
+        (alphabet, base, check, value_ids, trie._values_text, offsets,
+         trie._count, trie.max_key_length, trie._max_base) = state
+        trie.alphabet = [''] + list(alphabet)
+        trie.codes = {char: code for code, char in enumerate(trie.alphabet) if code}
+        trie.base = array('i', base)
+        trie.check = array('i', check)
+        trie.value_ids = array('i', value_ids)
+        trie._value_offsets = array('i', offsets)
+        trie._extra_values = []
+        trie._garbage = 0
+        trie._occupied = None
+        trie._next_free = 1
+        trie._tail = 1
+        return trie
+
+    def _compact_values(self):
+        """重新串接所有仍在使用的繁體詞，釋放被取代的內容"""
+        value_ids = self.value_ids
+        values = []
+        for slot, value_id in enumerate(value_ids):
+            if value_id != NO_VALUE:
+                value_ids[slot] = len(values)
+                values.append(self._value(value_id))
+        self._values_text = ''.join(values)
+        self._value_offsets = array('i', [0])
+        self._value_offsets.extend(accumulate(map(len, values)))
+        self._extra_values = []
+        self._garbage = 0
+
+    def _value(self, value_id: int) -> str:
+        """由代碼取出繁體詞"""
+        offsets = self._value_offsets
+        if value_id < len(offsets) - 1:
+            return self._values_text[offsets[value_id]:offsets[value_id + 1]]
+        return self._extra_values[value_id - len(offsets) + 1]
+
+    def _walk(self, key: str) -> int:
+        """沿詞彙走到對應節點，不存在時返回-1"""
+        codes = self.codes
+        base = self.base
+        check = self.check
+        state = 0
+        for char in key:
+            code = codes.get(char)
+            if code is None:
+                return -1
+            child = base[state] + code
+            if check[child] != state:
+                return -1
+            state = child
+        return state
+
+    def get(self, key: str) -> Optional[str]:
+        """查詢詞彙對應的繁體詞"""
+        # 與 _walk() 相同，但直接內嵌以省去一次函式呼叫
+        codes_get = self.codes.get
+        base = self.base
+        check = self.check
+        state = 0
+        for char in key:
+            code = codes_get(char)
+            if code is None:
+                return None
+            child = base[state] + code
+            if check[child] != state:
+                return None
+            state = child
+        value_id = self.value_ids[state]
+        if value_id == NO_VALUE or not state:
+            return None
+        return self._value(value_id)
+
+    def __contains__(self, key: str) -> bool:
+        state = self._walk(key) if key else -1
+        return state >= 0 and self.value_ids[state] != NO_VALUE
+
+    def longest_at(self, text: str, position: int) -> Optional[Tuple[int, str, str]]:
+        """
+        找出從指定位置開始的最長詞彙
+
+        Args:
+            text: 要比對的文本
+            position: 開始位置
+
+        Returns:
+            Optional[Tuple[int, str, str]]: (結束位置, 簡體詞, 繁體詞)，沒有比對時返回None
+        """
+        codes_get = self.codes.get
+        base = self.base
+        check = self.check
+        value_ids = self.value_ids
+        state = 0
+        end = position
+        best_end = -1
+        best_id = NO_VALUE
+
+        # 逐字走訪切片比逐一以索引取字快；NO_VALUE 為負數，
+        # 與常數比較省去每個字元一次全域變數查詢
+        for char in text[position:position + self.max_key_length]:
+            code = codes_get(char)
+            if code is None:
+                break
+            child = base[state] + code
+            if check[child] != state:
+                break
+            state = child
+            end += 1
+            value_id = value_ids[child]
+            if value_id >= 0:
+                best_end = end
+                best_id = value_id
+
+        if best_end < 0:
+            return None
+        return best_end, text[position:best_end], self._value(best_id)
+
+    def prefixes_at(self, text: str, position: int) -> List[Tuple[int, str]]:
+        """
+        找出從指定位置開始的所有詞彙
+
+        Args:
+            text: 要比對的文本
+            position: 開始位置
+
+        Returns:
+            List[Tuple[int, str]]: [(結束位置, 簡體詞), ...]，由短到長
+        """
+        codes_get = self.codes.get
+        base = self.base
+        check = self.check
+        value_ids = self.value_ids
+        state = 0
+        end = position
+        found = []
+
+        for char in text[position:position + self.max_key_length]:
+            code = codes_get(char)
+            if code is None:
+                break
+            child = base[state] + code
+            if check[child] != state:
+                break
+            state = child
+            end += 1
+            if value_ids[child] >= 0:
+                found.append((end, text[position:end]))
+        return found
+
+    def children(self, state: int) -> List[Tuple[int, int]]:
+        """列出節點的所有 (字元代碼, 子節點)"""
+        offset = self.base[state]
+        if not offset:
+            # base 為 0 的節點從未配置過子節點
+            return []
+
+        # 在 C 層級搜尋 check 中等於 state 的位置（只接受對齊的結果）
+        window = self.check[offset + 1:offset + len(self.alphabet)].tobytes()
+        needle = array('i', [state]).tobytes()
+        itemsize = len(needle)
+        result = []
+        index = window.find(needle)
+        while index >= 0:
+            if index % itemsize:
+                index = window.find(needle, index + 1)
+                continue
+            code = index // itemsize + 1
+            result.append((code, offset + code))
+            index = window.find(needle, index + itemsize)
+        return result
+
+    @property
+    def start_chars(self) -> List[str]:
+        """可能作為詞首的字元"""
+        return [self.alphabet[code] for code, _ in self.children(0)]
+
+    def key_at(self, state: int) -> str:
+        """沿 check 往回組出節點代表的詞彙"""
+        base = self.base
+        check = self.check
+        alphabet = self.alphabet
+        chars = []
+        while state:
+            parent = check[state]
+            chars.append(alphabet[state - base[parent]])
+            state = parent
+        return ''.join(reversed(chars))
+
+    def uses_char(self, char: str) -> bool:
+        """
+        字元是否可能出現在詞彙或繁體詞中（不需逐一走訪節點）
+
+        Args:
+            char: 單一字元
+
+        Returns:
+            bool: 字母表或繁體詞（包含已被取代、尚未回收的內容）含有此字元時返回 True
+        """
+        if char in self.codes or char in self._values_text:
+            return True
+        return any(char in value for value in self._extra_values)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """列出所有 (詞彙, 繁體詞)"""
+        for state, value_id in enumerate(self.value_ids):
+            if value_id != NO_VALUE:
+                yield self.key_at(state), self._value(value_id)
+
+    def _ensure_occupied(self):
+        """由 check 重建佔用標記（第一次增量加入時）"""
+        if self._occupied is None:
+            self._occupied = bytearray(value != FREE for value in self.check)
+            found = self._occupied.find(0, 1)
+            self._next_free = found if found > 0 else len(self._occupied)
+            self._tail = len(self._occupied.rstrip(b'\x00'))
+
+    def _code_for(self, char: str) -> int:
+        """取得字元代碼，新字元加入字母表尾端"""
+        code = self.codes.get(char)
+        if code is None:
+            code = len(self.alphabet)
+            self.alphabet.append(char)
+            self.codes[char] = code
+            self._grow(self._max_base + len(self.alphabet) + 1)
+        return code
+
+    def _relocate(self, state: int, codes: List[int]):
+        """
+        把節點的子節點搬到新的 base，騰出空間給新的字元代碼
+
+        Args:
+            state: 要搬移子節點的節點
+            codes: 搬移後要容納的所有字元代碼（含新的代碼）
+        """
+        base = self.base
+        check = self.check
+        value_ids = self.value_ids
+        occupied = self._occupied
+        old_offset = base[state]
+        moved = [code for code in codes if check[old_offset + code] == state]
+
+        offset = self._find_offset(sorted(codes))
+        base[state] = offset
+
+        for code in moved:
+            old = old_offset + code
+            new = offset + code
+            for _, grandchild in self.children(old):
+                check[grandchild] = new
+            base[new] = base[old]
+            value_ids[new] = value_ids[old]
+            check[new] = state
+            occupied[new] = 1
+
+            base[old] = 0
+            value_ids[old] = NO_VALUE
+            check[old] = FREE
+            occupied[old] = 0
+            if old < self._next_free:
+                self._next_free = old
+
+    def insert(self, key: str, value: str) -> bool:
+        """
+        加入或更新詞彙
+
+        Args:
+            key: 簡體詞
+            value: 繁體詞
+
+        Returns:
+            bool: 是否為新的詞彙
+        """
+        if not key:
+            return False
+
+        state = self._walk(key)
+        if state < 0:
+            state = self._insert_path(key)
+
+        value_ids = self.value_ids
+        is_new = value_ids[state] == NO_VALUE
+        if is_new:
+            self._count += 1
+            self.max_key_length = max(self.max_key_length, len(key))
+        else:
+            self._garbage += 1
+        value_ids[state] = len(self._value_offsets) - 1 + len(self._extra_values)
+        self._extra_values.append(value)
+        return is_new
+
+    def _insert_path(self, key: str) -> int:
+        """建立詞彙缺少的節點，返回詞尾節點"""
+        self._ensure_occupied()
+        base = self.base
+        check = self.check
+        state = 0
+        for char in key:
+            code = self._code_for(char)
+            child = base[state] + code
+            if check[child] == state:
+                state = child
+                continue
+
+            if not base[state]:
+                # 從未有子節點的節點，直接找一個位置
+                self._relocate(state, [code])
+            elif self._occupied[child]:
+                # 位置被其他節點的子節點佔用：搬移子節點較少的一方
+                owner = check[child]
+                existing = [c for c, _ in self.children(state)]
+                owner_codes = [c for c, _ in self.children(owner)]
+                if len(owner_codes) <= len(existing):
+                    moved_state = check[state] == owner
+                    state_code = state - base[owner]
+                    self._relocate(owner, owner_codes)
+                    if moved_state:
+                        state = base[owner] + state_code
+                else:
+                    self._relocate(state, existing + [code])
+            child = base[state] + code
+
+            check[child] = state
+            base[child] = 0
+            self.value_ids[child] = NO_VALUE
+            self._occupied[child] = 1
+            self._tail = max(self._tail, child + 1)
+            state = child
+        return state
+
+    def remove(self, key: str) -> bool:
+        """
+        移除詞彙（保留節點，只取消詞尾標記）
+
+        Args:
+            key: 簡體詞
+
+        Returns:
+            bool: 詞彙是否存在
+        """
+        state = self._walk(key) if key else -1
+        if state < 0 or self.value_ids[state] == NO_VALUE:
+            return False
+        self.value_ids[state] = NO_VALUE
+        self._count -= 1
+        self._garbage += 1
+        return True
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 轉換引擎註冊表
+"""
+
+from typing import Callable, Container, Dict, List, Mapping, Optional, Tuple
+
+try:
+    from .byte_engine import Utf8ByteEngine
+    from .cjk import contains_cjk
+    from .matcher import PhraseMatcher, RegexMatcher
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from byte_engine import Utf8ByteEngine
+    from cjk import contains_cjk
+    from matcher import PhraseMatcher, RegexMatcher
+
+
+# 轉換函數：text -> (轉換後的文本, 轉換次數)
+ConvertFunc = Callable[[str], Tuple[str, int]]
+# 引擎工廠：(CompiledDictionary, MappingSnapshot) -> 轉換函數
+EngineFactory = Callable[..., ConvertFunc]
+
+# 自動選擇時使用的預設引擎（唯一支援最佳切分與片段快取的引擎）
+DEFAULT_ENGINE = 'translate'
+
+# 短於此長度的文本直接以 str 正則表達式轉換，省去 UTF-8 編碼與解碼
+AUTO_SHORT_LENGTH = 32
+
+# 正則表達式類引擎（regex、bytes）需編譯整個字典，每個映射約數微秒到十餘微秒，
+# 每字元只比 translate 快不到一微秒；目前版本的字典已轉換的字元數達到映射數的此倍數時
+# 才值得編譯，映射變更後重新累計
+AUTO_REBUILD_RATIO = 64
+
+# 映射數超過此值時 auto 不編譯正則表達式類引擎（大型字典編譯需數秒）
+AUTO_REGEX_MAX_ENTRIES = 50000
+
+# 表意文字比例低於此值時以 str 正則表達式轉換：稀疏文本的 UTF-8 編碼與解碼成本
+# 高於位元組比對省下的時間（見 benchmarks/bench_engines.py）
+AUTO_SPARSE_DENSITY = 0.01
+
+# 估計密度時最多取樣的字元數
+AUTO_DENSITY_SAMPLE = 4096
+
+
+class LegacyReplaceEngine:
+    """
+    舊版的逐詞替換引擎
+
+    依詞彙長度由長到短對整個文本呼叫 str.replace，保留原本的轉換結果以便逐位元組比對
+    """
+
+    def __init__(self, mappings: Mapping[str, str]):
+        """
+        初始化引擎
+
+        Args:
+            mappings: 合併後的映射表 {簡體: 繁體}（順序與 get_all_mappings() 相同）
+        """
+        self._sorted_mappings = sorted(
+            mappings.items(),
+            key=lambda x: len(x[0]),
+            reverse=True
+        )
+
+    def convert(self, text: str) -> Tuple[str, int]:
+        """
+        轉換文本
+
+        Args:
+            text: 要轉換的文本
+
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換次數)
+        """
+        converted = text
+        total_count = 0
+
+        for simplified, traditional in self._sorted_mappings:
+            if simplified in converted and simplified != traditional:
+                count = converted.count(simplified)
+                if count > 0:
+                    converted = converted.replace(simplified, traditional)
+                    total_count += count
+
+        return converted, total_count
+
+
+def _bytes_engine(compiled, snapshot) -> ConvertFunc:
+    """以 UTF-8 位元組引擎轉換 str（編碼後轉換再解碼）"""
+    engine = Utf8ByteEngine.from_compiled(compiled)
+
+    def convert(text: str) -> Tuple[str, int]:
+        try:
+            data = text.encode('utf-8')
+        except UnicodeEncodeError:
+            # 含單獨代理字元（例如以 surrogateescape 解碼的內容）時無法編碼
+            return compiled.convert(text)
+        converted, count = engine.convert(data)
+        if not count:
+            return text, 0
+        return converted.decode('utf-8'), count
+
+    return convert
+
+
+_ENGINES: Dict[str, EngineFactory] = {
+    'translate': lambda compiled, snapshot: compiled.convert,
+    'automaton': lambda compiled, snapshot: PhraseMatcher(dict(compiled.items())).convert,
+    'regex': lambda compiled, snapshot: RegexMatcher(compiled.items()).convert,
+    'bytes': _bytes_engine,
+    'legacy': lambda compiled, snapshot: LegacyReplaceEngine(snapshot.merged_view()).convert,
+}
+
+
+def register_engine(name: str, factory: EngineFactory):
+    """
+    註冊轉換引擎
+
+    Args:
+        name: 引擎名稱（不可為 auto）
+        factory: 以 (CompiledDictionary, MappingSnapshot) 建立轉換函數的工廠，
+                 映射變更後會重新呼叫
+    """
+    if name == 'auto':
+        raise ValueError("auto 為保留的引擎名稱")
+    _ENGINES[name] = factory
+
+
+def available_engines() -> List[str]:
+    """列出已註冊的引擎名稱（不含 auto）"""
+    return sorted(_ENGINES)
+
+
+def create_engine(name: str, compiled, snapshot) -> ConvertFunc:
+    """
+    建立轉換函數
+
+    Args:
+        name: 引擎名稱
+        compiled: 編譯後的轉換字典
+        snapshot: 與 compiled 相同版本的映射快照
+
+    Returns:
+        ConvertFunc: 轉換函數
+    """
+    factory = _ENGINES.get(name)
+    if factory is None:
+        raise ValueError(f"未知的轉換引擎: {name}")
+    return factory(compiled, snapshot)
+
+
+def estimate_cjk_density(text: str) -> float:
+    """
+    估計文本中表意文字的比例
+
+    長文本以固定間隔取樣，以 UTF-8 編碼多出的位元組數換算（每個表意文字多兩個位元組），
+    只需一次 C 層級的編碼，不逐字比對
+
+    Args:
+        text: 要估計的文本（不可為空）
+
+    Returns:
+        float: 0 到 1 之間的估計值（其他非 ASCII 字元也會計入）
+    """
+    step = len(text) // AUTO_DENSITY_SAMPLE + 1
+    sample = text[::step] if step > 1 else text
+    extra = len(sample.encode('utf-8', 'surrogatepass')) - len(sample)
+    return min(1.0, extra / (2 * len(sample)))
+
+
+def worth_compiling(compiled, converted_chars: int) -> bool:
+    """
+    是否值得為目前的字典編譯正則表達式類引擎
+
+    Args:
+        compiled: 目前的編譯字典
+        converted_chars: 此版本字典已轉換的字元數
+
+    Returns:
+        bool: 字典不大且已轉換的內容足以攤還編譯成本時返回 True
+    """
+    entries = len(compiled.char_table) + len(compiled.phrase_matcher)
+    return entries <= AUTO_REGEX_MAX_ENTRIES and converted_chars >= AUTO_REBUILD_RATIO * entries
+
+
+def select_engine(text: str, compiled, has_cjk: Optional[bool] = None,
+                  converted_chars: int = 0, built: Container[str] = ()) -> str:
+    """
+    依文本長度、表意文字密度、字典內容與大小及映射變更頻率自動選擇引擎
+
+    Args:
+        text: 要轉換的文本
+        compiled: 目前的編譯字典
+        has_cjk: 呼叫端已檢查過的「文本含表意文字」結果，None 時在此檢查
+        converted_chars: 此版本字典已轉換的字元數（見 worth_compiling）
+        built: 此版本字典已建立的引擎名稱
+
+    Returns:
+        str: 引擎名稱
+    """
+    if has_cjk is None:
+        has_cjk = contains_cjk(text)
+    # 沒有任何表意文字時，中文片段模式只需一次搜尋即可返回
+    if not has_cjk:
+        return DEFAULT_ENGINE
+    if len(text) < AUTO_SHORT_LENGTH:
+        candidate = 'regex'
+    elif not len(compiled.phrase_matcher):
+        # 只有單字時，大型文本交給 NumPy 查找表，其餘以正則表達式一次切分
+        if compiled.vectorized_for(len(text)):
+            return DEFAULT_ENGINE
+        candidate = 'regex'
+    elif estimate_cjk_density(text) < AUTO_SPARSE_DENSITY:
+        # 中文稀疏時兩者比對時間相近，str 正則表達式省下編碼與解碼
+        candidate = 'regex'
+    else:
+        # 中文較密集時位元組層級的字首樹比對最快
+        candidate = 'bytes'
+    # translate 直接使用增量更新的字典，不需編譯；映射剛變更或字典很大時沿用
+    if candidate in built or worth_compiling(compiled, converted_chars):
+        return candidate
+    return DEFAULT_ENGINE
@@ -4,12 +4,21 @@
 CodeBridge - 檔案處理器
 """
 
+import codecs
+import mmap
 import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 import logging
 
+try:
+    from .byte_engine import is_utf8
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from byte_engine import is_utf8
+
 
 @dataclass
 class FileProcessResult:
@@ -17,6 +26,7 @@ class FileProcessResult:
     file_path: str
     processed: bool = False
     conversions: int = 0
+    early_exit: bool = False
     error: Optional[str] = None
     preview_data: List[Tuple[str, str, int]] = None
     
@@ -65,15 +75,30 @@ class FileProcessor:
             # 檢查檔案大小
             file_size = file_path.stat().st_size
             if file_size > self.config.max_file_size:
+                if self.config.stream_large_files:
+                    # 大型檔案逐塊轉換，不需一次載入整個檔案
+                    return self._process_file_streaming(file_path, converter, preview_mode, result)
                 result.error = f"檔案過大 ({file_size} bytes > {self.config.max_file_size} bytes)"
                 return result
             
+            use_bytes = self.config.utf8_byte_engine or self.config.write_mode == 'inplace'
+            if not preview_mode and use_bytes and file_size > 0:
+                # UTF-8 檔案直接轉換位元組；不是 UTF-8 時返回None，改走文字路徑
+                byte_result = self._process_file_bytes(file_path, converter, result)
+                if byte_result is not None:
+                    return byte_result
+            
             # 讀取檔案內容
             content = self._read_file_content(file_path)
             if content is None:
                 result.error = "無法讀取檔案內容"
                 return result
             
+            # 不含任何中文的檔案在一次掃描後即可略過
+            if not converter.may_convert(content):
+                result.early_exit = True
+                return result
+            
             if preview_mode:
                 # 預覽模式：只分析不修改
                 preview_conversions = converter.preview_conversion(content)
@@ -104,6 +129,168 @@ class FileProcessor:
         
         return result
     
+    def _process_file_bytes(self, file_path: Path, converter,
+                            result: FileProcessResult) -> Optional[FileProcessResult]:
+        """
+        透過 mmap 直接轉換 UTF-8 檔案的位元組內容
+        
+        write_mode 為 inplace 且所有轉換都不改變位元組長度時原地修改，否則重寫整個檔案
+        
+        Args:
+            file_path: 檔案路徑
+            converter: 轉換器實例
+            result: 要填入的處理結果
+        
+        Returns:
+            Optional[FileProcessResult]: 處理結果，檔案不是 UTF-8 時返回None
+        """
+        inplace = self.config.write_mode == 'inplace'
+        
+        # 先以唯讀方式映射，確定有需要原地替換的內容時才重新以可寫入方式開啟
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if not converter.may_convert_bytes(mapped):
+                    result.early_exit = True
+                    return result
+                if not is_utf8(mapped):
+                    return None
+                
+                if inplace:
+                    found = converter.find_byte_patches(mapped)
+                    if found is not None:
+                        return self._patch_in_place(file_path, len(mapped), found, result)
+                    self.logger.debug(f"{file_path.name}: 無法原地修改（轉換會改變位元組長度或未使用位元組引擎），改為重寫檔案")
+                
+                converted_content, conversion_count = converter.convert_bytes(mapped)
+        
+        if conversion_count > 0:
+            if self._write_file_bytes(file_path, converted_content):
+                result.processed = True
+                result.conversions = conversion_count
+                self.logger.info(f"✅ {file_path.name}: 轉換了 {conversion_count} 個字符")
+            else:
+                result.error = "寫入檔案失敗"
+        return result
+    
+    def _patch_in_place(self, file_path: Path, size: int, found,
+                        result: FileProcessResult) -> FileProcessResult:
+        """
+        透過可寫入的 mmap 原地替換，只有被修改的分頁會寫回磁碟
+        
+        Args:
+            file_path: 檔案路徑
+            size: 找出替換位置時的檔案大小（位元組）
+            found: converter.find_byte_patches() 的結果
+            result: 要填入的處理結果
+        
+        Returns:
+            FileProcessResult: 處理結果
+        """
+        patches, conversion_count = found
+        if not conversion_count:
+            # 沒有任何轉換時不以寫入模式開啟，唯讀檔案也能略過
+            return result
+        
+        if self.config.create_backup:
+            self._create_backup(file_path)
+        
+        with open(file_path, 'r+b') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mapped:
+                if len(mapped) != size:
+                    result.error = "檔案在轉換期間被修改"
+                    return result
+                for offset, replacement in patches:
+                    mapped[offset:offset + len(replacement)] = replacement
+                mapped.flush()
+        
+        result.processed = True
+        result.conversions = conversion_count
+        self.logger.info(f"✅ {file_path.name}: 原地轉換了 {conversion_count} 個字符")
+        return result
+    
+    def _process_file_streaming(self, file_path: Path, converter, preview_mode: bool,
+                                result: FileProcessResult) -> FileProcessResult:
+        """
+        以串流方式處理大型檔案，轉換結果先寫入同目錄的暫存檔再替換原檔案
+        
+        Args:
+            file_path: 檔案路徑
+            converter: 轉換器實例
+            preview_mode: 預覽模式
+            result: 要填入的處理結果
+        
+        Returns:
+            FileProcessResult: 處理結果
+        """
+        encoding = self._detect_stream_encoding(file_path)
+        if encoding is None:
+            result.error = "無法判斷檔案編碼，略過串流轉換"
+            return result
+        
+        chunk_size = self.config.stream_chunk_size
+        
+        with open(file_path, 'r', encoding=encoding, newline='') as source:
+            chunks = iter(lambda: source.read(chunk_size), '')
+            
+            if preview_mode:
+                preview_conversions = converter.preview_stream(chunks)
+                result.preview_data = preview_conversions
+                result.conversions = sum(count for _, _, count in preview_conversions)
+                return result
+            
+            fd, temp_path = tempfile.mkstemp(dir=file_path.parent, suffix='.codebridge.tmp')
+            try:
+                conversion_count = 0
+                with open(fd, 'w', encoding='utf-8', newline='') as target:
+                    for converted, count in converter.iter_convert_stream(chunks):
+                        target.write(converted)
+                        conversion_count += count
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        
+        if conversion_count == 0:
+            os.unlink(temp_path)
+            return result
+        
+        try:
+            if self.config.create_backup:
+                self._create_backup(file_path)
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            os.unlink(temp_path)
+            result.error = f"寫入檔案失敗: {e}"
+            return result
+        
+        result.processed = True
+        result.conversions = conversion_count
+        self.logger.info(f"✅ {file_path.name}: 串流轉換了 {conversion_count} 個字符")
+        return result
+    
+    def _detect_stream_encoding(self, file_path: Path, sample_size: int = 64 * 1024) -> Optional[str]:
+        """
+        以檔案開頭的樣本判斷串流讀取使用的編碼
+        
+        Args:
+            file_path: 檔案路徑
+            sample_size: 樣本大小 (bytes)
+        
+        Returns:
+            Optional[str]: 編碼名稱，無法判斷時返回None
+        """
+        with open(file_path, 'rb') as f:
+            sample = f.read(sample_size)
+        
+        for encoding in ['utf-8', 'gb2312', 'gbk', 'big5']:
+            try:
+                # 增量解碼器允許樣本結尾切在多位元組字元中間
+                codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
+        return None
+    
     def _read_file_content(self, file_path: Path) -> Optional[str]:
         """
         讀取檔案內容，自動處理編碼
@@ -166,6 +353,31 @@ class FileProcessor:
             self.logger.error(f"寫入檔案 {file_path.name} 失敗: {e}")
             return False
     
+    def _write_file_bytes(self, file_path: Path, content: bytes) -> bool:
+        """
+        寫入已編碼的檔案內容
+        
+        Args:
+            file_path: 檔案路徑
+            content: 要寫入的內容
+        
+        Returns:
+            bool: 是否寫入成功
+        """
+        try:
+            if self.config.create_backup:
+                self._create_backup(file_path)
+            
+            with open(file_path, 'wb') as f:
+                f.write(content)
+            
+            self.logger.debug(f"成功寫入檔案 {file_path.name}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"寫入檔案 {file_path.name} 失敗: {e}")
+            return False
+    
     def _create_backup(self, file_path: Path) -> bool:
         """
         創建檔案備份
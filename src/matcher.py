@@ -0,0 +1,1396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 多模式比對引擎
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque
+from itertools import accumulate, repeat
+from operator import itemgetter, sub
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import re
+
+try:
+    from .char_lut import LUT_MIN_LENGTH, CodepointLUT
+    from .cjk import is_cjk_only
+    from .double_array import NO_VALUE, DoubleArrayTrie
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from char_lut import LUT_MIN_LENGTH, CodepointLUT
+    from cjk import is_cjk_only
+    from double_array import NO_VALUE, DoubleArrayTrie
+
+
+# 多字詞彙不超過此數量時，convert_joined() 以整個字典的正則表達式在 C 層級切出詞彙
+# （編譯只需數毫秒）；更大的字典編譯成本過高，改用字典樹逐一比對
+JOINED_REGEX_MAX_PHRASES = 4096
+
+def build_trie_pattern(keys):
+    """
+    將詞彙編譯為字首樹形式的正則表達式（str 或 bytes 皆可）
+
+    每個節點先嘗試較長的分支，詞尾節點的分支設為可選，
+    正則引擎由左到右比對時即得到最左最長的結果
+
+    Args:
+        keys: 非空的詞彙列表
+
+    Returns:
+        與詞彙同型別的正則表達式
+    """
+    empty = keys[0][:0]
+    group, alternation, close, optional_close = '(?:', '|', ')', ')?'
+    if isinstance(empty, bytes):
+        group, alternation, close, optional_close = b'(?:', b'|', b')', b')?'
+
+    trie: dict = {}
+    for key in keys:
+        node = trie
+        for index in range(len(key)):
+            node = node.setdefault(key[index:index + 1], {})
+        node[None] = True
+
+    def emit(node: dict):
+        branches = [
+            re.escape(unit) + emit(node[unit])
+            for unit in sorted(unit for unit in node if unit is not None)
+        ]
+        if not branches:
+            return empty
+        body = branches[0] if len(branches) == 1 else group + alternation.join(branches) + close
+        if None in node:
+            return group + body + optional_close
+        return body
+
+    return emit(trie)
+
+
+def find_redundant_phrases(phrases: Dict[str, str], char_table: Dict[int, str],
+                           identity_only: bool = True) -> Set[str]:
+    """
+    找出移除後最左最長轉換結果不變的多字詞彙
+
+    詞彙 P 可以移除的條件：
+    1. P 的繁體詞等於逐字轉換的結果；identity_only 時 P 還必須對應自己且不含可轉換的單字，
+       轉換次數與各映射的統計也因此不變
+    2. 沒有其他詞彙從 P 的第二個字以後開始並延伸超過 P 的結尾
+    3. P 內部出現的其他詞彙也都等於逐字轉換的結果
+
+    原本比對到 P 的位置改由 P 內部的詞彙與單字轉換，得到相同的文字並在同一位置結束，
+    之後的比對不受影響；每移除一個詞彙，下一個詞彙就以移除後的詞彙表檢查，
+    因此全部移除後結果仍然相同。最佳切分以段數計算成本，不適用此條件
+
+    Args:
+        phrases: 多字詞彙 {簡體: 繁體}
+        char_table: 單字轉換表 {碼位: 繁體字}
+        identity_only: 是否只移除對應自己的詞彙
+
+    Returns:
+        Set[str]: 可移除的簡體詞
+    """
+    def charwise(key: str) -> bool:
+        return phrases[key] == key.translate(char_table)
+
+    if identity_only:
+        candidates = [
+            key for key, value in phrases.items() if key == value and key.translate(char_table) == key
+        ]
+    else:
+        candidates = [key for key in phrases if charwise(key)]
+    if not candidates:
+        return set()
+
+    # 候選詞彙各個後綴被多少個（尚未移除的）較長詞彙當作開頭；依長度分批在 C 層級計數
+    suffixes = {key[start:] for key in candidates for start in range(1, len(key))}
+    keys = sorted(phrases, key=len, reverse=True)
+    lengths = [-len(key) for key in keys]
+    extensions: Counter = Counter()
+    for size in range(1, len(keys[0])):
+        longer = keys[:bisect_left(lengths, -size)]
+        extensions.update(filter(suffixes.__contains__, map(itemgetter(slice(size)), longer)))
+
+    remaining = set(phrases)
+    redundant = set()
+
+    # 由長到短檢查（同長度依字碼排序，結果不受輸入順序影響）；
+    # 延伸到某個詞彙後方的詞彙移除後，該詞彙才可能符合條件 2
+    for key in sorted(candidates, key=lambda key: (-len(key), key)):
+        length = len(key)
+        if any(
+            extensions[key[start:]] > key.startswith(key[start:])
+            for start in range(length - 1, 0, -1)
+        ):
+            continue
+        if any(
+            key[start:end] in remaining and not charwise(key[start:end])
+            for start in range(length - 1)
+            for end in range(start + 2, length + 1)
+            if end - start < length
+        ):
+            continue
+
+        remaining.discard(key)
+        redundant.add(key)
+        for end in range(1, length):
+            if key[:end] in suffixes:
+                extensions[key[:end]] -= 1
+
+    return redundant
+
+
+class RegexMatcher:
+    """
+    字首樹正則表達式比對器（str 或 bytes）
+
+    所有詞彙編譯為一個最左最長的正則表達式，以分組切開後
+    在 C 層級整批查表，不需逐一處理每個比對結果
+    """
+
+    def __init__(self, mappings: Iterable[Tuple[Any, Any]]):
+        """
+        初始化比對器
+
+        Args:
+            mappings: (簡體詞, 繁體詞) 序列；單字對應自己的項目會被略過
+        """
+        self._table: Dict[Any, Any] = {}
+        # 對應自己的詞彙仍需比對（避免被較短的映射拆開），但不計入轉換次數
+        self._identity = set()
+
+        for simplified, traditional in mappings:
+            if not simplified or (len(simplified) == 1 and simplified == traditional):
+                continue
+            self._table[simplified] = traditional
+            if simplified == traditional:
+                self._identity.add(simplified)
+            else:
+                self._identity.discard(simplified)
+
+        self.pattern: Optional[re.Pattern] = None
+        if self._table:
+            keys = list(self._table)
+            group = build_trie_pattern(keys)
+            if isinstance(group, bytes):
+                self.pattern = re.compile(b'(' + group + b')')
+            else:
+                self.pattern = re.compile('(' + group + ')')
+
+    def convert(self, text):
+        """
+        轉換文本
+
+        Args:
+            text: 要轉換的 str，或 bytes/mmap（與詞彙同型別）
+
+        Returns:
+            Tuple: (轉換後的內容, 轉換次數)
+        """
+        if self.pattern is None:
+            return text[:], 0
+
+        # 以分組切開後，奇數位置即為比對到的詞彙
+        parts = self.pattern.split(text)
+        matches = parts[1::2]
+        if not matches:
+            return parts[0], 0
+
+        count = len(matches)
+        if self._identity:
+            count -= sum(map(self._identity.__contains__, matches))
+        parts[1::2] = map(self._table.__getitem__, matches)
+        return parts[0][:0].join(parts), count
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick 多模式比對自動機
+
+    一次掃描即可找出所有映射詞彙，並以「最左最長」規則挑選不重疊的比對結果。
+    字典樹每個節點一個 dict，查詢最快；失敗連結只在第一次 finditer() 時建立。
+    記憶體有限的大型字典可改用 CompactPhraseMatcher
+    """
+
+    def __init__(self, mappings: Dict[str, str]):
+        """
+        編譯比對自動機
+
+        Args:
+            mappings: 映射表 {簡體: 繁體}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        # 以該狀態結尾的詞彙（不是詞尾時為None）
+        self._keys: List[Optional[str]] = [None]
+        self._values: Dict[str, str] = {}
+        self.max_key_length = 0
+        # 詞彙與繁體詞用到的字元，第一次 uses_char() 時建立
+        self._chars: Optional[Set[str]] = None
+
+        for simplified, traditional in mappings.items():
+            if simplified:
+                self._insert(simplified, traditional)
+        self._reset_failure_links()
+
+    def _reset_failure_links(self):
+        """捨棄失敗連結，下一次 finditer() 時重建"""
+        self._fail: Optional[List[int]] = None
+        # 以該狀態結尾的最長詞彙長度（沿失敗鏈計算）
+        self._output: Optional[List[int]] = None
+        self._depth: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def size(self) -> int:
+        """字典樹節點數"""
+        return len(self._goto)
+
+    def to_state(self) -> Tuple:
+        """匯出可用 marshal 序列化的內部狀態"""
+        return self._goto, self._keys, self._values, self.max_key_length
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> 'PhraseMatcher':
+        """由 to_state() 的結果直接還原，不重新建構字典樹"""
+        matcher = cls.__new__(cls)
+        matcher._goto, matcher._keys, matcher._values, matcher.max_key_length = state
+        matcher._chars = None
+        matcher._reset_failure_links()
+        return matcher
+
+    def copy(self) -> 'PhraseMatcher':
+        """複製比對自動機（之後的增量變更互不影響，失敗連結在副本第一次比對時重建）"""
+        return self.from_state((
+            [dict(node) for node in self._goto], list(self._keys), dict(self._values), self.max_key_length
+        ))
+
+    def add(self, key: str, value: str):
+        """
+        增量加入或更新詞彙
+
+        只修改字典樹；失敗連結延後到下一次 finditer() 時才重建
+
+        Args:
+            key: 簡體詞
+            value: 繁體詞
+        """
+        if not key:
+            return
+        is_new = key not in self._values
+        self._insert(key, value)
+        if self._chars is not None:
+            self._chars.update(key, value)
+        if is_new:
+            self._reset_failure_links()
+
+    def remove(self, key: str) -> bool:
+        """
+        增量移除詞彙（保留字典樹節點，只取消詞尾標記）
+
+        Args:
+            key: 簡體詞
+
+        Returns:
+            bool: 詞彙是否存在
+        """
+        if key not in self._values:
+            return False
+
+        state = 0
+        for char in key:
+            state = self._goto[state][char]
+        self._keys[state] = None
+        del self._values[key]
+        self._reset_failure_links()
+        return True
+
+    @property
+    def start_chars(self) -> List[str]:
+        """可能作為詞首的字元"""
+        return list(self._goto[0])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._values
+
+    def get(self, key: str) -> Optional[str]:
+        """查詢詞彙對應的繁體詞"""
+        return self._values.get(key)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """列出所有 (詞彙, 繁體詞)"""
+        return iter(self._values.items())
+
+    def uses_char(self, char: str) -> bool:
+        """
+        字元是否可能出現在詞彙或繁體詞中
+
+        Args:
+            char: 單一字元
+
+        Returns:
+            bool: 出現時返回 True（包含已移除的詞彙用過的字元）
+        """
+        if self._chars is None:
+            self._chars = set().union(*self._goto)
+            for value in self._values.values():
+                self._chars.update(value)
+        return char in self._chars
+
+    def _insert(self, key: str, value: str):
+        """將詞彙加入字典樹"""
+        goto = self._goto
+        state = 0
+        for char in key:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto.append({})
+                self._keys.append(None)
+                goto[state][char] = next_state
+            state = next_state
+
+        self._keys[state] = key
+        self._values[key] = value
+        self.max_key_length = max(self.max_key_length, len(key))
+
+    def _build_failure_links(self):
+        """以廣度優先順序建立失敗連結與輸出長度"""
+        goto = self._goto
+        keys = self._keys
+        fail = [0] * len(goto)
+        output = [0] * len(goto)
+        depth = [0] * len(goto)
+
+        queue = deque(goto[0].values())
+        for state in queue:
+            depth[state] = 1
+            output[state] = 1 if keys[state] is not None else 0
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target
+                depth[next_state] = depth[state] + 1
+
+                if keys[next_state] is not None:
+                    output[next_state] = depth[next_state]
+                else:
+                    output[next_state] = output[target]
+                queue.append(next_state)
+
+        self._fail = fail
+        self._output = output
+        self._depth = depth
+
+    def longest_at(self, text: str, position: int) -> Optional[Tuple[int, str, str]]:
+        """
+        沿字典樹找出從指定位置開始的最長詞彙
+
+        Args:
+            text: 要比對的文本
+            position: 開始位置
+
+        Returns:
+            Optional[Tuple[int, str, str]]: (結束位置, 簡體詞, 繁體詞)，沒有比對時返回None
+        """
+        goto = self._goto
+        keys = self._keys
+        state = 0
+        end = position
+        best_end = -1
+        best_key = None
+
+        # 逐字走訪切片比逐一以索引取字快
+        for char in text[position:position + self.max_key_length]:
+            state = goto[state].get(char)
+            if state is None:
+                break
+            end += 1
+            if keys[state] is not None:
+                best_end = end
+                best_key = keys[state]
+
+        if best_key is None:
+            return None
+        return best_end, best_key, self._values[best_key]
+
+    def prefixes_at(self, text: str, position: int) -> List[Tuple[int, str]]:
+        """
+        沿字典樹找出從指定位置開始的所有詞彙
+
+        Args:
+            text: 要比對的文本
+            position: 開始位置
+
+        Returns:
+            List[Tuple[int, str]]: [(結束位置, 簡體詞), ...]，由短到長
+        """
+        goto = self._goto
+        keys = self._keys
+        state = 0
+        end = position
+        found = []
+
+        for char in text[position:position + self.max_key_length]:
+            state = goto[state].get(char)
+            if state is None:
+                break
+            end += 1
+            if keys[state] is not None:
+                found.append((end, keys[state]))
+        return found
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        依序找出文本中不重疊的映射詞彙（最左最長）
+
+        Args:
+            text: 要掃描的文本
+
+        Yields:
+            Tuple[int, int, str, str]: (開始位置, 結束位置, 簡體詞, 繁體詞)
+        """
+        if self._fail is None:
+            self._build_failure_links()
+
+        goto = self._goto
+        fail = self._fail
+        depth = self._depth
+        output = self._output
+        length = len(text)
+
+        position = 0
+        state = 0
+        pending_start = -1
+        pending_end = -1
+
+        while True:
+            if position < length:
+                char = text[position]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                position += 1
+
+                match_length = output[state]
+                if match_length:
+                    start = position - match_length
+                    if pending_start < 0 or start < pending_start or (
+                        start == pending_start and position > pending_end
+                    ):
+                        pending_start, pending_end = start, position
+
+                # 之後的比對不可能再從 pending_start 或更早的位置開始
+                if pending_start < 0 or position - depth[state] <= pending_start:
+                    continue
+            elif pending_start < 0:
+                return
+
+            key = text[pending_start:pending_end]
+            yield pending_start, pending_end, key, self._values[key]
+
+            # 從已確定比對的結尾重新掃描，避免重疊
+            position = pending_end
+            state = 0
+            pending_start = pending_end = -1
+
+    def convert(self, text: str) -> Tuple[str, int]:
+        """
+        以單次掃描轉換文本
+
+        Args:
+            text: 要轉換的文本
+
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換次數)
+        """
+        segments = []
+        count = 0
+        last_end = 0
+
+        for start, end, simplified, traditional in self.finditer(text):
+            if simplified == traditional:
+                continue
+            segments.append(text[last_end:start])
+            segments.append(traditional)
+            last_end = end
+            count += 1
+
+        if not count:
+            return text, 0
+
+        segments.append(text[last_end:])
+        return ''.join(segments), count
+
+
+class CompactPhraseMatcher(DoubleArrayTrie):
+    """
+    以雙陣列字典樹保存的 Aho-Corasick 比對自動機
+
+    比對結果與 PhraseMatcher 相同；記憶體用量只有一小部分，但建構與查詢較慢
+    （見 benchmarks/bench_double_array.py），供記憶體有限的大型字典使用
+    """
+
+    def __init__(self, mappings: Dict[str, str]):
+        """
+        編譯比對自動機
+
+        Args:
+            mappings: 映射表 {簡體: 繁體}
+        """
+        super().__init__(mappings)
+        self._reset_failure_links()
+
+    def _reset_failure_links(self):
+        """捨棄失敗連結，下一次 finditer() 時重建"""
+        self._fail: Optional[array] = None
+        # 以該狀態結尾的最長詞彙長度（沿失敗鏈計算）
+        self._output: Optional[array] = None
+        self._depth: Optional[array] = None
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> 'CompactPhraseMatcher':
+        """由 to_state() 的結果直接還原，不重新建構字典樹"""
+        matcher = super().from_state(state)
+        matcher._reset_failure_links()
+        return matcher
+
+    def copy(self) -> 'CompactPhraseMatcher':
+        """複製比對自動機（狀態以位元組匯出，還原時建立新的陣列）"""
+        return self.from_state(self.to_state())
+
+    def add(self, key: str, value: str):
+        """
+        增量加入或更新詞彙
+
+        只修改字典樹；失敗連結延後到下一次 finditer() 時才重建
+
+        Args:
+            key: 簡體詞
+            value: 繁體詞
+        """
+        if self.insert(key, value):
+            self._reset_failure_links()
+
+    def remove(self, key: str) -> bool:
+        """
+        增量移除詞彙（保留字典樹節點，只取消詞尾標記）
+
+        Args:
+            key: 簡體詞
+
+        Returns:
+            bool: 詞彙是否存在
+        """
+        if not super().remove(key):
+            return False
+        self._reset_failure_links()
+        return True
+
+    def _build_failure_links(self):
+        """以廣度優先順序建立失敗連結與輸出長度"""
+        base = self.base
+        check = self.check
+        value_ids = self.value_ids
+        size = len(check)
+
+        children: Dict[int, List[int]] = {}
+        for state, parent in enumerate(check):
+            if parent >= 0:
+                children.setdefault(parent, []).append(state)
+
+        fail = array('i', bytes(4 * size))
+        output = array('i', bytes(4 * size))
+        depth = array('i', bytes(4 * size))
+
+        queue = deque(children.get(0, ()))
+        for state in queue:
+            depth[state] = 1
+            output[state] = 1 if value_ids[state] != NO_VALUE else 0
+
+        while queue:
+            state = queue.popleft()
+            for next_state in children.get(state, ()):
+                code = next_state - base[state]
+                fallback = fail[state]
+                while True:
+                    target = base[fallback] + code
+                    if check[target] == fallback:
+                        break
+                    if not fallback:
+                        target = 0
+                        break
+                    fallback = fail[fallback]
+                fail[next_state] = target
+                depth[next_state] = depth[state] + 1
+
+                if value_ids[next_state] != NO_VALUE:
+                    output[next_state] = depth[next_state]
+                else:
+                    output[next_state] = output[target]
+                queue.append(next_state)
+
+        self._fail = fail
+        self._output = output
+        self._depth = depth
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        依序找出文本中不重疊的映射詞彙（最左最長）
+
+        Args:
+            text: 要掃描的文本
+
+        Yields:
+            Tuple[int, int, str, str]: (開始位置, 結束位置, 簡體詞, 繁體詞)
+        """
+        if self._fail is None:
+            self._build_failure_links()
+
+        codes = self.codes
+        base = self.base
+        check = self.check
+        fail = self._fail
+        depth = self._depth
+        output = self._output
+        length = len(text)
+
+        position = 0
+        state = 0
+        pending_start = -1
+        pending_end = -1
+
+        while True:
+            if position < length:
+                code = codes.get(text[position])
+                if code is None:
+                    state = 0
+                else:
+                    while True:
+                        next_state = base[state] + code
+                        if check[next_state] == state:
+                            state = next_state
+                            break
+                        if not state:
+                            break
+                        state = fail[state]
+                position += 1
+
+                match_length = output[state]
+                if match_length:
+                    start = position - match_length
+                    if pending_start < 0 or start < pending_start or (
+                        start == pending_start and position > pending_end
+                    ):
+                        pending_start, pending_end = start, position
+
+                # 之後的比對不可能再從 pending_start 或更早的位置開始
+                if pending_start < 0 or position - depth[state] <= pending_start:
+                    continue
+            elif pending_start < 0:
+                return
+
+            key = text[pending_start:pending_end]
+            yield pending_start, pending_end, key, self.get(key)
+
+            # 從已確定比對的結尾重新掃描，避免重疊
+            position = pending_end
+            state = 0
+            pending_start = pending_end = -1
+
+    convert = PhraseMatcher.convert
+
+
+class CompiledDictionary:
+    """
+    編譯後的轉換字典
+
+    單字映射編譯為 str.translate 轉換表，在 C 層級套用；
+    多字詞彙交給 PhraseMatcher（compact 時為 CompactPhraseMatcher），
+    且只在可能作為詞首的字元位置比對
+    """
+
+    def __init__(self, mappings: Dict[str, str], optimize: bool = True, compact: bool = False):
+        """
+        編譯轉換字典
+
+        Args:
+            mappings: 映射表 {簡體: 繁體}
+            optimize: 是否移除不影響任何轉換結果的多字詞彙（見 find_redundant_phrases）
+            compact: 多字詞彙改以雙陣列字典樹保存，記憶體較少但建構與查詢較慢
+        """
+        phrases = {}
+        self.char_table: Dict[int, str] = {}
+
+        for simplified, traditional in mappings.items():
+            if len(simplified) > 1:
+                phrases[simplified] = traditional
+            elif simplified and simplified != traditional:
+                # 單字對應自己時不影響最左最長比對結果，不必放入轉換表
+                self.char_table[ord(simplified)] = traditional
+
+        # 最佳化時移除的詞彙；增量變更或改用最佳切分時放回
+        self._pruned: Dict[str, str] = {}
+        if optimize:
+            for simplified in find_redundant_phrases(phrases, self.char_table):
+                self._pruned[simplified] = phrases.pop(simplified)
+
+        matcher_class = CompactPhraseMatcher if compact else PhraseMatcher
+        self.phrase_matcher = matcher_class(phrases)
+        # 含非表意文字的詞彙；為空時才能只轉換中文片段
+        self._non_cjk_keys = {
+            simplified for simplified in mappings if simplified and not is_cjk_only(simplified)
+        }
+        self._char_pattern = None
+        self._phrase_start_pattern = None
+        self._segmentation = 'greedy'
+        # NumPy 查找表：None 表示尚未建立，False 表示不適用
+        self._lut = None
+        self._joined_tables = None
+        self._compile_patterns()
+
+    @property
+    def segmentation(self) -> str:
+        """詞彙切分方式：greedy 為最左最長，optimal 為段數最少的最佳切分"""
+        return self._segmentation
+
+    @segmentation.setter
+    def segmentation(self, mode: str):
+        if mode != 'greedy':
+            self._restore_pruned()
+        self._segmentation = mode
+
+    @property
+    def pruned_count(self) -> int:
+        """最佳化時移除的詞彙數"""
+        return len(self._pruned)
+
+    def _restore_pruned(self):
+        """放回最佳化時移除的詞彙（移除的條件只對編譯時的詞彙表與最左最長切分成立）"""
+        if not self._pruned:
+            return
+        for simplified, traditional in self._pruned.items():
+            self.phrase_matcher.add(simplified, traditional)
+        self._pruned = {}
+        self._patterns_dirty = True
+
+    @staticmethod
+    def _compile_char_class(chars) -> Optional[re.Pattern]:
+        """將字元集合編譯為正則字元類別"""
+        chars = sorted(set(chars))
+        if not chars:
+            return None
+        return re.compile('[' + ''.join(re.escape(char) for char in chars) + ']')
+
+    def _compile_patterns(self):
+        """重新編譯單字與詞首字元類別"""
+        self._char_pattern = self._compile_char_class(chr(code) for code in self.char_table)
+        self._phrase_start_pattern = self._compile_char_class(self.phrase_matcher.start_chars)
+        self._joined_tables = None
+        self._patterns_dirty = False
+
+    @property
+    def compact(self) -> bool:
+        """多字詞彙是否以雙陣列字典樹保存"""
+        return isinstance(self.phrase_matcher, CompactPhraseMatcher)
+
+    @property
+    def cjk_only(self) -> bool:
+        """所有詞彙是否都只由表意文字組成"""
+        return not self._non_cjk_keys
+
+    @property
+    def max_key_length(self) -> int:
+        """最長詞彙長度（增量移除後可能大於實際值）"""
+        return max(self.phrase_matcher.max_key_length, 1 if self.char_table else 0)
+
+    def to_state(self) -> Dict[str, Any]:
+        """匯出可用 marshal 序列化的內部狀態（供編譯字典快取使用）"""
+        if self._patterns_dirty:
+            self._compile_patterns()
+        return {
+            'char_table': self.char_table,
+            'compact': self.compact,
+            'phrases': self.phrase_matcher.to_state(),
+            'pruned': self._pruned,
+            'non_cjk_keys': sorted(self._non_cjk_keys),
+            'char_pattern': self._char_pattern.pattern if self._char_pattern else None,
+            'phrase_start_pattern': (
+                self._phrase_start_pattern.pattern if self._phrase_start_pattern else None
+            ),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'CompiledDictionary':
+        """由 to_state() 的結果還原，不重新合併或排序映射"""
+        compiled = cls.__new__(cls)
+        compiled.char_table = state['char_table']
+        matcher_class = CompactPhraseMatcher if state['compact'] else PhraseMatcher
+        compiled.phrase_matcher = matcher_class.from_state(state['phrases'])
+        compiled._pruned = state['pruned']
+        compiled._non_cjk_keys = set(state['non_cjk_keys'])
+        compiled._char_pattern = (
+            re.compile(state['char_pattern']) if state['char_pattern'] else None
+        )
+        compiled._phrase_start_pattern = (
+            re.compile(state['phrase_start_pattern']) if state['phrase_start_pattern'] else None
+        )
+        compiled._patterns_dirty = False
+        compiled._segmentation = 'greedy'
+        compiled._lut = None
+        compiled._joined_tables = None
+        return compiled
+
+    def copy(self) -> 'CompiledDictionary':
+        """
+        複製轉換字典，不重新編譯
+
+        Returns:
+            CompiledDictionary: 與原字典不共用可變狀態的副本，之後的增量變更互不影響
+        """
+        copied = self.__class__.__new__(self.__class__)
+        # 編譯後的正則表達式與查找表不會原地修改，可以共用；變更時各自重建
+        copied.__dict__.update(self.__dict__)
+        copied.char_table = dict(self.char_table)
+        copied.phrase_matcher = self.phrase_matcher.copy()
+        copied._pruned = dict(self._pruned)
+        copied._non_cjk_keys = set(self._non_cjk_keys)
+        return copied
+
+    def get(self, simplified: str) -> Optional[str]:
+        """查詢目前生效的映射（單字對應自己或詞彙已在最佳化時移除時返回None）"""
+        if len(simplified) == 1:
+            return self.char_table.get(ord(simplified))
+        return self.phrase_matcher.get(simplified)
+
+    def uses_char(self, char: str) -> bool:
+        """
+        字元是否可能出現在生效的映射中（簡體詞或轉換結果）
+
+        Args:
+            char: 單一字元
+
+        Returns:
+            bool: 可能出現時返回 True（可能將已移除的映射計入，不會漏判）
+        """
+        if ord(char) in self.char_table or char in ''.join(self.char_table.values()):
+            return True
+        return self.phrase_matcher.uses_char(char)
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """列出目前生效的映射（不含對應自己的單字與最佳化時移除的詞彙）"""
+        for code, traditional in self.char_table.items():
+            yield chr(code), traditional
+        yield from self.phrase_matcher.items()
+
+    def set(self, simplified: str, traditional: str):
+        """
+        增量加入或更新單一映射
+
+        Args:
+            simplified: 簡體詞
+            traditional: 繁體詞
+        """
+        if not simplified:
+            return
+        self.discard(simplified)
+
+        if len(simplified) > 1:
+            self.phrase_matcher.add(simplified, traditional)
+        elif simplified != traditional:
+            self.char_table[ord(simplified)] = traditional
+            self._lut = None
+        if not is_cjk_only(simplified):
+            self._non_cjk_keys.add(simplified)
+        self._patterns_dirty = True
+
+    def discard(self, simplified: str):
+        """
+        增量移除單一映射
+
+        Args:
+            simplified: 簡體詞
+        """
+        self._restore_pruned()
+        if len(simplified) > 1:
+            self.phrase_matcher.remove(simplified)
+        elif self.char_table.pop(ord(simplified), None) is not None:
+            self._lut = None
+        self._non_cjk_keys.discard(simplified)
+        self._patterns_dirty = True
+
+    def apply_changes(self, changes: List[Tuple[str, Optional[str]]]):
+        """
+        依序套用 MappingManager.get_changes_since() 的變更
+
+        Args:
+            changes: [(簡體詞, 有效繁體詞或None), ...]
+        """
+        for simplified, traditional in changes:
+            if traditional is None:
+                self.discard(simplified)
+            else:
+                self.set(simplified, traditional)
+
+    def iter_phrases(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        找出文本中不重疊的多字詞彙（依 segmentation 為最左最長或最佳切分）
+
+        Args:
+            text: 要掃描的文本
+
+        Yields:
+            Tuple[int, int, str, str]: (開始位置, 結束位置, 簡體詞, 繁體詞)
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+        if self._phrase_start_pattern is None:
+            return
+        if self.segmentation == 'optimal':
+            yield from self._iter_phrases_optimal(text)
+            return
+
+        longest_at = self.phrase_matcher.longest_at
+        last_end = 0
+
+        for candidate in self._phrase_start_pattern.finditer(text):
+            position = candidate.start()
+            if position < last_end:
+                continue
+            match = longest_at(text, position)
+            if match is not None:
+                end, simplified, traditional = match
+                yield position, end, simplified, traditional
+                last_end = end
+
+    def _iter_phrases_optimal(self, text: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        以動態規劃找出切分段數最少的詞彙組合
+
+        從每個可能的詞首開始建立一個區塊，區塊內任何詞彙出現都會延伸區塊，
+        直到沒有詞彙跨越的位置為止；區塊之間互不影響，逐區塊由左到右計算，
+        每個位置最多檢查最長詞彙長度個字元，成本與文本長度成正比
+
+        切分成本為 (段數, 未轉換的單字數)，同成本時保留較長的最後一段
+
+        Args:
+            text: 要掃描的文本
+
+        Yields:
+            Tuple[int, int, str, str]: (開始位置, 結束位置, 簡體詞, 繁體詞)
+        """
+        prefixes_at = self.phrase_matcher.prefixes_at
+        values = self.phrase_matcher.get
+        char_table = self.char_table
+        length = len(text)
+        position = 0
+
+        while position < length:
+            candidate = self._phrase_start_pattern.search(text, position)
+            if candidate is None:
+                return
+
+            block_start = candidate.start()
+            best = {block_start: (0, 0)}
+            back = {}
+            reach = block_start + 1
+            index = block_start
+
+            while index < reach:
+                segments, unmatched = best[index]
+                # 單字作為一段
+                cost = (segments + 1, unmatched + (ord(text[index]) not in char_table))
+                if index + 1 not in best or cost < best[index + 1]:
+                    best[index + 1] = cost
+                    back[index + 1] = (index, None)
+                # 詞彙作為一段
+                cost = (segments + 1, unmatched)
+                for end, key in prefixes_at(text, index):
+                    if end not in best or cost < best[end]:
+                        best[end] = cost
+                        back[end] = (index, key)
+                    if end > reach:
+                        reach = end
+                index += 1
+
+            chosen = []
+            end = reach
+            while end > block_start:
+                start, key = back[end]
+                if key is not None:
+                    chosen.append((start, end, key, values(key)))
+                end = start
+            yield from reversed(chosen)
+            position = reach
+
+    def safe_limit(self, text: str, limit: int) -> int:
+        """
+        串流處理時可安全切開的位置（不大於 limit）
+
+        最左最長比對只需要 limit 之後保留最長詞彙長度 - 1 個字元；
+        最佳切分則必須切在沒有任何詞彙跨越的位置
+
+        Args:
+            text: 緩衝區文本
+            limit: 詞彙開始位置的上限
+
+        Returns:
+            int: 可切開的位置，找不到時返回0
+        """
+        if self.segmentation != 'optimal':
+            return limit
+        return self.boundary_before(text, limit)
+
+    def boundary_before(self, text: str, position: int) -> int:
+        """
+        找出不大於 position 且沒有任何詞彙跨越的位置
+
+        任何切分方式都必然在這種位置斷開，因此兩側可以分開轉換
+
+        Args:
+            text: 文本
+            position: 開始搜尋的位置
+
+        Returns:
+            int: 邊界位置，找不到時返回0
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+
+        longest_at = self.phrase_matcher.longest_at
+        span = self.phrase_matcher.max_key_length
+        position = min(position, len(text))
+        while position > 0:
+            crossing = None
+            for start in range(max(0, position - span + 1), position):
+                match = longest_at(text, start)
+                if match is not None and match[0] > position:
+                    crossing = start
+                    break
+            if crossing is None:
+                return position
+            position = crossing
+        return 0
+
+    def boundary_after(self, text: str, position: int) -> int:
+        """
+        找出不小於 position 且沒有任何詞彙跨越的位置
+
+        Args:
+            text: 文本
+            position: 開始搜尋的位置
+
+        Returns:
+            int: 邊界位置，找不到時返回文本長度
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+
+        longest_at = self.phrase_matcher.longest_at
+        span = self.phrase_matcher.max_key_length
+        length = len(text)
+        position = max(position, 0)
+        while position < length:
+            reach = position
+            for start in range(max(0, position - span + 1), position):
+                match = longest_at(text, start)
+                if match is not None and match[0] > reach:
+                    reach = match[0]
+            if reach == position:
+                return position
+            position = reach
+        return length
+
+    def vectorized_for(self, length: int) -> bool:
+        """
+        指定長度的文本是否以 NumPy 查找表轉換單字
+
+        Args:
+            length: 文本長度
+
+        Returns:
+            bool: 文本夠長、已安裝 NumPy 且單字轉換都是一對一時返回 True
+        """
+        if length < LUT_MIN_LENGTH:
+            return False
+        if self._lut is None:
+            self._lut = CodepointLUT.build(self.char_table) or False
+        return bool(self._lut)
+
+    def iter_conversions(self, text: str) -> Iterator[Tuple[int, str, str]]:
+        """
+        依序列出每一處實際轉換（與 convert() 的比對結果相同，不含對應自己的詞彙）
+
+        Args:
+            text: 要掃描的文本
+
+        Yields:
+            Tuple[int, str, str]: (開始位置, 簡體詞, 繁體詞)
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+
+        char_pattern = self._char_pattern
+        char_table = self.char_table
+        last_end = 0
+
+        for start, end, simplified, traditional in self.iter_phrases(text):
+            if char_pattern is not None and start > last_end:
+                for match in char_pattern.finditer(text, last_end, start):
+                    char = match.group()
+                    yield match.start(), char, char_table[ord(char)]
+            if simplified != traditional:
+                yield start, simplified, traditional
+            last_end = end
+
+        if char_pattern is not None:
+            for match in char_pattern.finditer(text, last_end):
+                char = match.group()
+                yield match.start(), char, char_table[ord(char)]
+
+    def translate_chars(self, text: str) -> Tuple[str, int]:
+        """
+        只套用單字轉換表
+
+        Args:
+            text: 要轉換的文本
+
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換字數)
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+        if self._char_pattern is None or not text:
+            return text, 0
+
+        if self.vectorized_for(len(text)):
+            # 大型文本以 NumPy 向量化查表
+            return self._lut.translate(text)
+
+        count = len(self._char_pattern.findall(text))
+        if not count:
+            return text, 0
+        return text.translate(self.char_table), count
+
+    def tally(self, text: str, counter: Optional[Counter] = None) -> Counter:
+        """
+        以與 convert() 相同的比對結果統計各映射的出現次數
+
+        Args:
+            text: 要分析的文本
+            counter: 要累加的計數器，預設建立新的
+
+        Returns:
+            Counter: {(簡體詞, 繁體詞): 次數}，不含對應自己的映射
+        """
+        if counter is None:
+            counter = Counter()
+        self.tally_prefix(text, len(text), counter)
+        return counter
+
+    def tally_prefix(self, text: str, limit: int, counter: Counter) -> int:
+        """
+        統計文本前段的映射出現次數，只納入開始位置在 limit 之前的詞彙
+
+        Args:
+            text: 要分析的文本
+            limit: 詞彙開始位置的上限
+            counter: 要累加的計數器
+
+        Returns:
+            int: 已統計的長度（limit 或跨過 limit 的最後一個詞彙結尾）
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+
+        chars = []
+        char_pattern = self._char_pattern
+        last_end = 0
+
+        for start, end, simplified, traditional in self.iter_phrases(text):
+            if start >= limit:
+                break
+            if char_pattern is not None and start > last_end:
+                chars.extend(char_pattern.findall(text, last_end, start))
+            if simplified != traditional:
+                counter[(simplified, traditional)] += 1
+            last_end = end
+
+        consumed = max(limit, last_end)
+        if char_pattern is not None and consumed > last_end:
+            chars.extend(char_pattern.findall(text, last_end, consumed))
+
+        char_table = self.char_table
+        for char, count in Counter(chars).items():
+            counter[(char, char_table[ord(char)])] += count
+        return consumed
+
+    def convert(self, text: str) -> Tuple[str, int]:
+        """
+        轉換文本
+
+        Args:
+            text: 要轉換的文本
+
+        Returns:
+            Tuple[str, int]: (轉換後的文本, 轉換次數)
+        """
+        converted, count, _ = self.convert_prefix(text, len(text))
+        return converted, count
+
+    def convert_prefix(self, text: str, limit: int) -> Tuple[str, int, int]:
+        """
+        轉換文本前段，只套用開始位置在 limit 之前的詞彙
+
+        串流轉換時 limit 之後的內容可能與下一個文本塊組成詞彙，
+        因此只轉換到 limit（或跨過 limit 的最後一個詞彙結尾）為止
+
+        Args:
+            text: 要轉換的文本
+            limit: 詞彙開始位置的上限
+
+        Returns:
+            Tuple[str, int, int]: (轉換後的前段, 轉換次數, 已轉換的長度)
+        """
+        phrases = []
+        total_count = 0
+        last_end = 0
+
+        for start, end, simplified, traditional in self.iter_phrases(text):
+            if start >= limit:
+                break
+            phrases.append((last_end, start, traditional))
+            if simplified != traditional:
+                total_count += 1
+            last_end = end
+
+        consumed = max(limit, last_end)
+        if not phrases:
+            # 沒有任何詞彙時只需單字轉換
+            converted, count = self.translate_chars(text[:consumed] if consumed < len(text) else text)
+            return converted, count, consumed
+
+        segments = []
+        if self.vectorized_for(consumed):
+            # 查找表的單字轉換都是一對一，長度不變：詞彙之間的片段串接後一次查表，再依原位置切回
+            gaps = [text[gap_start:gap_end] for gap_start, gap_end, _ in phrases]
+            gaps.append(text[last_end:consumed])
+            converted, count = self.translate_chars(''.join(gaps))
+            position = 0
+            for gap, (_, _, traditional) in zip(gaps, phrases):
+                segments.append(converted[position:position + len(gap)])
+                segments.append(traditional)
+                position += len(gap)
+            segments.append(converted[position:])
+            return ''.join(segments), total_count + count, consumed
+
+        for gap_start, gap_end, traditional in phrases:
+            converted, count = self.translate_chars(text[gap_start:gap_end])
+            segments.append(converted)
+            segments.append(traditional)
+            total_count += count
+        converted, count = self.translate_chars(text[last_end:consumed])
+        segments.append(converted)
+        return ''.join(segments), total_count + count, consumed
+
+    def _get_joined_tables(self) -> Tuple[re.Pattern, Dict[str, str], Dict[str, str]]:
+        """
+        小型字典在 convert_joined() 使用的詞彙表（第一次使用時才編譯，映射變更後重新編譯）
+
+        Returns:
+            Tuple: (最左最長的字首樹正則表達式, {詞彙: 繁體詞}, {詞彙: 計數標記})
+        """
+        if self._joined_tables is None:
+            values = dict(self.phrase_matcher.items())
+            regex = re.compile('(' + build_trie_pattern(list(values)) + ')')
+            # 實際轉換的詞彙以一個可轉換的單字代替，對應自己的詞彙直接移除
+            marker = chr(next(iter(self.char_table)))
+            marks = {key: (marker if value != key else '') for key, value in values.items()}
+            self._joined_tables = (regex, values, marks)
+        return self._joined_tables
+
+    def convert_joined(self, texts: List[str], separator: str) -> List[Tuple[str, int]]:
+        """
+        以分隔字元串接多個文本後一次轉換，再拆回各自的結果與轉換次數
+
+        Args:
+            texts: 文本列表，都不可包含分隔字元
+            separator: 不出現在任何詞彙與轉換結果中的字元
+
+        Returns:
+            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]
+        """
+        if self._patterns_dirty:
+            self._compile_patterns()
+
+        joined = separator.join(texts)
+        phrase_count = len(self.phrase_matcher)
+        if phrase_count and phrase_count <= JOINED_REGEX_MAX_PHRASES and \
+                self._char_pattern is not None and self.segmentation == 'greedy':
+            return self._convert_joined_regex(joined, separator)
+
+        # 詞彙沿用 iter_phrases() 的比對，不需另外編譯整個字典
+        gaps = []
+        phrases = []
+        changed = []
+        last_end = 0
+        for start, end, simplified, traditional in self.iter_phrases(joined):
+            gaps.append(joined[last_end:start])
+            phrases.append(traditional)
+            if simplified != traditional:
+                changed.append(start)
+            last_end = end
+        gaps.append(joined[last_end:])
+
+        # 詞彙之間的片段（保留分隔字元）移除可轉換的單字後，各文本的長度差即為單字轉換次數
+        char_pattern = self._char_pattern
+        if char_pattern is not None:
+            rest = ''.join(gaps)
+            lengths = map(len, rest.split(separator))
+            remaining = map(len, char_pattern.sub('', rest).split(separator))
+            counts = list(map(sub, lengths, remaining))
+        else:
+            counts = [0] * len(texts)
+        if changed:
+            # 詞彙不含分隔字元，不會跨越文本；依開始位置找出所屬的文本
+            boundaries = list(accumulate(map(len, texts), lambda total, size: total + size + 1))
+            for start in changed:
+                counts[bisect_left(boundaries, start)] += 1
+
+        parts = [None] * (2 * len(phrases) + 1)
+        parts[0::2] = map(str.translate, gaps, repeat(self.char_table))
+        parts[1::2] = phrases
+        return list(zip(''.join(parts).split(separator), counts))
+
+    def _convert_joined_regex(self, joined: str, separator: str) -> List[Tuple[str, int]]:
+        """
+        以正則表達式切出詞彙，查表、單字轉換與計數都以 map 在 C 層級批次處理
+
+        Args:
+            joined: 以分隔字元串接的文本
+            separator: 分隔字元
+
+        Returns:
+            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]
+        """
+        regex, values, marks = self._get_joined_tables()
+        parts = regex.split(joined)
+        phrases = parts[1::2]
+
+        # 詞彙換成標記後移除所有可轉換的單字，各文本的長度差即為轉換次數
+        counted = list(parts)
+        if phrases:
+            counted[1::2] = map(marks.__getitem__, phrases)
+            parts[1::2] = map(values.__getitem__, phrases)
+        parts[0::2] = map(str.translate, parts[0::2], repeat(self.char_table))
+
+        counted_text = ''.join(counted)
+        lengths = map(len, counted_text.split(separator))
+        remaining = map(len, self._char_pattern.sub('', counted_text).split(separator))
+        counts = list(map(sub, lengths, remaining))
+        return list(zip(''.join(parts).split(separator), counts))
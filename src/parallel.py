@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 多程序批量轉換
+"""
+
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import List, Optional, Tuple
+
+try:
+    from .cjk import find_cjk
+    from .matcher import CompiledDictionary
+except ImportError:  # 以頂層模組載入時（例如直接將 src 加入 sys.path）
+    from cjk import find_cjk
+    from matcher import CompiledDictionary
+
+
+# 工作程序內共用的編譯字典，由 _init_worker 設定
+_worker_dictionary: Optional[CompiledDictionary] = None
+
+
+def _init_worker(compiled: Optional[CompiledDictionary], cache_dir: Optional[str],
+                 cache_key: Optional[str], state: Optional[dict], segmentation: str):
+    """
+    工作程序初始化：fork 時直接沿用父程序的編譯字典，
+    spawn 時從編譯字典快取載入，沒有快取時才由序列化的狀態還原
+    """
+    global _worker_dictionary
+
+    if compiled is None and cache_dir is not None:
+        try:
+            from .dict_cache import DictionaryCache
+        except ImportError:  # 以頂層模組載入時
+            from dict_cache import DictionaryCache
+        compiled = DictionaryCache(cache_dir).load(cache_key)
+
+    if compiled is None:
+        if state is None:
+            raise RuntimeError(f"無法從快取載入編譯字典: {cache_key}")
+        compiled = CompiledDictionary.from_state(state)
+
+    compiled.segmentation = segmentation
+    _worker_dictionary = compiled
+
+
+def _convert_chunk(texts: List[str]) -> List[Tuple[str, int]]:
+    """在工作程序中轉換一組文本"""
+    compiled = _worker_dictionary
+    skip_plain = compiled.cjk_only
+    results = []
+    for text in texts:
+        if not text or (skip_plain and find_cjk(text) < 0):
+            results.append((text, 0))
+        else:
+            results.append(compiled.convert(text))
+    return results
+
+
+def default_start_method() -> str:
+    """Linux 使用 fork 讓工作程序直接繼承編譯字典，其他平台使用 spawn"""
+    if sys.platform.startswith('linux'):
+        return 'fork'
+    return 'spawn'
+
+
+class ConversionPool:
+    """
+    批量轉換程序池
+
+    每個工作程序只初始化一次編譯字典，之後重複用於所有分組
+    """
+
+    def __init__(self, compiled: CompiledDictionary, max_workers: int,
+                 dict_cache=None, cache_key: Optional[str] = None,
+                 start_method: Optional[str] = None, segmentation: str = 'greedy'):
+        """
+        初始化程序池
+
+        Args:
+            compiled: 編譯後的轉換字典
+            max_workers: 工作程序數
+            dict_cache: 編譯字典快取（spawn 時用來載入字典）
+            cache_key: 快取鍵
+            start_method: 程序啟動方式，預設依平台選擇
+            segmentation: 詞彙切分方式
+        """
+        self.start_method = start_method or default_start_method()
+        context = multiprocessing.get_context(self.start_method)
+
+        if self.start_method == 'fork':
+            initargs = (compiled, None, None, None, segmentation)
+        elif dict_cache is not None and cache_key is not None and (
+            dict_cache.path_for(cache_key).exists() or dict_cache.store(cache_key, compiled)
+        ):
+            # 工作程序各自以 mmap 載入快取，不需經由管道傳送整個字典
+            initargs = (None, str(dict_cache.cache_dir), cache_key, None, segmentation)
+        else:
+            initargs = (None, None, None, compiled.to_state(), segmentation)
+
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=initargs
+        )
+
+    def convert(self, texts: List[str], chunk_size: int) -> List[Tuple[str, int]]:
+        """
+        分組後平行轉換，結果依輸入順序返回
+
+        Args:
+            texts: 文本列表
+            chunk_size: 每組文本數
+
+        Returns:
+            List[Tuple[str, int]]: [(轉換後的文本, 轉換次數), ...]
+        """
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        return list(chain.from_iterable(self._executor.map(_convert_chunk, chunks)))
+
+    def shutdown(self):
+        """關閉程序池"""
+        self._executor.shutdown(wait=True)
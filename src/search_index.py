@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CodeBridge - 映射搜尋索引
+"""
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+def _grams(text: str) -> Iterable[str]:
+    """文本的單字與相鄰雙字"""
+    yield from text
+    for index in range(len(text) - 1):
+        yield text[index:index + 2]
+
+
+def _query_grams(keyword: str) -> List[str]:
+    """查詢字串的索引鍵：單字查詢使用單字，其餘使用所有相鄰雙字"""
+    if len(keyword) == 1:
+        return [keyword]
+    return [keyword[index:index + 2] for index in range(len(keyword) - 1)]
+
+
+class MappingSearchIndex:
+    """
+    映射的雙字倒排索引
+
+    以簡體與繁體兩側的單字及相鄰雙字為鍵，對應到依序排列的簡體詞；
+    子字串查詢只需檢查最短的一個倒排列表，字首查詢則以二分搜尋排序後的詞彙
+    """
+
+    def __init__(self, mappings: Mapping[str, str]):
+        """
+        建立索引
+
+        Args:
+            mappings: 合併後的映射表 {簡體: 繁體}
+        """
+        self._entries: Dict[str, str] = {}
+        self._postings: Dict[str, List[str]] = {}
+        # 依簡體詞與依 (繁體詞, 簡體詞) 排序，用於字首查詢
+        self._simplified: List[str] = []
+        self._traditional: List[Tuple[str, str]] = []
+
+        # 依簡體詞順序加入，倒排列表自然保持排序
+        for simplified, traditional in sorted(mappings.items()):
+            self._entries[simplified] = traditional
+            self._simplified.append(simplified)
+            for gram in self._entry_grams(simplified, traditional):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    self._postings[gram] = [simplified]
+                else:
+                    posting.append(simplified)
+        self._traditional = sorted(
+            (traditional, simplified) for simplified, traditional in self._entries.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _entry_grams(simplified: str, traditional: str) -> Set[str]:
+        """映射兩側不重複的索引鍵"""
+        grams = set(_grams(simplified))
+        grams.update(_grams(traditional))
+        return grams
+
+    def update(self, simplified: str, traditional: Optional[str]):
+        """
+        更新單一映射
+
+        Args:
+            simplified: 簡體詞
+            traditional: 變更後的繁體詞，None 表示已移除
+        """
+        previous = self._entries.get(simplified)
+        if previous == traditional:
+            return
+
+        if previous is not None:
+            del self._entries[simplified]
+            for gram in self._entry_grams(simplified, previous):
+                posting = self._postings[gram]
+                del posting[bisect_left(posting, simplified)]
+                if not posting:
+                    del self._postings[gram]
+            del self._simplified[bisect_left(self._simplified, simplified)]
+            del self._traditional[bisect_left(self._traditional, (previous, simplified))]
+
+        if traditional is not None:
+            self._entries[simplified] = traditional
+            for gram in self._entry_grams(simplified, traditional):
+                insort(self._postings.setdefault(gram, []), simplified)
+            insort(self._simplified, simplified)
+            insort(self._traditional, (traditional, simplified))
+
+    def search(self, keyword: str, prefix: bool = False,
+               limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        搜尋映射
+
+        Args:
+            keyword: 搜尋關鍵字
+            prefix: 是否只比對開頭（簡體或繁體以關鍵字開頭）
+            limit: 最多返回的筆數，None 表示不限
+
+        Returns:
+            List[Tuple[str, str]]: 符合的 (簡體詞, 繁體詞)；子字串查詢依簡體詞排序，
+            字首查詢先列出簡體詞符合者，再列出僅繁體詞符合者（各自排序）
+        """
+        if limit is not None and limit <= 0:
+            return []
+        if prefix:
+            return self._search_prefix(keyword, limit)
+
+        if keyword:
+            postings = [self._postings.get(gram) for gram in _query_grams(keyword)]
+            if None in postings:
+                return []
+            candidates = min(postings, key=len)
+        else:
+            candidates = self._simplified
+
+        entries = self._entries
+        results = []
+        for simplified in candidates:
+            traditional = entries[simplified]
+            if keyword in simplified or keyword in traditional:
+                results.append((simplified, traditional))
+                if len(results) == limit:
+                    break
+        return results
+
+    def _search_prefix(self, keyword: str, limit: Optional[int]) -> List[Tuple[str, str]]:
+        """字首查詢：依序掃描兩個排序列表中以關鍵字開頭的區段"""
+        results = []
+        entries = self._entries
+        index = bisect_left(self._simplified, keyword)
+        while index < len(self._simplified):
+            simplified = self._simplified[index]
+            if not simplified.startswith(keyword):
+                break
+            results.append((simplified, entries[simplified]))
+            if len(results) == limit:
+                return results
+            index += 1
+        if limit is not None and len(results) >= limit:
+            return results
+
+        index = bisect_left(self._traditional, (keyword,))
+        while index < len(self._traditional):
+            traditional, simplified = self._traditional[index]
+            if not traditional.startswith(keyword):
+                break
+            if not simplified.startswith(keyword):
+                results.append((simplified, traditional))
+                if len(results) == limit:
+                    break
+            index += 1
+        return results
@@ -22,6 +22,7 @@ class SessionStats:
     total_files: int = 0
     processed_files: int = 0
     total_conversions: int = 0
+    early_exit_files: int = 0
     errors_count: int = 0
     preview_mode: bool = False
     project_path: str = ""
@@ -147,6 +148,7 @@ class StatisticsCollector:
         self.current_session.total_files = conversion_result.total_files
         self.current_session.processed_files = conversion_result.processed_files
         self.current_session.total_conversions = conversion_result.total_conversions
+        self.current_session.early_exit_files = conversion_result.early_exit_files
         self.current_session.errors_count = len(conversion_result.errors)
         
         self.logger.debug(f"更新會話統計: {self.current_session.processed_files}/{self.current_session.total_files} 檔案")
@@ -210,6 +212,7 @@ class StatisticsCollector:
             'total_files': session.total_files,
             'processed_files': session.processed_files,
             'total_conversions': session.total_conversions,
+            'early_exit_files': session.early_exit_files,
             'errors_count': session.errors_count,
             'success_rate': f"{session.success_rate:.1f}%",
             'avg_conversions_per_file': (
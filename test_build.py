@@ -65,6 +65,18 @@ def test_codebridge_modules():
         'src.codebridge',
         'src.config',
         'src.converter',
+        'src.matcher',
+        'src.double_array',
+        'src.cjk',
+        'src.dict_cache',
+        'src.byte_engine',
+        'src.char_lut',
+        'src.parallel',
+        'src.engines',
+        'src.builtin_dict',
+        'src.search_index',
+        'src.dict_optimizer',
+        'src.directory_mappings',
         'src.mappings',
         'src.file_processor',
         'src.statistics'
@@ -94,6 +106,7 @@ def test_required_files():
         'src/config.py',
         'src/converter.py',
         'src/mappings.py',
+        'src/builtin_mappings.dat',
         'data/custom_mappings_example.txt',
         'README.md'
     ]
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試內建映射資料檔
+"""
+
+import unittest
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from builtin_dict import (
+    BUILTIN_DATA_FILE, BUILTIN_SOURCE_FILE, CompactMapping, load_builtin_mappings, read_mapping_source
+)
+from mappings import MappingManager
+
+
+class TestCompactMapping(unittest.TestCase):
+    """測試 CompactMapping 類"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {'数据库': '資料庫', '软件': '軟體', '爱': '愛', '𠀀字': '𠀀字'}
+        self.compact = CompactMapping.from_mapping(self.mappings)
+
+    def test_lookup(self):
+        """測試查詢、迭代與項目"""
+        self.assertEqual(len(self.compact), 4)
+        self.assertEqual(self.compact['软件'], '軟體')
+        self.assertEqual(self.compact.get('𠀀字'), '𠀀字')
+        self.assertIsNone(self.compact.get('软'))
+        self.assertNotIn('软件开发', self.compact)
+        self.assertNotIn(1, self.compact)
+        self.assertEqual(list(self.compact), sorted(self.mappings))
+        self.assertEqual(dict(self.compact.items()), self.mappings)
+        with self.assertRaises(KeyError):
+            self.compact['不存在']
+
+    def test_bytes_round_trip(self):
+        """測試序列化後還原與損壞檔案"""
+        data = self.compact.to_bytes()
+        self.assertEqual(dict(CompactMapping.from_bytes(data).items()), self.mappings)
+        self.assertEqual(len(CompactMapping.from_mapping({})), 0)
+
+        with self.assertRaises(ValueError):
+            CompactMapping.from_bytes(b'XXXXXXXX' + data[8:])
+        with self.assertRaises(ValueError):
+            CompactMapping.from_bytes(data[:-1])
+
+    def test_shipped_data_matches_source(self):
+        """測試隨附的資料檔與原始檔一致（修改原始檔後需執行 make builtin-dict）"""
+        with open(BUILTIN_SOURCE_FILE, 'r', encoding='utf-8') as f:
+            source = read_mapping_source(f)
+        self.assertEqual(CompactMapping.from_mapping(source).to_bytes(), BUILTIN_DATA_FILE.read_bytes())
+
+    def test_shared_across_managers(self):
+        """測試內建映射在程序內只載入一次並由所有管理器共用"""
+        first, second = MappingManager(), MappingManager()
+        self.assertIs(first._builtin_mappings, second._builtin_mappings)
+        self.assertIs(first._builtin_mappings, load_builtin_mappings())
+        self.assertEqual(first.get_builtin_mappings().get("转换"), "轉換")
+
+        # 修改取得的副本不影響共用的內建映射
+        copy = first.get_builtin_mappings()
+        copy["转换"] = "x"
+        self.assertEqual(second.get_merged_view()["转换"], "轉換")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試 UTF-8 位元組轉換引擎
+"""
+
+import unittest
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from byte_engine import Utf8ByteEngine, is_utf8
+from matcher import CompiledDictionary
+from mappings import MappingManager
+
+
+class TestUtf8ByteEngine(unittest.TestCase):
+    """測試 Utf8ByteEngine 類"""
+    
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {
+            '数': '數', '据': '據', '库': '庫', '安': '安',
+            '数据': '數據', '数据库': '資料庫', '安全': '安全'
+        }
+        self.compiled = CompiledDictionary(self.mappings)
+        self.engine = Utf8ByteEngine.from_compiled(self.compiled)
+    
+    def test_longest_match_and_identity(self):
+        """測試最長詞彙優先，對應自己的詞彙不計入轉換次數"""
+        converted, count = self.engine.convert("数据库、安全、数据".encode('utf-8'))
+        
+        self.assertEqual(converted.decode('utf-8'), "資料庫、安全、數據")
+        self.assertEqual(count, 2)
+    
+    def test_same_result_as_str_path(self):
+        """測試與字串轉換結果一致"""
+        for text in ["数据库安全数据", "安全数库据", "x = '数数据据库库'\r\n", "no chinese"]:
+            expected, count = self.compiled.convert(text)
+            self.assertEqual(self.engine.convert(text.encode('utf-8')),
+                             (expected.encode('utf-8'), count))
+    
+    def test_builtin_dictionary(self):
+        """測試內建字典的轉換結果與字串轉換一致"""
+        compiled = CompiledDictionary(MappingManager().get_all_mappings())
+        engine = Utf8ByteEngine.from_compiled(compiled)
+        text = "# 数据库连接失败，请检查网络设置\nprint('软件开发')\n" * 3
+        expected, count = compiled.convert(text)
+        
+        self.assertEqual(engine.convert(text.encode('utf-8')), (expected.encode('utf-8'), count))
+    
+    def test_is_utf8(self):
+        """測試 UTF-8 驗證（包含跨越分塊邊界的多位元組字元）"""
+        data = "数据库".encode('utf-8') * 10
+        
+        self.assertTrue(is_utf8(data, block_size=4))
+        self.assertFalse(is_utf8("数据库".encode('gbk')))
+        self.assertFalse(is_utf8(data[:-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試 NumPy 單字查找表
+"""
+
+import unittest
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+import char_lut
+from char_lut import CodepointLUT, numpy_available
+from matcher import CompiledDictionary
+
+
+class TestCodepointLUT(unittest.TestCase):
+    """測試 CodepointLUT 類"""
+    
+    def setUp(self):
+        """設置測試環境"""
+        self.compiled = CompiledDictionary({'数': '數', '据': '據', '库': '庫', '数据库': '資料庫'})
+    
+    @unittest.skipUnless(numpy_available(), "未安裝 NumPy")
+    def test_same_result_as_translate(self):
+        """測試查表結果與 str.translate 一致（包含擴展平面字元）"""
+        lut = CodepointLUT.build(self.compiled.char_table)
+        text = "数据库😀数据abc据" * 100
+        
+        expected = text.translate(self.compiled.char_table)
+        
+        self.assertEqual(lut.translate(text), (expected, 600))
+        self.assertEqual(lut.translate("abc"), ("abc", 0))
+    
+    @unittest.skipUnless(numpy_available(), "未安裝 NumPy")
+    def test_not_built_for_multi_char_values(self):
+        """測試有單字轉為多字時不建立查找表"""
+        self.assertIsNone(CodepointLUT.build({ord('网'): '網路'}))
+    
+    @unittest.skipUnless(numpy_available(), "未安裝 NumPy")
+    def test_lone_surrogates(self):
+        """測試單獨的代理字元原樣保留"""
+        lut = CodepointLUT.build(self.compiled.char_table)
+        
+        self.assertEqual(lut.translate("数\udc80据\ud83d"), ("數\udc80據\ud83d", 2))
+    
+    @unittest.skipUnless(numpy_available(), "未安裝 NumPy")
+    def test_used_between_phrases(self):
+        """測試含詞彙的大型文本也以查找表轉換詞彙之間的單字"""
+        repeat = char_lut.LUT_MIN_LENGTH // 8 + 1
+        text = "数据库和数据\udc80库" * repeat
+        
+        converted, count = self.compiled.convert(text)
+        
+        self.assertTrue(self.compiled._lut)
+        self.assertEqual(converted, "資料庫和數據\udc80庫" * repeat)
+        self.assertEqual(count, 4 * repeat)
+    
+    def test_fallback_without_numpy(self):
+        """測試未安裝 NumPy 時大型文本仍以 str.translate 轉換"""
+        original_np = char_lut.np
+        char_lut.np = None
+        try:
+            repeat = char_lut.LUT_MIN_LENGTH // 6 + 1
+            converted, count = self.compiled.convert("数据库和数据" * repeat)
+            
+            self.assertEqual(converted, "資料庫和數據" * repeat)
+            self.assertEqual(count, 3 * repeat)
+            self.assertFalse(self.compiled._lut)
+        finally:
+            char_lut.np = original_np
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,7 +18,8 @@ from src.converter import ChineseConverter
 from src.mappings import MappingManager
 from src.file_processor import FileProcessor
 from src.config import Config
-from src.codebridge import CodeBridge
+from src.dict_cache import DictionaryCache
+from src.codebridge import CodeBridge, ConversionResult
 
 
 class TestChineseConverter(unittest.TestCase):
@@ -395,6 +396,31 @@ class TestCodeBridgeIntegration(unittest.TestCase):
         self.assertIn("自定義詞", converted_content)
         self.assertIn("測試詞彙", converted_content)
 
+    
+    def test_report_run_cache_line(self):
+        """測試片段快取沒有任何查詢時報告不顯示快取統計"""
+        self.assertEqual(self.codebridge.config.run_cache_size, 0)
+        self.assertNotIn("片段快取", self.codebridge.generate_report(ConversionResult()))
+        
+        self.codebridge.converter = ChineseConverter(self.codebridge.mapping_manager, run_cache_size=16)
+        self.codebridge.converter.convert_text("数据 数据")
+        self.assertIn("片段快取: 命中 1 / 未命中 1", self.codebridge.generate_report(ConversionResult()))
+    
+    def test_directory_mappings_skip_dict_cache(self):
+        """測試目錄映射組合的轉換器不寫入編譯字典快取"""
+        cache_dir = self.temp_dir / "cache"
+        self.codebridge.dict_cache = DictionaryCache(cache_dir)
+        (self.temp_dir / "a").mkdir()
+        (self.temp_dir / "a" / "codebridge_custom.txt").write_text("项目:專案\n", encoding='utf-8')
+        
+        converter = self.codebridge.directory_mappings.converter_for(self.temp_dir / "a", self.temp_dir)
+        
+        self.assertIsNone(converter.dict_cache)
+        self.assertEqual(converter.convert_text("项目")[0], "專案")
+        self.assertFalse(cache_dir.exists() and any(cache_dir.iterdir()))
+        base = self.codebridge._create_converter(self.codebridge.mapping_manager)
+        self.assertIs(base.dict_cache, self.codebridge.dict_cache)
+
 
 def run_tests():
     """執行所有測試"""
@@ -31,6 +31,8 @@ class TestConfig(unittest.TestCase):
         self.assertGreater(len(config.exclude_dirs), 0)
         self.assertGreater(config.max_file_size, 0)
         self.assertIn('INFO', ['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+        # 編譯字典快取會寫入家目錄，預設關閉
+        self.assertFalse(config.dict_cache)
     
     def test_load_config_from_file(self):
         """測試從檔案載入配置"""
@@ -127,12 +129,14 @@ class TestConfig(unittest.TestCase):
         config.set_config("max_file_size", -1)
         config.set_config("max_workers", 0)
         config.set_config("log_level", "INVALID")
+        config.set_config("category_keywords", {"資料": "数据"})
         
         errors = config.validate_config()
         self.assertGreater(len(errors), 0)
         self.assertTrue(any("max_file_size" in error for error in errors))
         self.assertTrue(any("max_workers" in error for error in errors))
         self.assertTrue(any("log_level" in error for error in errors))
+        self.assertTrue(any("category_keywords" in error for error in errors))
     
     def test_get_set_config(self):
         """測試獲取和設置配置"""
@@ -5,6 +5,7 @@
 """
 
 import unittest
+import tempfile
 import sys
 import os
 
@@ -13,6 +14,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(os.path.dirname(current_dir), 'src')
 sys.path.insert(0, src_dir)
 
+import engines
 from converter import ChineseConverter
 from mappings import MappingManager
 
@@ -144,6 +146,334 @@ class TestChineseConverter(unittest.TestCase):
             self.assertIsInstance(converted, str)
             self.assertIsInstance(count, int)
     
+    def test_cjk_runs_same_as_full_text(self):
+        """測試中文片段模式與整段轉換結果一致"""
+        full_converter = ChineseConverter(self.mapping_manager, cjk_runs=False)
+        text = "# 数据库连接\nprint('软件开发', 42)  // 设计模式和架构"
+        
+        self.assertEqual(self.converter.convert_text(text), full_converter.convert_text(text))
+    
+    def test_may_convert(self):
+        """測試無中文文本的快速判斷"""
+        self.assertFalse(self.converter.may_convert("def main():\n    return 0\n"))
+        self.assertFalse(self.converter.may_convert(""))
+        self.assertTrue(self.converter.may_convert("x = '数据'"))
+        self.assertTrue(self.converter.may_convert("罕见字\u3400"))
+        self.assertFalse(self.converter.may_convert("café naïve"))
+    
+    def test_text_without_cjk_all_engines(self):
+        """測試沒有表意文字的文本在各引擎下都原樣返回"""
+        for engine in ('auto', 'translate', 'regex', 'bytes', 'legacy'):
+            converter = ChineseConverter(self.mapping_manager, engine=engine)
+            for text in ("x = 1\n" * 100, "café naïve " * 10):
+                self.assertEqual(converter.convert_text(text), (text, 0), engine)
+            self.assertEqual(converter.convert_text("x = '数据'")[0], "x = '數據'", engine)
+    
+    def test_cjk_runs_disabled_for_non_cjk_keys(self):
+        """測試詞彙含非中文字元時自動停用中文片段模式"""
+        self.mapping_manager.add_custom_mapping("API接口", "API介面")
+        converter = ChineseConverter(self.mapping_manager)
+        
+        self.assertTrue(converter.may_convert("no chinese"))
+        converted, count = converter.convert_text("调用API接口")
+        self.assertIn("API介面", converted)
+    
+    def test_run_cache(self):
+        """測試中文片段快取命中、淘汰與失效"""
+        converter = ChineseConverter(self.mapping_manager, run_cache_size=2)
+        
+        first = converter.convert_text("数据 数据 测试")
+        stats = converter.get_cache_stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['hits'], 1)
+        
+        self.assertEqual(converter.convert_text("数据 数据 测试"), first)
+        converter.convert_text("软件")
+        stats = converter.get_cache_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['size'], 2)
+        
+        # 映射變更後快取失效
+        self.mapping_manager.add_custom_mapping("软件", "軟體")
+        converted, _ = converter.convert_text("软件")
+        self.assertEqual(converted, "軟體")
+        self.assertEqual(converter.get_cache_stats()['invalidations'], 1)
+    
+    def test_shared_manager_converters(self):
+        """測試多個轉換器共用映射管理器時都能看到變更"""
+        other = ChineseConverter(self.mapping_manager)
+        self.mapping_manager.add_custom_mapping("共用词", "共用詞")
+        
+        self.assertEqual(self.converter.convert_text("共用词")[0], "共用詞")
+        self.assertEqual(other.convert_text("共用词")[0], "共用詞")
+        self.assertIn(("共用词", "共用詞", 1), other.preview_conversion("共用词"))
+    
+    def test_incremental_updates_match_rebuild(self):
+        """測試增量更新與完整重建的結果一致"""
+        self.mapping_manager.add_custom_mapping("数据库", "資料庫")
+        self.mapping_manager.add_custom_mapping("软", "軟")
+        self.mapping_manager.add_custom_mapping("API接口", "API介面")
+        self.mapping_manager.remove_custom_mapping("API接口")
+        self.mapping_manager.remove_custom_mapping("数据库")
+        self.mapping_manager.add_custom_mapping("数据库", "資料庫系統")
+        
+        rebuilt = ChineseConverter(self.mapping_manager)
+        text = "数据库软件接口API接口测试"
+        self.assertEqual(self.converter.convert_text(text), rebuilt.convert_text(text))
+        self.assertTrue(self.converter.may_convert("数据") and not self.converter.may_convert("API"))
+    
+    def test_preview_agrees_with_conversion(self):
+        """測試預覽統計與實際轉換次數完全一致"""
+        text = "数据库连接失败，请检查数据。软件开发中的设计模式和架构，数据处理完成"
+        _, count = self.converter.convert_text(text)
+        preview = self.converter.preview_conversion(text)
+        
+        self.assertEqual(sum(item[2] for item in preview), count)
+        # 長詞彙排在前面
+        lengths = [len(simplified) for simplified, _, _ in preview]
+        self.assertEqual(lengths, sorted(lengths, reverse=True))
+    
+    def test_analysis_shares_one_scan(self):
+        """測試三個分析方法對同一文本只掃描一次"""
+        calls = []
+        original_tally = self.converter._compiled.tally
+        
+        def counting_tally(text, counter=None):
+            calls.append(text)
+            return original_tally(text, counter)
+        
+        self.converter._compiled.tally = counting_tally
+        text = "数据处理完成"
+        self.converter.preview_conversion(text)
+        self.converter.get_unique_conversions(text)
+        self.converter.get_conversion_statistics(text)
+        
+        self.assertEqual(len(calls), 1)
+        # 快取只以雜湊值辨識文本，不保留原文
+        self.assertNotIn(text, self.converter._last_analysis[0])
+        
+        # 相同長度的不同文本與映射變更後都重新掃描
+        self.converter.preview_conversion("数据处理失败")
+        self.mapping_manager.add_custom_mapping("处理失败", "處理失敗")
+        self.assertIn(("处理失败", "處理失敗", 1), self.converter.preview_conversion("数据处理失败"))
+        self.assertEqual(len(calls), 3)
+    
+    def test_convert_stream_across_chunks(self):
+        """測試串流轉換不會遺漏跨越文本塊邊界的詞彙"""
+        text = "数据库连接失败，请检查数据。软件开发中的设计模式和架构" * 3
+        expected = self.converter.convert_text(text)
+        
+        for size in (1, 2, 5, 7):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            results = list(self.converter.iter_convert_stream(chunks))
+            
+            self.assertEqual(''.join(self.converter.convert_stream(chunks)), expected[0])
+            self.assertEqual(sum(count for _, count in results), expected[1])
+            self.assertEqual(sorted(self.converter.preview_stream(chunks)),
+                             sorted(self.converter.preview_conversion(text)))
+    
+    def test_parallel_batch_convert(self):
+        """測試程序池批量轉換的結果與順序和逐一轉換相同"""
+        texts = ["数据库连接失败", "", "Hello", "软件开发中的设计模式"] * 10
+        expected = [self.converter.convert_text(text) for text in texts]
+        
+        try:
+            self.assertEqual(self.converter.batch_convert(texts, max_workers=2, chunk_size=3), expected)
+            
+            # 映射變更後重新建立程序池
+            self.mapping_manager.add_custom_mapping("数据库", "資料庫")
+            results = self.converter.batch_convert(texts, max_workers=2, chunk_size=3)
+            self.assertEqual(results[0], self.converter.convert_text(texts[0]))
+            self.assertTrue(results[0][0].startswith("資料庫"))
+        finally:
+            self.converter.close()
+    
+    def test_parallel_batch_convert_spawn(self):
+        """測試 spawn 啟動的工作程序從編譯字典快取載入字典"""
+        from dict_cache import DictionaryCache
+        from parallel import ConversionPool
+        
+        texts = ["数据库连接失败", "软件开发"] * 4
+        expected = [self.converter.convert_text(text) for text in texts]
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            dict_cache = DictionaryCache(cache_dir)
+            pool = ConversionPool(self.converter._compiled, 2, dict_cache, 'k' * 64, start_method='spawn')
+            try:
+                self.assertEqual(pool.convert(texts, 3), expected)
+                self.assertTrue(dict_cache.path_for('k' * 64).exists())
+            finally:
+                pool.shutdown()
+    
+    def test_convert_many(self):
+        """測試大量短文本一次轉換與逐一轉換相同"""
+        texts = ["保存", "数据库连接失败", "", "Loading...", "{count} 个项目"] * 20
+        expected = [self.converter.convert_text(text) for text in texts]
+        
+        self.assertEqual(self.converter.convert_many(texts), expected)
+        # 文本本身含有分隔字元時改為逐一轉換
+        texts.append("数据\x00\x1f\x1e\x1d\x1c\ufdd0\uffff")
+        self.assertEqual(self.converter.convert_many(texts)[-1], self.converter.convert_text(texts[-1]))
+        self.assertEqual(self.converter.convert_many([]), [])
+    
+    def test_convert_text_with_spans(self):
+        """測試轉換位置與行號、欄號"""
+        text = "a = 1\n# 数据处理\r\nprint('软件')"
+        converted, spans = self.converter.convert_text_with_spans(text)
+        
+        self.assertEqual((converted, len(spans)), self.converter.convert_text(text))
+        self.assertEqual(spans, self.converter.preview_conversion_spans(text))
+        for span in spans:
+            self.assertEqual(text[span.offset:span.offset + len(span.simplified)], span.simplified)
+            line = text.split('\n')[span.line - 1]
+            self.assertEqual(line[span.column - 1:span.column - 1 + len(span.simplified)], span.simplified)
+        self.assertEqual(spans[0][:3], (8, 2, 3))
+        self.assertEqual(self.converter.convert_text_with_spans("Hello"), ("Hello", []))
+    
+    def test_optimal_segmentation(self):
+        """測試最佳切分模式下各種轉換方式的結果一致"""
+        for simplified, traditional in [("数据库", "資料庫"), ("据库存", "據庫存"), ("库存", "庫存")]:
+            self.mapping_manager.add_custom_mapping(simplified, traditional)
+        converter = ChineseConverter(self.mapping_manager, segmentation='optimal')
+        text = "查询数据库存储，数据库存量"
+        converted, count = converter.convert_text(text)
+        
+        self.assertIn("數據庫存", converted)
+        chunks = [text[i:i + 2] for i in range(0, len(text), 2)]
+        self.assertEqual(''.join(converter.convert_stream(chunks)), converted)
+        self.assertEqual(converter.convert_bytes(text.encode('utf-8')), (converted.encode('utf-8'), count))
+        self.assertEqual(converter.convert_many([text, text]), [(converted, count)] * 2)
+        self.assertEqual(sum(item[2] for item in converter.preview_conversion(text)), count)
+        
+        with self.assertRaises(ValueError):
+            ChineseConverter(self.mapping_manager, segmentation='unknown')
+    
+    def test_convert_range(self):
+        """測試只轉換修改範圍的結果與轉換整個文本相同"""
+        text = "a = 1  # 这是一个简单的测试\nb = 2  # 数据库连接成功\n"
+        start = text.index("数据库") + 1
+        result = self.converter.convert_range(text, start, start + 2)
+        
+        self.assertLessEqual(result.start, start)
+        self.assertGreaterEqual(result.end, start + 2)
+        
+        patched = text[:result.start] + result.replacement + text[result.end:]
+        prefix, prefix_count = self.converter.convert_text(text[:result.start])
+        suffix, suffix_count = self.converter.convert_text(text[result.end:])
+        self.assertEqual(prefix + result.replacement + suffix, self.converter.convert_text(text)[0])
+        self.assertEqual(prefix_count + result.count + suffix_count,
+                         self.converter.convert_text(text)[1])
+        self.assertEqual(self.converter.convert_range(patched, result.start, result.end).count, 0)
+        self.assertIsNone(result.delta)
+
+        # 提供修改前的文本時返回修改造成的轉換次數變化
+        old_text = text.replace("数据库连接", "网络连接")
+        edit_start = text.index("数据库")
+        edit_end = edit_start + len("数据库")
+        result = self.converter.convert_range(text, edit_start, edit_end, old_text=old_text)
+        self.assertEqual(result.delta, self.converter.convert_text(text)[1]
+                         - self.converter.convert_text(old_text)[1])
+        self.assertLessEqual(result.start, edit_start)
+        self.assertGreaterEqual(result.end, edit_end)
+
+        with self.assertRaises(ValueError):
+            self.converter.convert_range(text, 5, len(text) + 1)
+        with self.assertRaises(ValueError):
+            self.converter.convert_range(text, 5, 6, old_text=text[:2])
+    
+    def test_engines(self):
+        """測試各轉換引擎結果一致，auto 模式記錄選擇的引擎"""
+        text = "这是一个简单的测试，数据库连接成功。" * 4 + "\nprint('ok')"
+        expected = self.converter.convert_text(text)
+        
+        for engine in ('translate', 'automaton', 'regex', 'bytes'):
+            converter = ChineseConverter(self.mapping_manager, engine=engine)
+            self.assertEqual(converter.convert_text(text), expected)
+            self.assertEqual(converter.get_engine_stats(), {engine: 1})
+        
+        auto = ChineseConverter(self.mapping_manager)
+        auto.convert_text(text)
+        auto.convert_text("print('ok')")
+        self.assertEqual(auto.get_engine_stats(), {'translate': 2})
+    
+    def test_auto_engine_policy(self):
+        """測試 auto 在字典剛變更時使用 translate，轉換量足以攤還編譯成本後才改用 bytes"""
+        text = "这是一个简单的测试，数据库连接成功。" * 4
+        data = text.encode('utf-8')
+        auto = ChineseConverter(self.mapping_manager)
+        compiled = auto._compiled
+        entries = len(compiled.char_table) + len(compiled.phrase_matcher)
+        
+        auto.convert_bytes(data)
+        self.assertEqual(auto.get_engine_stats(), {'translate': 1})
+        self.assertIsNone(auto._byte_engine)
+        
+        while auto._version_chars < engines.AUTO_REBUILD_RATIO * entries:
+            auto.convert_text(text)
+        self.assertNotIn('bytes', auto.get_engine_stats())
+        self.assertEqual(auto.convert_text(text), self.converter.convert_text(text))
+        self.assertEqual(auto.convert_bytes(data), self.converter.convert_bytes(data))
+        stats = auto.get_engine_stats()
+        self.assertEqual(stats['bytes'], 2)
+        
+        # 映射變更後重新累計，不立即重新編譯
+        self.mapping_manager.add_custom_mapping("测试甲", "測試甲")
+        auto.convert_text(text)
+        auto.convert_bytes(data)
+        self.assertEqual(auto.get_engine_stats()['bytes'], 2)
+        self.assertIsNone(auto._byte_engine)
+        
+        # 字典過大時不編譯
+        self.assertEqual(engines.select_engine(text, compiled, converted_chars=10 ** 9), 'bytes')
+        original_limit = engines.AUTO_REGEX_MAX_ENTRIES
+        engines.AUTO_REGEX_MAX_ENTRIES = entries - 1
+        try:
+            self.assertEqual(engines.select_engine(text, compiled, converted_chars=10 ** 9), 'translate')
+            self.assertEqual(engines.select_engine(text, compiled, built={'bytes'}), 'bytes')
+        finally:
+            engines.AUTO_REGEX_MAX_ENTRIES = original_limit
+    
+    def test_auto_engine_density(self):
+        """測試 auto 依表意文字密度選擇 regex 或 bytes"""
+        compiled = self.converter._compiled
+        built = {'regex', 'bytes'}
+        sparse = "value = compute(x)\n" * 100 + "数据库"
+        dense = "这是一个简单的测试，数据库连接成功。" * 4
+        
+        self.assertLess(engines.estimate_cjk_density(sparse), engines.AUTO_SPARSE_DENSITY)
+        self.assertAlmostEqual(engines.estimate_cjk_density(dense), 1.0)
+        self.assertEqual(engines.estimate_cjk_density("数" + "x" * 100000 + "\udc80"),
+                         engines.estimate_cjk_density("数" + "x" * 100000 + "a"))
+        self.assertEqual(engines.select_engine(sparse, compiled, built=built), 'regex')
+        self.assertEqual(engines.select_engine(dense, compiled, built=built), 'bytes')
+    
+    def test_legacy_engine(self):
+        """測試 legacy 引擎與舊版逐詞替換結果相同"""
+        text = "这是一个简单的测试，包含数据库和软件开发。"
+        legacy = ChineseConverter(self.mapping_manager, engine='legacy')
+        
+        converted = text
+        total = 0
+        mappings = sorted(self.mapping_manager.get_all_mappings().items(),
+                          key=lambda x: len(x[0]), reverse=True)
+        for simplified, traditional in mappings:
+            if simplified in converted and simplified != traditional:
+                total += converted.count(simplified)
+                converted = converted.replace(simplified, traditional)
+        
+        self.assertEqual(legacy.convert_text(text), (converted, total))
+        
+        # 映射變更後重新建立引擎
+        self.mapping_manager.add_custom_mapping("简单", "簡易")
+        self.assertIn("簡易", legacy.convert_text(text)[0])
+    
+    def test_invalid_engine(self):
+        """測試不支援的引擎設定"""
+        with self.assertRaises(ValueError):
+            ChineseConverter(self.mapping_manager, engine='unknown')
+        with self.assertRaises(ValueError):
+            ChineseConverter(self.mapping_manager, segmentation='optimal', engine='regex')
+    
     def test_get_unique_conversions(self):
         """測試獲取唯一轉換對"""
         text = "这个测试中包含重复的词汇，这个测试很重要。"
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試編譯字典快取
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+import time
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from dict_cache import DictionaryCache
+from converter import ChineseConverter
+from mappings import MappingManager
+from matcher import CompiledDictionary
+
+
+class TestDictionaryCache(unittest.TestCase):
+    """測試 DictionaryCache 類"""
+    
+    def setUp(self):
+        """設置測試環境"""
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = DictionaryCache(self.cache_dir)
+        self.mapping_manager = MappingManager()
+    
+    def tearDown(self):
+        """清理測試環境"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+    
+    def test_fingerprint_tracks_custom_mappings(self):
+        """測試映射指紋隨自定義映射改變"""
+        original = self.mapping_manager.get_fingerprint()
+        self.assertEqual(original, MappingManager().get_fingerprint())
+        
+        self.mapping_manager.add_custom_mapping("快取词", "快取詞")
+        self.assertNotEqual(self.mapping_manager.get_fingerprint(), original)
+    
+    def test_fingerprint_distinguishes_boundaries(self):
+        """測試詞彙邊界不同的映射得到不同的指紋"""
+        first = MappingManager()
+        first.update_custom_mappings({'数据': '數據库', '库': '庫'})
+        second = MappingManager()
+        second.update_custom_mappings({'数': '數據', '据库': '库庫'})
+        self.assertNotEqual(first.get_fingerprint(), second.get_fingerprint())
+        
+        same = MappingManager()
+        same.update_custom_mappings({'数据': '數據库', '库': '庫'})
+        self.assertEqual(first.get_fingerprint(), same.get_fingerprint())
+    
+    def test_store_and_load(self):
+        """測試儲存後可從 mmap 載入相同的字典"""
+        calls = []
+        
+        def factory():
+            calls.append(1)
+            return self.mapping_manager.get_all_mappings()
+        
+        fingerprint = self.mapping_manager.get_fingerprint()
+        compiled = self.cache.get_or_compile(fingerprint, factory)
+        loaded = self.cache.get_or_compile(fingerprint, factory)
+        
+        self.assertEqual(len(calls), 1)  # 第二次直接從快取載入
+        self.assertTrue(self.cache.path_for(self.cache.make_key(fingerprint)).exists())
+        
+        text = "数据库连接失败，请检查网络设置"
+        self.assertEqual(loaded.convert(text), compiled.convert(text))
+        self.assertEqual(loaded.cjk_only, compiled.cjk_only)
+        
+        # 雙陣列字典樹另存一個快取檔
+        compact = self.cache.get_or_compile(fingerprint, factory, compact=True)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(compact.compact)
+        self.assertFalse(loaded.compact)
+        self.assertEqual(compact.convert(text), compiled.convert(text))
+    
+    def test_evicts_least_recently_used(self):
+        """測試超過上限時刪除最久未使用的快取檔案"""
+        cache = DictionaryCache(self.cache_dir, max_files=2)
+        compiled = CompiledDictionary({'数据': '數據'})
+        keys = [cache.make_key(f"fingerprint-{index}") for index in range(3)]
+        
+        for age, key in zip((300, 200), keys):
+            cache.store(key, compiled)
+            stamp = time.time() - age
+            os.utime(cache.path_for(key), (stamp, stamp))
+        # 載入視為使用：第一個檔案變成最近使用
+        self.assertIsNotNone(cache.load(keys[0]))
+        cache.store(keys[2], compiled)
+        
+        self.assertTrue(cache.path_for(keys[0]).exists())
+        self.assertFalse(cache.path_for(keys[1]).exists())
+        self.assertTrue(cache.path_for(keys[2]).exists())
+    
+    def test_corrupted_file_ignored(self):
+        """測試損壞的快取檔案會被忽略"""
+        key = self.cache.make_key(self.mapping_manager.get_fingerprint())
+        self.cache.path_for(key).write_bytes(b'broken')
+        
+        self.assertIsNone(self.cache.load(key))
+    
+    def test_converter_uses_cache(self):
+        """測試轉換器透過快取編譯字典"""
+        converter = ChineseConverter(self.mapping_manager, dict_cache=self.cache)
+        self.mapping_manager.add_custom_mapping("快取词", "快取詞")
+        
+        converted, count = converter.convert_text("快取词")
+        self.assertEqual(converted, "快取詞")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)  # 增量更新不重新編譯
+        
+        ChineseConverter(self.mapping_manager, dict_cache=self.cache)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試字典最佳化
+"""
+
+import unittest
+import tempfile
+import random
+import sys
+import os
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from builtin_dict import read_mapping_source, write_mapping_source
+from dict_optimizer import find_mismatches, optimize_mappings, verification_texts
+from mappings import MappingManager
+from matcher import CompiledDictionary
+
+
+class TestOptimizeMappings(unittest.TestCase):
+    """測試 optimize_mappings"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {
+            '数': '數', '据': '據', '库': '庫', '安': '安', '全': '全',
+            '数据': '數據', '数据库': '資料庫', '安全': '安全', '全数': '全數', '据库': '據庫'
+        }
+
+    def test_removed_categories(self):
+        """測試各類別的移除結果"""
+        optimization = optimize_mappings(self.mappings)
+
+        self.assertEqual(sorted(optimization.identity_chars), ['全', '安'])
+        # 「全数」延伸超過「安全」的結尾，「数据」又延伸超過「全数」的結尾，兩者都必須保留
+        self.assertEqual(optimization.identity_phrases, [])
+        # 「据库」延伸超過「数据」的結尾，「据库」移除後「数据」才可以移除
+        self.assertEqual(optimization.charwise_phrases, ['数据', '据库'])
+        self.assertEqual(optimization.removed, 4)
+        self.assertEqual(optimization.matcher_phrases, (5, 3))
+        self.assertLess(optimization.matcher_size[1], optimization.matcher_size[0])
+
+    def test_preserve_counts(self):
+        """測試保持轉換次數時只移除對應自己的映射"""
+        mappings = dict(self.mappings)
+        del mappings['全数']
+        optimization = optimize_mappings(mappings, preserve_counts=True)
+
+        self.assertEqual(optimization.identity_phrases, ['安全'])
+        self.assertEqual(optimization.charwise_phrases, [])
+        self.assertEqual(find_mismatches(
+            mappings, optimization.mappings, verification_texts(mappings), compare_counts=True
+        ), [])
+
+    def test_random_dictionaries_keep_output(self):
+        """測試隨機字典最佳化後轉換結果不變"""
+        rng = random.Random(24)
+        chars = '甲乙丙丁戊'
+        for _ in range(200):
+            mappings = {char: rng.choice([char, '子', '丑']) for char in chars if rng.random() < 0.6}
+            for _ in range(rng.randint(1, 10)):
+                key = ''.join(rng.choice(chars) for _ in range(rng.randint(2, 4)))
+                choice = rng.random()
+                if choice < 0.4:
+                    mappings[key] = key
+                elif choice < 0.8:
+                    mappings[key] = ''.join(mappings.get(char, char) for char in key)
+                else:
+                    mappings[key] = ''.join(rng.choice(chars + '子丑') for _ in key)
+
+            optimized = optimize_mappings(mappings).mappings
+            texts = [
+                ('', ''.join(rng.choice(chars + 'x') for _ in range(rng.randint(1, 12))))
+                for _ in range(20)
+            ]
+            self.assertEqual(find_mismatches(mappings, optimized, texts), [], mappings)
+
+    def test_builtin_dictionary(self):
+        """測試內建映射最佳化後與原始映射的轉換結果相同"""
+        mappings = MappingManager().get_all_mappings()
+        optimization = optimize_mappings(mappings)
+
+        self.assertGreater(optimization.removed, 0)
+        self.assertEqual(find_mismatches(mappings, optimization.mappings, verification_texts(mappings)), [])
+        # 編譯時自動移除的詞彙與保持轉換次數的最佳化相同
+        preserved = optimize_mappings(mappings, preserve_counts=True)
+        self.assertEqual(CompiledDictionary(mappings).pruned_count, len(preserved.identity_phrases))
+
+    def test_write_mapping_source(self):
+        """測試寫出的映射原始檔可讀回相同映射"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = Path(temp_dir) / 'optimized.txt'
+            count = write_mapping_source(self.mappings, target, header="測試\n\n第三行")
+
+            self.assertEqual(count, len(self.mappings))
+            with open(target, 'r', encoding='utf-8') as f:
+                self.assertEqual(read_mapping_source(f), self.mappings)
+
+
+if __name__ == '__main__':
+    unittest.main()
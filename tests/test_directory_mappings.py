@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試目錄層級的自定義映射
+"""
+
+import unittest
+import tempfile
+import shutil
+import sys
+import os
+from pathlib import Path
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from converter import ChineseConverter
+from directory_mappings import DirectoryMappings
+from mappings import MappingManager
+
+
+class TestDirectoryMappings(unittest.TestCase):
+    """測試 DirectoryMappings 類"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.root = Path(tempfile.mkdtemp())
+        self.base_manager = MappingManager()
+        self.base_converter = ChineseConverter(self.base_manager)
+        self.directory_mappings = DirectoryMappings(self.base_converter, ChineseConverter)
+        self.write_layer("", "项目:專案\n")
+        self.write_layer("a", "项目:項目組\n自定义词:自定義詞\n")
+
+    def tearDown(self):
+        """清理測試環境"""
+        self.directory_mappings.clear()
+        shutil.rmtree(self.root)
+
+    def write_layer(self, relative: str, content: str):
+        """在目錄中寫入映射檔"""
+        directory = self.root / relative
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "codebridge_custom.txt").write_text(content, encoding='utf-8')
+
+    def convert(self, relative: str, text: str) -> str:
+        """以目錄適用的轉換器轉換文本"""
+        converter = self.directory_mappings.converter_for(self.root / relative, self.root)
+        self.assertIsNotNone(converter)
+        return converter.convert_text(text)[0]
+
+    def test_nearest_layer_wins(self):
+        """測試距離最近的映射檔優先，且映射檔套用到整個子樹"""
+        self.assertEqual(self.convert("a/b", "项目自定义词"), "項目組自定義詞")
+        self.assertEqual(self.convert("", "项目"), "專案")
+        sibling = self.convert("c", "项目自定义词")
+        self.assertTrue(sibling.startswith("專案"))
+        self.assertNotIn("自定義", sibling)
+
+    def test_shared_stacks(self):
+        """測試映射層相同的目錄共用同一個轉換器"""
+        for index in range(20):
+            (self.root / "a" / f"sub{index}" / "deep").mkdir(parents=True)
+            self.directory_mappings.converter_for(self.root / "a" / f"sub{index}" / "deep", self.root)
+        self.directory_mappings.converter_for(self.root / "c", self.root)
+
+        stats = self.directory_mappings.get_stats()
+        self.assertEqual(stats['layers'], 2)
+        self.assertEqual(stats['compiled'], 2)
+        self.assertEqual(stats['hits'], 19)
+
+    def test_without_layers(self):
+        """測試沒有映射檔的目錄使用基底轉換器"""
+        (self.root / "codebridge_custom.txt").unlink()
+        self.assertIsNone(self.directory_mappings.converter_for(self.root / "c", self.root))
+        # 空的映射檔不算映射層
+        self.write_layer("c", "# 只有註解\n")
+        self.directory_mappings.refresh()
+        self.assertIsNone(self.directory_mappings.converter_for(self.root / "c", self.root))
+
+    def test_outside_root_ignored(self):
+        """測試不讀取專案根目錄以外的映射檔"""
+        self.directory_mappings.refresh()
+        project = self.root / "a" / "project"
+        project.mkdir()
+        self.assertIsNone(self.directory_mappings.converter_for(project / "src", project))
+
+    def test_layer_change_after_refresh(self):
+        """測試映射檔變更後重新掃描即使用新的映射"""
+        self.assertEqual(self.convert("a", "项目"), "項目組")
+        self.write_layer("a", "项目:項目群組\n")
+        self.directory_mappings.refresh()
+        self.assertEqual(self.convert("a", "项目"), "項目群組")
+
+    def test_same_result_as_full_compile(self):
+        """測試複製基底字典再套用映射層的結果與完整編譯相同"""
+        self.write_layer("a", "项目:項目組\n自定义词:自定義詞\n数:数\n")
+        self.directory_mappings.refresh()
+        converter = self.directory_mappings.converter_for(self.root / "a", self.root)
+        full = ChineseConverter(converter.mapping_manager)
+
+        text = "项目数据库自定义词测试"
+        self.assertEqual(converter.convert_text(text), full.convert_text(text))
+        # 基底轉換器的字典不受影響
+        self.assertEqual(self.base_converter.convert_text("项目")[0], "項目")
+
+    def test_refresh_prunes_removed_layers(self):
+        """測試重新掃描時捨棄已刪除目錄的映射層與轉換器"""
+        self.convert("a", "项目")
+        self.convert("c", "项目")
+        shutil.rmtree(self.root / "a")
+        self.directory_mappings.refresh()
+
+        self.assertEqual(len(self.directory_mappings._layers), 1)
+        self.assertEqual(len(self.directory_mappings._converters), 1)
+        self.assertEqual(self.convert("c", "项目"), "專案")
+
+    def test_engine_stats(self):
+        """測試引擎使用次數包含已淘汰的轉換器"""
+        directory_mappings = DirectoryMappings(self.base_converter, ChineseConverter, max_stacks=1)
+        directory_mappings.converter_for(self.root / "a", self.root).convert_text("项目")
+        directory_mappings.converter_for(self.root / "c", self.root).convert_text("项目")
+
+        self.assertEqual(sum(directory_mappings.get_engine_stats().values()), 2)
+        directory_mappings.clear()
+
+    def test_base_mappings_change(self):
+        """測試基底映射變更後重新編譯，且映射檔優先於基底映射"""
+        self.base_manager.update_custom_mappings({'自定义词': '基底詞', '测试': '測驗'})
+        self.assertEqual(self.convert("a", "自定义词测试"), "自定義詞測驗")
+        self.assertEqual(self.convert("", "自定义词"), "基底詞")
+        self.assertEqual(self.directory_mappings.get_stats()['compiled'], 2)
+
+    def test_eviction(self):
+        """測試超過上限時淘汰最久未使用的映射組合"""
+        directory_mappings = DirectoryMappings(self.base_converter, ChineseConverter, max_stacks=1)
+        directory_mappings.converter_for(self.root / "a", self.root)
+        directory_mappings.converter_for(self.root / "c", self.root)
+        directory_mappings.converter_for(self.root / "a", self.root)
+
+        stats = directory_mappings.get_stats()
+        self.assertEqual(stats['compiled'], 3)
+        self.assertEqual(stats['evictions'], 2)
+        directory_mappings.clear()
+
+
+class TestUpdateCustomMappings(unittest.TestCase):
+    """測試 MappingManager.update_custom_mappings"""
+
+    def test_bulk_update(self):
+        """測試一次加入多個映射只遞增一次版本"""
+        manager = MappingManager()
+        version = manager.get_version()
+        count = manager.update_custom_mappings({'测试词汇甲': '測試詞彙甲', '测试词汇乙': '測試詞彙乙', '': '空'})
+
+        self.assertEqual(count, 2)
+        self.assertEqual(manager.get_version(), version + 1)
+        self.assertEqual(manager.search_mappings('词汇甲'), [('测试词汇甲', '測試詞彙甲')])
+        self.assertEqual(manager.update_custom_mappings({}), 0)
+        self.assertEqual(manager.get_version(), version + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試雙陣列字典樹
+"""
+
+import marshal
+import random
+import unittest
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from double_array import DoubleArrayTrie
+
+
+class TestDoubleArrayTrie(unittest.TestCase):
+    """測試 DoubleArrayTrie 類"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {
+            '数据': '數據', '数据库': '資料庫', '软件': '軟體', '软件开发': '軟體開發', '安全': '安全'
+        }
+        self.trie = DoubleArrayTrie(self.mappings)
+
+    def test_lookup(self):
+        """測試查詢與列出詞彙"""
+        self.assertEqual(len(self.trie), 5)
+        self.assertEqual(self.trie.get('数据库'), '資料庫')
+        self.assertIsNone(self.trie.get('数'))
+        self.assertNotIn('软', self.trie)
+        self.assertIn('安全', self.trie)
+        self.assertEqual(dict(self.trie.items()), self.mappings)
+        self.assertEqual(sorted(self.trie.start_chars), ['安', '数', '软'])
+
+    def test_longest_and_prefixes(self):
+        """測試最長比對與所有字首比對"""
+        text = "x数据库软件开发"
+        self.assertEqual(self.trie.longest_at(text, 1), (4, '数据库', '資料庫'))
+        self.assertEqual(self.trie.prefixes_at(text, 1), [(3, '数据'), (4, '数据库')])
+        self.assertEqual(self.trie.longest_at(text, 4), (8, '软件开发', '軟體開發'))
+        self.assertIsNone(self.trie.longest_at(text, 0))
+
+    def test_state_round_trip(self):
+        """測試以原始位元組序列化後還原"""
+        self.trie.insert('网络', '網路')
+        self.trie.remove('安全')
+        state = marshal.loads(marshal.dumps(self.trie.to_state()))
+        restored = DoubleArrayTrie.from_state(state)
+
+        self.assertTrue(all(isinstance(part, (bytes, str, int)) for part in state))
+        self.assertEqual(dict(restored.items()), dict(self.trie.items()))
+        self.assertEqual(restored.get('网络'), '網路')
+        self.assertNotIn('安全', restored)
+
+    def test_incremental_updates_match_dict(self):
+        """測試大量增量加入、更新與移除後與 dict 一致（包含新字元與節點搬移）"""
+        rng = random.Random(7)
+        alphabet = '数据库软件开发安全网络'
+        expected = dict(self.mappings)
+
+        for step in range(500):
+            key = ''.join(rng.choice(alphabet + 'xyz') for _ in range(rng.randint(1, 5)))
+            if rng.random() < 0.2:
+                self.assertEqual(self.trie.remove(key), expected.pop(key, None) is not None)
+            else:
+                value = f"{key}{step}"
+                self.assertEqual(self.trie.insert(key, value), key not in expected)
+                expected[key] = value
+
+        self.assertEqual(len(self.trie), len(expected))
+        self.assertEqual(dict(self.trie.items()), expected)
+        for key, value in expected.items():
+            self.assertEqual(self.trie.get(key), value)
+
+
+if __name__ == "__main__":
+    unittest.main()
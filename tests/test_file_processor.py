@@ -9,6 +9,7 @@ import tempfile
 import os
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # 添加 src 目錄到路徑
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -60,6 +61,24 @@ class TestFileProcessor(unittest.TestCase):
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_process_file_without_chinese(self):
+        """測試不含中文的檔案快速略過"""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8', suffix='.py') as f:
+            f.write("def main():\n    return 0\n")
+            temp_file = Path(f.name)
+        
+        try:
+            result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            
+            self.assertTrue(result.early_exit)
+            self.assertFalse(result.processed)
+            self.assertEqual(result.conversions, 0)
+            self.assertIsNone(result.error)
+            
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
     def test_process_file_preview_mode(self):
         """測試預覽模式處理檔案"""
         # 創建臨時檔案
@@ -109,6 +128,122 @@ class TestFileProcessor(unittest.TestCase):
             if temp_file.exists():
                 temp_file.unlink()
     
+    def test_process_large_file_streaming(self):
+        """測試超過大小限制的檔案以串流方式轉換"""
+        test_content = "数据库连接失败\r\n软件开发\n" * 50
+        self.config.set_config("max_file_size", 64)
+        self.config.set_config("stream_chunk_size", 10)
+        
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8', suffix='.txt',
+                                         newline='') as f:
+            f.write(test_content)
+            temp_file = Path(f.name)
+        
+        try:
+            preview = self.file_processor.process_file(temp_file, self.converter, preview_mode=True)
+            result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            expected, count = self.converter.convert_text(test_content)
+            
+            self.assertIsNone(result.error)
+            self.assertTrue(result.processed)
+            self.assertEqual(result.conversions, count)
+            self.assertEqual(preview.conversions, count)
+            with open(temp_file, 'r', encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), expected)
+            
+            # 停用串流時維持原本的大小限制
+            self.config.set_config("stream_large_files", False)
+            result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            self.assertIn("檔案過大", result.error)
+            
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def test_process_file_bytes(self):
+        """測試 UTF-8 檔案以位元組轉換並保留換行符號，其他編碼改走文字路徑"""
+        test_content = "数据库连接失败\r\n软件开发\r\n"
+        expected, count = self.converter.convert_text(test_content)
+        
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+            f.write(test_content.encode('utf-8'))
+            utf8_file = Path(f.name)
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+            f.write(test_content.encode('gbk'))
+            gbk_file = Path(f.name)
+        
+        try:
+            result = self.file_processor.process_file(utf8_file, self.converter, preview_mode=False)
+            self.assertTrue(result.processed)
+            self.assertEqual(result.conversions, count)
+            self.assertEqual(utf8_file.read_bytes(), expected.encode('utf-8'))
+            
+            result = self.file_processor.process_file(gbk_file, self.converter, preview_mode=False)
+            self.assertTrue(result.processed)
+            self.assertEqual(result.conversions, count)
+            self.assertIn("數據庫", gbk_file.read_text(encoding='utf-8'))
+            
+        finally:
+            for temp_file in (utf8_file, gbk_file):
+                if temp_file.exists():
+                    temp_file.unlink()
+    
+    def test_process_file_inplace(self):
+        """測試位元組長度不變時原地修改，長度改變時自動改為重寫"""
+        self.config.set_config("write_mode", "inplace")
+        test_content = "# 数据库连接失败\nprint('软件开发')\n"
+        
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+            f.write(test_content.encode('utf-8'))
+            temp_file = Path(f.name)
+        
+        try:
+            expected, count = self.converter.convert_text(test_content)
+            self.assertIsNotNone(self.converter.find_byte_patches(test_content.encode('utf-8')))
+            result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            
+            self.assertTrue(result.processed)
+            self.assertEqual(result.conversions, count)
+            self.assertEqual(temp_file.read_bytes(), expected.encode('utf-8'))
+            
+            # 單字轉為詞彙會改變長度
+            self.mapping_manager.add_custom_mapping("网", "網路")
+            temp_file.write_bytes("网".encode('utf-8'))
+            self.assertIsNone(self.converter.find_byte_patches(temp_file.read_bytes()))
+            result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            
+            self.assertTrue(result.processed)
+            self.assertEqual(temp_file.read_bytes(), "網路".encode('utf-8'))
+            
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
+    def test_inplace_opens_for_writing_only_when_needed(self):
+        """測試原地修改模式下不需轉換的檔案只以唯讀方式開啟"""
+        self.config.set_config("write_mode", "inplace")
+        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.txt') as f:
+            f.write("# 資料庫連線失敗\n".encode('utf-8'))
+            temp_file = Path(f.name)
+        
+        try:
+            with patch('file_processor.open', wraps=open, create=True) as opened:
+                result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            self.assertIsNone(result.error)
+            self.assertFalse(result.processed)
+            self.assertNotIn('r+b', [call.args[1] for call in opened.call_args_list])
+            
+            temp_file.write_bytes("# 数据库连接失败\n".encode('utf-8'))
+            with patch('file_processor.open', wraps=open, create=True) as opened:
+                result = self.file_processor.process_file(temp_file, self.converter, preview_mode=False)
+            self.assertTrue(result.processed)
+            self.assertIn('r+b', [call.args[1] for call in opened.call_args_list])
+            self.assertEqual(temp_file.read_bytes(),
+                             self.converter.convert_text("# 数据库连接失败\n")[0].encode('utf-8'))
+        finally:
+            if temp_file.exists():
+                temp_file.unlink()
+    
     def test_process_nonexistent_file(self):
         """測試處理不存在的檔案"""
         nonexistent_file = Path("/nonexistent/file.txt")
@@ -6,6 +6,7 @@
 
 import unittest
 import tempfile
+from unittest.mock import patch
 import os
 import sys
 
@@ -14,7 +15,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 src_dir = os.path.join(os.path.dirname(current_dir), 'src')
 sys.path.insert(0, src_dir)
 
-from mappings import MappingManager
+from mappings import MappingIssue, MappingManager
 
 
 class TestMappingManager(unittest.TestCase):
@@ -108,6 +109,64 @@ class TestMappingManager(unittest.TestCase):
             # 清理臨時檔案
             os.unlink(temp_file)
     
+    def test_bulk_load_report(self):
+        """測試批量載入的驗證與重複、衝突、覆蓋報告（含行號）"""
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8') as f:
+            f.write("# 術語表\n")                  # 1
+            f.write("词汇表:詞彙表\n")              # 2
+            f.write("软件:軟體\n")                  # 3
+            f.write("\n")                           # 4
+            f.write("词汇表:詞彙表\n")              # 5 重複
+            f.write("  分组 : 分組  \n")            # 6 含空白
+            f.write("词汇表:辭彙表\n")              # 7 衝突
+            f.write("无冒号\n")                     # 8 格式錯誤
+            f.write("abc:def\n")                    # 9 不含中文
+            f.write("长" * 51 + ":長\n")            # 10 過長
+            f.write("网址:http://例子\n")           # 11 值含冒號
+            temp_file = f.name
+
+        try:
+            version = self.mapping_manager.get_version()
+            report = self.mapping_manager.bulk_load_custom_mappings(temp_file)
+        finally:
+            os.unlink(temp_file)
+
+        self.assertEqual(report.entries, 6)
+        self.assertEqual(report.loaded, 4)
+        self.assertEqual([issue.line for issue in report.invalid], [8, 9, 10])
+        self.assertEqual(report.duplicates, [MappingIssue(5, "词汇表", "與第 2 行重複")])
+        self.assertEqual([(issue.line, issue.simplified) for issue in report.conflicts], [(7, "词汇表")])
+        self.assertEqual([(issue.line, issue.simplified) for issue in report.overrides], [(3, "软件")])
+
+        # 整個檔案只遞增一次版本
+        self.assertEqual(self.mapping_manager.get_version(), version + 1)
+        custom_mappings = self.mapping_manager.get_custom_mappings()
+        self.assertEqual(custom_mappings, {
+            "词汇表": "辭彙表", "软件": "軟體", "分组": "分組", "网址": "http://例子"
+        })
+
+    def test_bulk_load_large_file(self):
+        """測試大型檔案跨批次的重複偵測，以及超過變更紀錄上限時要求完整重建"""
+        self.mapping_manager.MAX_CHANGE_LOG = 100
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, encoding='utf-8') as f:
+            for index in range(30000):
+                f.write(f"词{index}:詞{index}\n")
+            f.write("词7:詞7\n")
+            temp_file = f.name
+
+        try:
+            with patch('mappings.BULK_LOAD_BATCH_HINT', 4096):
+                report = self.mapping_manager.bulk_load_custom_mappings(temp_file)
+        finally:
+            os.unlink(temp_file)
+
+        self.assertEqual((report.entries, report.loaded), (30001, 30000))
+        self.assertEqual(report.duplicates, [MappingIssue(30001, "词7", "與第 8 行重複")])
+        self.assertEqual(self.mapping_manager.get_merged_view()["词29999"], "詞29999")
+        self.assertIsNone(self.mapping_manager.get_changes_since(0))
+        current = self.mapping_manager.get_version()
+        self.assertEqual(self.mapping_manager.get_changes_since(current), (current, []))
+
     def test_load_nonexistent_file(self):
         """測試載入不存在的檔案"""
         with self.assertRaises(FileNotFoundError):
@@ -156,6 +215,53 @@ class TestMappingManager(unittest.TestCase):
             self.assertIsInstance(count, int)
             self.assertGreaterEqual(count, 0)
     
+    def test_category_stats_follow_changes(self):
+        """測試分類統計隨映射增減更新，且與重新計算一致"""
+        stats = self.mapping_manager.get_category_stats()
+        self.assertEqual(sum(stats.values()), len(self.mapping_manager.get_merged_view()))
+        
+        self.mapping_manager.add_custom_mapping("测试框架甲", "測試框架甲")
+        self.mapping_manager.add_custom_mapping("软件", "軟體")  # 覆蓋內建映射，數量不變
+        self.mapping_manager.add_custom_mapping("乙", "乙")
+        self.mapping_manager.remove_custom_mapping("软件")
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8', delete=False) as f:
+            f.write("项目流程甲:項目流程甲\n数据:資料\n")
+            path = f.name
+        try:
+            self.mapping_manager.bulk_load_custom_mappings(path)
+        finally:
+            os.unlink(path)
+        
+        updated = self.mapping_manager.get_category_stats()
+        self.assertEqual(updated['科技開發'], stats['科技開發'] + 1)
+        self.assertEqual(updated['業務管理'], stats['業務管理'] + 1)
+        self.assertEqual(updated['基本字符'], stats['基本字符'] + 1)
+        self.assertEqual(updated, self._rebuilt_manager().get_category_stats())
+        
+        self.mapping_manager.remove_custom_mapping("测试框架甲")
+        self.assertEqual(self.mapping_manager.get_category_stats()['科技開發'], stats['科技開發'])
+    
+    def _rebuilt_manager(self) -> MappingManager:
+        """建立內容相同但尚未計算分類統計的管理器"""
+        manager = MappingManager()
+        for simplified, traditional in self.mapping_manager.get_custom_mappings().items():
+            manager.add_custom_mapping(simplified, traditional)
+        return manager
+    
+    def test_custom_category_keywords(self):
+        """測試自訂分類關鍵字"""
+        manager = MappingManager(category_keywords={'資料': ['数据']})
+        stats = manager.get_category_stats()
+        self.assertEqual(list(stats), ['基本字符', '資料', '專業術語'])
+        self.assertEqual(sum(stats.values()), len(manager.get_merged_view()))
+        self.assertEqual(
+            stats['資料'],
+            sum(1 for simplified in manager.get_merged_view() if len(simplified) > 1 and '数据' in simplified)
+        )
+        
+        manager.set_category_keywords(None)
+        self.assertIn('科技開發', manager.get_category_stats())
+    
     def test_search_mappings(self):
         """測試搜尋映射"""
         # 搜尋包含"软件"的映射
@@ -199,6 +305,91 @@ class TestMappingManager(unittest.TestCase):
             if os.path.exists(temp_file):
                 os.unlink(temp_file)
     
+    def test_version_and_changes(self):
+        """測試映射版本與變更紀錄"""
+        version = self.mapping_manager.get_version()
+        
+        self.mapping_manager.add_custom_mapping("版本测试", "版本測試")
+        self.mapping_manager.add_custom_mapping("软件", "軟體")
+        self.mapping_manager.remove_custom_mapping("软件")
+        
+        current, changes = self.mapping_manager.get_changes_since(version)
+        self.assertEqual(current, version + 3)
+        self.assertEqual(changes, [
+            ("版本测试", "版本測試"),
+            ("软件", "軟體"),
+            ("软件", "軟件"),  # 移除自定義後恢復內建映射
+        ])
+        self.assertEqual(self.mapping_manager.get_changes_since(current), (current, []))
+    
+    def test_snapshot_is_immutable(self):
+        """測試快照不受之後的變更影響"""
+        snapshot = self.mapping_manager.snapshot()
+        self.mapping_manager.add_custom_mapping("快照测试", "快照測試")
+        
+        self.assertIsNone(snapshot.get("快照测试"))
+        self.assertEqual(self.mapping_manager.snapshot().get("快照测试"), "快照測試")
+        with self.assertRaises(TypeError):
+            snapshot.custom["快照测试"] = "x"
+
+    def test_merged_view_cached_by_version(self):
+        """測試合併視圖在同一版本內重複使用，變更後才重建"""
+        view = self.mapping_manager.get_merged_view()
+        self.assertIs(self.mapping_manager.get_merged_view(), view)
+        with self.assertRaises(TypeError):
+            view["视图测试"] = "x"
+
+        self.mapping_manager.add_custom_mapping("软件", "軟體")
+        updated = self.mapping_manager.get_merged_view()
+        self.assertIsNot(updated, view)
+        self.assertIs(self.mapping_manager.get_merged_view(), updated)
+        self.assertEqual(view["软件"], "軟件")
+        self.assertEqual(updated["软件"], "軟體")
+        self.assertEqual(dict(updated), self.mapping_manager.get_all_mappings())
+
+        # get_all_mappings() 仍返回可修改的副本
+        copy = self.mapping_manager.get_all_mappings()
+        copy["软件"] = "x"
+        self.assertEqual(self.mapping_manager.get_merged_view()["软件"], "軟體")
+
+    def test_snapshot_shares_custom_mappings(self):
+        """測試快照與管理器共用自定義映射，第一次修改時才複製"""
+        manager = self.mapping_manager
+        manager.update_custom_mappings({"软件": "軟體", "共享测试": "共享測試"})
+        custom = manager._custom_mappings
+        snapshot = manager.snapshot()
+        self.assertEqual(snapshot.custom, custom)
+
+        manager.add_custom_mapping("写时复制", "寫時複製")
+        self.assertIsNot(manager._custom_mappings, custom)
+        self.assertNotIn("写时复制", snapshot.custom)
+
+        # 沒有快照共用時直接修改，不再複製
+        custom = manager._custom_mappings
+        manager.remove_custom_mapping("共享测试")
+        manager.add_custom_mapping("直接修改", "直接修改")
+        self.assertIs(manager._custom_mappings, custom)
+
+        # 合併視圖不複製映射，內容與順序和合併成 dict 相同
+        expected = dict(manager.get_builtin_mappings())
+        expected.update(custom)
+        view = manager.get_merged_view()
+        self.assertEqual(list(view.items()), list(expected.items()))
+        self.assertEqual(list(view), list(expected))
+        self.assertEqual(len(view), len(expected))
+        self.assertEqual(view["软件"], "軟體")
+        self.assertNotIn("共享测试", view)
+
+    def test_change_log_truncation(self):
+        """測試變更紀錄超過上限時要求完整重建"""
+        self.mapping_manager.MAX_CHANGE_LOG = 4
+        for index in range(6):
+            self.mapping_manager.add_custom_mapping(f"词{index}", f"詞{index}")
+        
+        self.assertIsNone(self.mapping_manager.get_changes_since(0))
+        current, changes = self.mapping_manager.get_changes_since(5)
+        self.assertEqual(changes, [("词5", "詞5")])
+    
     def test_mappings_updated_flag(self):
         """測試映射更新標誌"""
         # 初始狀態應該為False
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試多模式比對引擎
+"""
+
+import unittest
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+import re
+
+import matcher
+from matcher import PhraseMatcher, CompiledDictionary, RegexMatcher, build_trie_pattern
+
+
+class TestPhraseMatcher(unittest.TestCase):
+    """測試 PhraseMatcher 類"""
+
+    def test_longest_match_wins(self):
+        """測試同一位置優先比對最長詞彙"""
+        matcher = PhraseMatcher({'数': '數', '数据': '數據', '数据库': '資料庫'})
+        converted, count = matcher.convert("数据库和数据")
+
+        self.assertEqual(converted, "資料庫和數據")
+        self.assertEqual(count, 2)
+
+    def test_leftmost_match_wins(self):
+        """測試重疊時優先比對最左邊的詞彙"""
+        matcher = PhraseMatcher({'ab': 'X', 'bcd': 'Y', 'd': 'Z'})
+        matches = list(matcher.finditer("abcd"))
+
+        self.assertEqual(matches, [(0, 2, 'ab', 'X'), (3, 4, 'd', 'Z')])
+
+    def test_longer_match_found_after_shorter(self):
+        """測試較晚結束但開始較早的長詞彙優先"""
+        matcher = PhraseMatcher({'bc': 'X', 'abcd': 'Y'})
+        converted, count = matcher.convert("zabcdz")
+
+        self.assertEqual(converted, "zYz")
+        self.assertEqual(count, 1)
+
+    def test_output_not_rescanned(self):
+        """測試已轉換的內容不會被其他映射再次改寫"""
+        matcher = PhraseMatcher({'后': '後', '後面': '背後'})
+        converted, count = matcher.convert("后面")
+
+        self.assertEqual(converted, "後面")
+        self.assertEqual(count, 1)
+
+    def test_identity_mapping_not_counted(self):
+        """測試相同字詞的映射不計入轉換次數但會保護該詞彙"""
+        matcher = PhraseMatcher({'程序': '程序', '程': 'X'})
+        converted, count = matcher.convert("程序")
+
+        self.assertEqual(converted, "程序")
+        self.assertEqual(count, 0)
+
+    def test_no_match(self):
+        """測試沒有比對結果時返回原文本"""
+        matcher = PhraseMatcher({'数据': '數據'})
+        text = "Hello World"
+        converted, count = matcher.convert(text)
+
+        self.assertIs(converted, text)
+        self.assertEqual(count, 0)
+
+    def test_matches_brute_force(self):
+        """測試結果與逐位置最長比對一致"""
+        mappings = {'a': '1', 'ab': '2', 'abc': '3', 'bca': '4', 'cab': '5', 'ca': '6'}
+        matcher = PhraseMatcher(mappings)
+
+        def brute_force(text):
+            result, position = [], 0
+            while position < len(text):
+                for length in range(3, 0, -1):
+                    key = text[position:position + length]
+                    if len(key) == length and key in mappings:
+                        result.append((position, position + length, key, mappings[key]))
+                        position += length
+                        break
+                else:
+                    position += 1
+            return result
+
+        for text in ["abcabca", "cabcab", "bcabcabc", "aaabbbccc", "cacbca"]:
+            self.assertEqual(list(matcher.finditer(text)), brute_force(text))
+
+    
+    def test_trie_pattern_longest_match(self):
+        """測試字首樹正則表達式同樣以最左最長規則比對"""
+        keys = ['a', 'ab', 'abc', 'bca', 'cab', 'ca']
+        matcher = PhraseMatcher({key: key.upper() for key in keys})
+        pattern = re.compile(build_trie_pattern(keys))
+        
+        for text in ["abcabca", "cabcab", "bcabcabc", "aaabbbccc", "cacbca"]:
+            self.assertEqual([m.span() for m in pattern.finditer(text)],
+                             [match[:2] for match in matcher.finditer(text)])
+
+    def test_regex_matcher_same_as_automaton(self):
+        """測試正則表達式比對器與自動機轉換結果相同（對應自己的詞彙不計次數）"""
+        mappings = {'a': 'A', 'ab': 'ab', 'abc': 'XYZ', 'bca': 'Q', 'ca': 'C'}
+        matcher = PhraseMatcher(mappings)
+        regex = RegexMatcher(mappings.items())
+
+        for text in ["abcabca", "cabcab", "bcabcabc", "aaabbbccc", "", "xyz"]:
+            self.assertEqual(regex.convert(text), matcher.convert(text))
+
+
+class TestCompiledDictionary(unittest.TestCase):
+    """測試 CompiledDictionary 類"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {
+            '数': '數', '据': '據', '库': '庫', '安': '安',
+            '数据': '數據', '数据库': '資料庫', '安全': '安全'
+        }
+        self.compiled = CompiledDictionary(self.mappings)
+
+    def test_phrase_boundaries(self):
+        """測試邊界位置不會落在任何詞彙中間"""
+        text = 'a数据库b数据'
+        self.assertEqual(self.compiled.boundary_before(text, 3), 1)
+        self.assertEqual(self.compiled.boundary_after(text, 3), 4)
+        self.assertEqual(self.compiled.boundary_before(text, 4), 4)
+        self.assertEqual(self.compiled.boundary_after(text, 6), 7)
+        self.assertEqual(self.compiled.boundary_after(text, 7), 7)
+
+    def test_char_table_skips_identity(self):
+        """測試單字轉換表不包含對應自己的字元"""
+        self.assertIn(ord('数'), self.compiled.char_table)
+        self.assertNotIn(ord('安'), self.compiled.char_table)
+        self.assertNotIn('数', self.compiled.phrase_matcher)
+        self.assertIn('数据库', self.compiled.phrase_matcher)
+
+    def test_char_only_text(self):
+        """測試只有單字轉換的文本"""
+        converted, count = self.compiled.convert("库和据")
+
+        self.assertEqual(converted, "庫和據")
+        self.assertEqual(count, 2)
+
+    def test_phrase_priority(self):
+        """測試詞彙優先於單字轉換"""
+        converted, count = self.compiled.convert("数据库、数据、数")
+
+        self.assertEqual(converted, "資料庫、數據、數")
+        self.assertEqual(count, 3)
+
+    def test_same_result_as_automaton(self):
+        """測試與完整自動機的轉換結果一致"""
+        matcher = PhraseMatcher(self.mappings)
+        for text in ["数据库安全数据", "安全数库据", "数数据据库库", "无关内容"]:
+            self.assertEqual(self.compiled.convert(text), matcher.convert(text))
+    
+    def test_compact_same_result(self):
+        """測試雙陣列字典樹的轉換結果、增量變更與狀態還原都與預設相同"""
+        compact = CompiledDictionary(self.mappings, compact=True)
+        self.assertTrue(compact.compact)
+        self.assertFalse(self.compiled.compact)
+        
+        changes = [('据库', '據庫'), ('数据', None), ('全数', '全數')]
+        compact.apply_changes(changes)
+        self.compiled.apply_changes(changes)
+        restored = CompiledDictionary.from_state(compact.to_state())
+        self.assertTrue(restored.compact)
+        
+        for text in ["数据库安全数据", "安全数库据", "数数据据库库", "无关内容"]:
+            expected = self.compiled.convert(text)
+            self.assertEqual(compact.convert(text), expected)
+            self.assertEqual(restored.convert(text), expected)
+        self.assertEqual(sorted(compact.items()), sorted(self.compiled.items()))
+
+    def test_copy(self):
+        """測試副本的增量變更不影響原字典"""
+        for compact in (False, True):
+            original = CompiledDictionary(self.mappings, compact=compact)
+            expected = original.convert("数据库安全数据")
+            copied = original.copy()
+            copied.apply_changes([('数据', '資料'), ('安', '鞍'), ('据库', None)])
+
+            self.assertEqual(copied.compact, compact)
+            self.assertEqual(copied.convert("数据安"), ("資料鞍", 2))
+            self.assertEqual(original.convert("数据库安全数据"), expected)
+
+    def test_convert_joined(self):
+        """測試串接轉換的各文本結果與逐一轉換相同"""
+        texts = ["数据库安全数据", "", "安全", "数", "无关内容", "据库"]
+        
+        self.assertEqual(self.compiled.convert_joined(texts, '\x00'),
+                         [self.compiled.convert(text) for text in texts])
+    
+    def test_convert_joined_large_dictionary(self):
+        """測試大型字典以字典樹比對串接文本，不編譯整個字典的正則表達式"""
+        texts = ["数据库安全数据", "", "安全", "数", "无关内容", "据库", "数据库存"]
+        original_limit = matcher.JOINED_REGEX_MAX_PHRASES
+        matcher.JOINED_REGEX_MAX_PHRASES = 0
+        try:
+            for compiled in (self.compiled, CompiledDictionary({'数据': '數據', '安全': '安全'})):
+                self.assertEqual(compiled.convert_joined(texts, '\x00'),
+                                 [compiled.convert(text) for text in texts])
+                self.assertIsNone(compiled._joined_tables)
+            
+            self.compiled.set('库存', '庫存')
+            self.compiled.segmentation = 'optimal'
+            self.assertEqual(self.compiled.convert_joined(texts, '\x00'),
+                             [self.compiled.convert(text) for text in texts])
+        finally:
+            matcher.JOINED_REGEX_MAX_PHRASES = original_limit
+    
+    def test_optimal_segmentation(self):
+        """測試最佳切分選擇段數最少的詞彙組合"""
+        compiled = CompiledDictionary({
+            '数': '數', '据': '據', '库': '庫', '存': '存',
+            '数据': '數據', '数据库': '資料庫', '据库存': '據庫存', '库存': '庫存'
+        })
+        self.assertEqual(compiled.convert("数据库存"), ("資料庫存", 1))
+        
+        compiled.segmentation = 'optimal'
+        # 「資料庫｜存」與「數據｜庫存」同為兩段，後者沒有未轉換的單字
+        self.assertEqual(compiled.convert("数据库存"), ("數據庫存", 2))
+        self.assertEqual(compiled.convert("数据库，数据"), ("資料庫，數據", 2))
+    
+    def test_prunes_redundant_identity_phrases(self):
+        """測試編譯時移除不影響結果的對應自己詞彙"""
+        plain = CompiledDictionary(self.mappings, optimize=False)
+        self.assertEqual(self.compiled.pruned_count, 1)
+        self.assertNotIn('安全', self.compiled.phrase_matcher)
+        for text in ["数据库安全数据", "安全数库据", "安全", "无关内容"]:
+            self.assertEqual(self.compiled.convert(text), plain.convert(text))
+            self.assertEqual(self.compiled.tally(text), plain.tally(text))
+        
+        # 「全数」從「安全」的第二個字開始並延伸超過結尾，「安全」不可移除
+        compiled = CompiledDictionary(dict(self.mappings, 全数='全數'))
+        self.assertEqual(compiled.pruned_count, 0)
+        self.assertEqual(compiled.convert("安全数据"), ("安全數據", 1))
+    
+    def test_pruned_phrases_restored(self):
+        """測試增量變更、改用最佳切分與快取還原時保留移除的詞彙"""
+        restored = CompiledDictionary.from_state(self.compiled.to_state())
+        self.assertEqual(restored.pruned_count, 1)
+        
+        self.compiled.set('全数', '全數')
+        self.assertEqual(self.compiled.pruned_count, 0)
+        self.assertEqual(self.compiled.convert("安全数据"), ("安全數據", 1))
+        
+        restored.segmentation = 'optimal'
+        self.assertEqual(restored.pruned_count, 0)
+        self.assertIn('安全', restored.phrase_matcher)
+    
+    def test_optimal_segmentation_matches_brute_force(self):
+        """測試最佳切分的段數與窮舉結果相同"""
+        mappings = {'a': '1', 'ab': '2', 'abc': '3', 'bca': '4', 'cab': '5', 'ca': '6', 'bc': '7'}
+        compiled = CompiledDictionary(mappings)
+        compiled.segmentation = 'optimal'
+        
+        def fewest_segments(text):
+            best = [0] + [len(text) + 1] * len(text)
+            for end in range(1, len(text) + 1):
+                for length in range(1, min(end, 3) + 1):
+                    piece = text[end - length:end]
+                    if length == 1 or piece in mappings:
+                        best[end] = min(best[end], best[end - length] + 1)
+            return best[-1]
+        
+        for text in ["abcabca", "cabcab", "bcabcabc", "aaabbbccc", "cacbca"]:
+            phrases = list(compiled.iter_phrases(text))
+            singles = len(text) - sum(end - start for start, end, _, _ in phrases)
+            self.assertEqual(len(phrases) + singles, fewest_segments(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
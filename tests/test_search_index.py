@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+測試映射搜尋索引
+"""
+
+import unittest
+import random
+import sys
+import os
+
+# 添加 src 目錄到路徑
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.insert(0, src_dir)
+
+from mappings import MappingManager
+from search_index import MappingSearchIndex
+
+
+def linear_search(mappings, keyword, prefix=False):
+    """逐項掃描的參考實作"""
+    if prefix:
+        matched = sorted(item for item in mappings.items() if item[0].startswith(keyword))
+        matched += sorted(
+            ((simplified, traditional) for simplified, traditional in mappings.items()
+             if traditional.startswith(keyword) and not simplified.startswith(keyword)),
+            key=lambda item: (item[1], item[0])
+        )
+        return matched
+    return sorted(item for item in mappings.items() if keyword in item[0] or keyword in item[1])
+
+
+class TestMappingSearchIndex(unittest.TestCase):
+    """測試 MappingSearchIndex 類"""
+
+    def setUp(self):
+        """設置測試環境"""
+        self.mappings = {
+            '数据': '資料', '数据库': '資料庫', '数据结构': '資料結構',
+            '软件': '軟體', '软件包': '軟體套件', '硬件': '硬體', '库': '庫',
+        }
+        self.index = MappingSearchIndex(self.mappings)
+
+    def test_substring(self):
+        """測試子字串查詢"""
+        self.assertEqual(self.index.search('件'), linear_search(self.mappings, '件'))
+        self.assertEqual(self.index.search('資料'), linear_search(self.mappings, '資料'))
+        self.assertEqual(self.index.search('据结构'), [('数据结构', '資料結構')])
+        self.assertEqual(self.index.search('不存在'), [])
+        self.assertEqual(len(self.index.search('')), len(self.mappings))
+
+    def test_prefix(self):
+        """測試字首查詢"""
+        self.assertEqual(self.index.search('数据', prefix=True),
+                         [('数据', '資料'), ('数据库', '資料庫'), ('数据结构', '資料結構')])
+        self.assertEqual(self.index.search('軟體', prefix=True),
+                         [('软件', '軟體'), ('软件包', '軟體套件')])
+        self.assertEqual(self.index.search('库', prefix=True), [('库', '庫')])
+        self.assertEqual(self.index.search('件', prefix=True), [])
+
+    def test_limit(self):
+        """測試筆數上限"""
+        self.assertEqual(self.index.search('数据', limit=2), [('数据', '資料'), ('数据库', '資料庫')])
+        self.assertEqual(self.index.search('数据', prefix=True, limit=1), [('数据', '資料')])
+        self.assertEqual(self.index.search('数据', limit=0), [])
+
+    def test_update(self):
+        """測試逐筆更新"""
+        self.index.update('数据库', '數據庫')
+        self.index.update('软件', None)
+        self.index.update('固件', '韌體')
+        self.mappings['数据库'] = '數據庫'
+        del self.mappings['软件']
+        self.mappings['固件'] = '韌體'
+
+        self.assertEqual(len(self.index), len(self.mappings))
+        for keyword in ('件', '資料', '數據', '体', '韌', '数据', '軟體', '库'):
+            self.assertEqual(self.index.search(keyword), linear_search(self.mappings, keyword))
+            self.assertEqual(self.index.search(keyword, prefix=True),
+                             linear_search(self.mappings, keyword, prefix=True))
+
+    def test_matches_linear_scan(self):
+        """測試隨機資料與逐項掃描結果一致"""
+        rng = random.Random(22)
+        alphabet = '数据库软件硬体軟體資料庫'
+        mappings = {}
+        for _ in range(500):
+            simplified = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+            mappings[simplified] = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+        index = MappingSearchIndex(mappings)
+
+        for _ in range(200):
+            key = rng.choice(list(mappings))
+            if rng.random() < 0.3:
+                del mappings[key]
+                index.update(key, None)
+            else:
+                mappings[key] = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 5)))
+                index.update(key, mappings[key])
+
+        for _ in range(100):
+            keyword = ''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 3)))
+            self.assertEqual(index.search(keyword), linear_search(mappings, keyword))
+            self.assertEqual(index.search(keyword, prefix=True),
+                             linear_search(mappings, keyword, prefix=True))
+
+
+class TestManagerSearch(unittest.TestCase):
+    """測試 MappingManager 的搜尋"""
+
+    def test_search_follows_changes(self):
+        """測試映射變更後搜尋結果同步更新"""
+        manager = MappingManager()
+        self.assertEqual(manager.search_mappings('测试词汇甲'), [])
+
+        manager.add_custom_mapping('测试词汇甲', '測試詞彙甲')
+        self.assertEqual(manager.search_mappings('词汇甲'), [('测试词汇甲', '測試詞彙甲')])
+        self.assertEqual(manager.search_mappings('測試詞彙', prefix=True, limit=1),
+                         [('测试词汇甲', '測試詞彙甲')])
+
+        manager.remove_custom_mapping('测试词汇甲')
+        self.assertEqual(manager.search_mappings('词汇甲'), [])
+
+    def test_search_matches_merged_view(self):
+        """測試搜尋結果與合併映射逐項掃描一致"""
+        manager = MappingManager()
+        manager.add_custom_mapping('数据', '數據')
+        merged = dict(manager.get_merged_view())
+        for keyword in ('数据', '軟體', '件', '库'):
+            self.assertEqual(manager.search_mappings(keyword), linear_search(merged, keyword))
+
+
+if __name__ == '__main__':
+    unittest.main()